@@ -208,7 +208,7 @@ export const useMainForm = (
 
     try {
       for (const nextZone of zonesToGenerate) {
-        const response = await generateReport(file, nextZone, profileId);
+        const response = await generateReport(file, nextZone, profileId, preview?.upload_id);
         const contentTypeHeader = response.headers["content-type"];
         const blob = new Blob([response.data], {
           type: typeof contentTypeHeader === "string" ? contentTypeHeader : "application/octet-stream",
@@ -3,9 +3,12 @@ import type {
   HistoryResponse,
   Profile,
   ProfileCreateInput,
+  ReportProgressEvent,
+  ReportRunStatus,
   SchemaPreview,
   StructurePreview,
   StructureUploadResponse,
+  UploadNegotiation,
 } from "@/types/types";
 
 const API_BASE_URL = import.meta.env.VITE_API_URL;
@@ -35,7 +38,34 @@ export const createProfile = async (payload: ProfileCreateInput) => {
   return response.data;
 };
 
+const sha256Hex = async (file: File) => {
+  const digest = await crypto.subtle.digest("SHA-256", await file.arrayBuffer());
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, "0")).join("");
+};
+
+export const negotiateUpload = async (file: File) => {
+  const response = await api.post<UploadNegotiation>("/uploads/negotiate", {
+    fingerprint: await sha256Hex(file),
+    filename: file.name,
+  });
+  return response.data;
+};
+
 export const previewReport = async (file: File) => {
+  // The server may already hold this exact workbook; only send the bytes when it does not.
+  if (globalThis.crypto?.subtle) {
+    try {
+      const negotiation = await negotiateUpload(file);
+      if (!negotiation.upload_required && negotiation.preview) {
+        return negotiation.preview;
+      }
+    } catch (error: any) {
+      if (error?.response?.status === 400) {
+        throw error;
+      }
+    }
+  }
+
   const formData = new FormData();
   formData.append("file", file);
   const response = await api.post<SchemaPreview>("/generate-report/preview", formData);
@@ -45,16 +75,97 @@ export const previewReport = async (file: File) => {
 export const generateReport = async (
   file: File,
   zoneName: string,
-  profileId: number
+  profileId: number,
+  uploadId?: string | null
+) => {
+  const buildFormData = (useUploadId: boolean) => {
+    const formData = new FormData();
+    if (useUploadId && uploadId) {
+      formData.append("upload_id", uploadId);
+    } else {
+      formData.append("file", file);
+    }
+    formData.append("zone_name", zoneName);
+    formData.append("profile_id", String(profileId));
+    return formData;
+  };
+
+  if (uploadId) {
+    try {
+      return await api.post("/generate-report/", buildFormData(true), {
+        responseType: "blob",
+      });
+    } catch (error: any) {
+      if (error?.response?.status !== 404) {
+        throw error;
+      }
+    }
+  }
+
+  return api.post("/generate-report/", buildFormData(false), {
+    responseType: "blob",
+  });
+};
+
+export const generateBatchReports = async (
+  zones: string[] | "all",
+  profileId: number,
+  source: { file?: File; uploadId?: string | null }
 ) => {
   const formData = new FormData();
-  formData.append("file", file);
+  if (source.uploadId) {
+    formData.append("upload_id", source.uploadId);
+  } else if (source.file) {
+    formData.append("file", source.file);
+  }
+  for (const zone of zones === "all" ? ["all"] : zones) {
+    formData.append("zones", zone);
+  }
+  formData.append("profile_id", String(profileId));
+  return api.post("/generate-report/batch", formData, {
+    responseType: "blob",
+  });
+};
+
+export const enqueueReport = async (
+  zoneName: string,
+  profileId: number,
+  source: { file?: File; uploadId?: string | null }
+) => {
+  const formData = new FormData();
+  if (source.uploadId) {
+    formData.append("upload_id", source.uploadId);
+  } else if (source.file) {
+    formData.append("file", source.file);
+  }
   formData.append("zone_name", zoneName);
   formData.append("profile_id", String(profileId));
+  const response = await api.post<ReportRunStatus>("/reports", formData);
+  return response.data;
+};
 
-  return api.post("/generate-report/", formData, {
-    responseType: "blob",
+export const getReportRun = async (runId: number) => {
+  const response = await api.get<ReportRunStatus>(`/reports/${runId}`);
+  return response.data;
+};
+
+export const subscribeToReportProgress = (
+  runId: number,
+  onEvent: (event: ReportProgressEvent) => void
+) => {
+  const source = new EventSource(`${API_BASE_URL}/reports/${runId}/events`);
+  source.addEventListener("progress", (message) => {
+    const event = JSON.parse((message as MessageEvent<string>).data) as ReportProgressEvent;
+    onEvent(event);
+    if (event.stage === "completed" || event.stage === "failed") {
+      source.close();
+    }
   });
+  return source;
+};
+
+export const downloadReportRun = async (runId: number) => {
+  return api.get(`/reports/${runId}/download`, { responseType: "blob" });
 };
 
 export const getHistory = async (
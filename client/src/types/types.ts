@@ -20,10 +20,25 @@ export interface HistoryItem {
   error_message: string | null;
   schema_version: string | null;
   detected_period_label: string | null;
+  served_from_cache?: boolean;
   created_at: string;
   completed_at: string | null;
 }
 
+export interface ReportRunStatus extends HistoryItem {
+  download_url: string | null;
+}
+
+export interface ReportProgressEvent {
+  run_id: number;
+  sequence?: number;
+  stage: string;
+  elapsed_ms: number | null;
+  stage_ms?: number;
+  at?: string;
+  detail: string | null;
+}
+
 export interface HistoryResponse {
   items: HistoryItem[];
   total: number;
@@ -40,6 +55,13 @@ export interface SchemaPreview {
   mapped_fields: Record<string, string>;
   ready: boolean;
   header_row_index: number;
+  upload_id: string | null;
+  upload_expires_at: string | null;
+}
+
+export interface UploadNegotiation {
+  upload_required: boolean;
+  preview: SchemaPreview | null;
 }
 
 export interface StructurePreview {
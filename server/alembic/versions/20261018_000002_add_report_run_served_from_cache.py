@@ -0,0 +1,21 @@
+"""add served_from_cache to report runs"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000002"
+down_revision = "20260401_000001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "report_runs",
+        sa.Column("served_from_cache", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("report_runs", "served_from_cache")
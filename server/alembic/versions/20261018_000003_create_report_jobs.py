@@ -0,0 +1,40 @@
+"""create report jobs queue table"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000003"
+down_revision = "20261018_000002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("report_run_id", sa.Integer(), nullable=False),
+        sa.Column("zone_name", sa.String(length=255), nullable=False),
+        sa.Column("input_path", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("lease_owner", sa.String(length=255), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+        sa.ForeignKeyConstraint(["report_run_id"], ["report_runs.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("report_run_id"),
+    )
+    op.create_index(op.f("ix_report_jobs_id"), "report_jobs", ["id"], unique=False)
+    op.create_index("ix_report_jobs_claim", "report_jobs", ["status", "available_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_report_jobs_claim", table_name="report_jobs")
+    op.drop_index(op.f("ix_report_jobs_id"), table_name="report_jobs")
+    op.drop_table("report_jobs")
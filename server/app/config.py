@@ -17,6 +17,29 @@ class Settings(BaseSettings):
     template_path: str = str(BASE_DIR / "mpatemplate.june-2026.docx")
     fallback_structure_path: str = str(BASE_DIR / "mpaStructure.xlsx")
     schema_version: str = "v1"
+    parsed_workbook_cache_max_bytes: int = 256 * 1024 * 1024
+    upload_staging_dir: str = str(BASE_DIR / "staged-uploads")
+    upload_session_ttl_seconds: int = 60 * 60
+    upload_content_retention_seconds: int = 24 * 60 * 60
+    mapping_plan_cache_max_entries: int = 256
+    report_artifact_dir: str = str(BASE_DIR / "generated-reports" / "artifacts")
+    report_artifact_cache_max_bytes: int = 512 * 1024 * 1024
+    report_render_workers: int = 0
+    report_job_workers: int = 2
+    report_output_dir: str = str(BASE_DIR / "generated-reports" / "runs")
+    report_output_retention_seconds: int = 24 * 60 * 60
+    report_job_lease_seconds: int = 10 * 60
+    report_job_max_attempts: int = 3
+    report_job_retry_backoff_seconds: int = 30
+    report_job_poll_seconds: float = 2.0
+    light_lane_concurrency: int = 4
+    light_lane_queue_size: int = 8
+    heavy_lane_concurrency: int = 2
+    heavy_lane_queue_size: int = 4
+    admission_wait_seconds: float = 30.0
+    admission_retry_after_seconds: int = 5
+    blocking_io_workers: int = 4
+    max_upload_bytes: int = 50 * 1024 * 1024
 
     model_config = SettingsConfigDict(
         env_file=str(BASE_DIR / ".env"),
@@ -49,7 +72,7 @@ class Settings(BaseSettings):
             )
         return normalized
 
-    @field_validator("template_path", "fallback_structure_path", mode="before")
+    @field_validator("template_path", "fallback_structure_path", "upload_staging_dir", "report_artifact_dir", "report_output_dir", mode="before")
     @classmethod
     def resolve_relative_paths(cls, value: str) -> str:
         candidate = Path(str(value).strip().strip("\"'"))
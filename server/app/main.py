@@ -5,8 +5,12 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
 from .db import Base, engine
+from .routers.diagnostics import router as diagnostics_router
 from .routers.profiles import router as profiles_router
 from .routers.reports import router as reports_router
+from .services.blocking import shutdown_blocking_executor
+from .services.render_pool import render_pool
+from .services.report_jobs import report_jobs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,14 +27,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     Base.metadata.create_all(bind=engine)
+    report_jobs.start()
     logger.info("app.startup.complete database_initialized=true")
 
 
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    report_jobs.shutdown(timeout=5)
+    render_pool.shutdown()
+    shutdown_blocking_executor()
+
+
 app.include_router(profiles_router)
 app.include_router(reports_router)
+app.include_router(diagnostics_router)
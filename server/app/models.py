@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, false, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .db import Base
@@ -37,8 +37,31 @@ class ReportRun(Base):
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     schema_version: Mapped[str | None] = mapped_column(String(50), nullable=True)
     detected_period_label: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    served_from_cache: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     profile: Mapped["Profile"] = relationship(back_populates="report_runs")
 
+
+class ReportJob(Base):
+    __tablename__ = "report_jobs"
+    __table_args__ = (Index("ix_report_jobs_claim", "status", "available_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    report_run_id: Mapped[int] = mapped_column(ForeignKey("report_runs.id"), nullable=False, unique=True)
+    zone_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    input_path: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(String(50), nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    lease_owner: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    report_run: Mapped["ReportRun"] = relationship()
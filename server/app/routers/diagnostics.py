@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+
+from ..schemas import AdmissionLaneStats, CacheStats, SingleFlightStats
+from ..services.admission import heavy_lane, light_lane
+from ..services.parse_cache import parsed_workbook_cache
+from ..services.report_artifacts import report_artifacts
+from ..services.reporting import report_render_flights
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/parse-cache", response_model=CacheStats)
+def parse_cache_stats() -> CacheStats:
+    return CacheStats(**parsed_workbook_cache.stats())
+
+
+@router.get("/report-artifacts", response_model=CacheStats)
+def report_artifact_stats() -> CacheStats:
+    return CacheStats(**report_artifacts.stats())
+
+
+@router.get("/report-coalescing", response_model=SingleFlightStats)
+def report_coalescing_stats() -> SingleFlightStats:
+    return SingleFlightStats(**report_render_flights.stats())
+
+
+@router.get("/admission", response_model=dict[str, AdmissionLaneStats])
+def admission_stats() -> dict[str, AdmissionLaneStats]:
+    return {lane.name: AdmissionLaneStats(**lane.stats()) for lane in [light_lane, heavy_lane]}
@@ -1,26 +1,38 @@
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, Form, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, Form, Request, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..config import settings
 from ..db import get_db
 from ..schemas import (
     PreviewResponse,
+    ReportRunStatus,
     StructurePreviewResponse,
     StructureSaveRequest,
     StructureUploadResponse,
+    UploadNegotiationRequest,
+    UploadNegotiationResponse,
     ZoneSuggestionsResponse,
 )
+from ..models import ReportRun
+from ..services.admission import heavy_lane, light_lane
+from ..services.blocking import iterate_blocking, run_blocking
+from ..services.report_jobs import enqueue_report, get_report_run, report_run_download, stream_report_progress
 from ..services.reporting import (
     cleanup_files,
+    generate_batch_reports,
     generate_report,
     get_structure_status,
+    ingest_upload,
+    negotiate_upload,
+    preview_and_stage_upload,
     preview_structure_from_report,
-    preview_workbook,
+    preview_zones,
     replace_structure_template,
     save_structure_headers,
-    save_upload_to_temp,
 )
+from ..services.upload_parser import ParsedWorkbook
+from ..services.upload_sessions import UploadSession
 
 router = APIRouter(tags=["reports"])
 
@@ -30,11 +42,11 @@ async def ping() -> dict[str, str]:
     return {"status": "Payment", "Your balance": "Feature moved to profile-aware API"}
 
 
-@router.post("/uploads/zones", response_model=ZoneSuggestionsResponse)
+@router.post("/uploads/zones", response_model=ZoneSuggestionsResponse, dependencies=[Depends(light_lane.admit)])
 async def upload_zones(file: UploadFile = File(...)) -> ZoneSuggestionsResponse:
-    temp_path = save_upload_to_temp(file)
+    ingested = await run_blocking(ingest_upload, file)
     try:
-        parsed = preview_workbook(temp_path)
+        parsed = await run_blocking(preview_zones, ingested.path, ingested.fingerprint)
         return ZoneSuggestionsResponse(
             zones=parsed.zones,
             detected_period_label=parsed.detected_period_label,
@@ -43,36 +55,47 @@ async def upload_zones(file: UploadFile = File(...)) -> ZoneSuggestionsResponse:
             mapped_fields=parsed.mapped_fields,
         )
     finally:
-        cleanup_files(temp_path)
+        cleanup_files(ingested.path)
+
+
+def _preview_response(session: UploadSession, parsed: ParsedWorkbook) -> PreviewResponse:
+    return PreviewResponse(
+        zones=parsed.zones,
+        detected_period_label=parsed.detected_period_label,
+        schema_version=settings.schema_version,
+        missing_fields=parsed.missing_fields,
+        mapped_fields=parsed.mapped_fields,
+        ready=not parsed.missing_fields,
+        header_row_index=parsed.header_row_index,
+        upload_id=session.upload_id,
+        upload_expires_at=session.expires_at,
+    )
 
 
-@router.post("/generate-report/preview", response_model=PreviewResponse)
+@router.post("/generate-report/preview", response_model=PreviewResponse, dependencies=[Depends(light_lane.admit)])
 async def report_preview(file: UploadFile = File(...)) -> PreviewResponse:
-    temp_path = save_upload_to_temp(file)
-    try:
-        parsed = preview_workbook(temp_path)
-        return PreviewResponse(
-            zones=parsed.zones,
-            detected_period_label=parsed.detected_period_label,
-            schema_version=settings.schema_version,
-            missing_fields=parsed.missing_fields,
-            mapped_fields=parsed.mapped_fields,
-            ready=not parsed.missing_fields,
-            header_row_index=parsed.header_row_index,
-        )
-    finally:
-        cleanup_files(temp_path)
+    session, parsed = await run_blocking(preview_and_stage_upload, file)
+    return _preview_response(session, parsed)
 
 
-@router.post("/generate-report/")
-async def generate_report_route(
+@router.post("/uploads/negotiate", response_model=UploadNegotiationResponse, dependencies=[Depends(light_lane.admit)])
+async def negotiate_upload_route(payload: UploadNegotiationRequest = Body(...)) -> UploadNegotiationResponse:
+    negotiated = await run_blocking(negotiate_upload, payload.fingerprint, payload.filename)
+    if negotiated is None:
+        return UploadNegotiationResponse(upload_required=True)
+    return UploadNegotiationResponse(upload_required=False, preview=_preview_response(*negotiated))
+
+
+@router.post("/generate-report/", dependencies=[Depends(heavy_lane.admit)])
+def generate_report_route(
     background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
+    file: UploadFile | None = File(default=None),
+    upload_id: str | None = Form(default=None),
     zone_name: str = Form(...),
     profile_id: int = Form(...),
     db: Session = Depends(get_db),
 ) -> FileResponse:
-    temp_output_path, report_filename = generate_report(db, profile_id, zone_name, file)
+    temp_output_path, report_filename = generate_report(db, profile_id, zone_name, file, upload_id)
     background_tasks.add_task(cleanup_files, temp_output_path)
     return FileResponse(
         temp_output_path,
@@ -81,25 +104,94 @@ async def generate_report_route(
     )
 
 
-@router.post("/structure/upload", response_model=StructureUploadResponse)
+@router.post("/generate-report/batch")
+async def generate_batch_report_route(
+    file: UploadFile | None = File(default=None),
+    upload_id: str | None = Form(default=None),
+    zones: list[str] = Form(...),
+    profile_id: int = Form(...),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    # Zones render while the zip streams, so the heavy-lane slot is taken here and held until the last chunk.
+    await heavy_lane.acquire()
+    try:
+        chunks = await run_blocking(generate_batch_reports, db, profile_id, zones, file, upload_id)
+    except BaseException:
+        heavy_lane.release()
+        raise
+    return StreamingResponse(
+        heavy_lane.release_after(iterate_blocking(chunks)),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="Zone_Reports.zip"'},
+    )
+
+
+def _report_run_status(request: Request, report_run: ReportRun) -> ReportRunStatus:
+    status = ReportRunStatus.model_validate(report_run)
+    if report_run.status == "completed":
+        status.download_url = str(request.url_for("download_report_run", run_id=report_run.id))
+    return status
+
+
+@router.post("/reports", response_model=ReportRunStatus, status_code=202)
+def enqueue_report_route(
+    request: Request,
+    file: UploadFile | None = File(default=None),
+    upload_id: str | None = Form(default=None),
+    zone_name: str = Form(...),
+    profile_id: int = Form(...),
+    db: Session = Depends(get_db),
+) -> ReportRunStatus:
+    report_run = enqueue_report(db, profile_id, zone_name, file, upload_id)
+    return _report_run_status(request, report_run)
+
+
+@router.get("/reports/{run_id}", response_model=ReportRunStatus)
+def report_run_status(run_id: int, request: Request, db: Session = Depends(get_db)) -> ReportRunStatus:
+    return _report_run_status(request, get_report_run(db, run_id))
+
+
+@router.get("/reports/{run_id}/events")
+def report_run_events(run_id: int, request: Request, db: Session = Depends(get_db)) -> StreamingResponse:
+    get_report_run(db, run_id)
+    last_event_id = request.headers.get("last-event-id", "")
+    after = int(last_event_id) if last_event_id.isdigit() else 0
+    return StreamingResponse(
+        stream_report_progress(run_id, after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/reports/{run_id}/download", name="download_report_run")
+def download_report_run(run_id: int, db: Session = Depends(get_db)) -> FileResponse:
+    output_path, report_filename = report_run_download(db, run_id)
+    return FileResponse(
+        output_path,
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        filename=report_filename,
+    )
+
+
+@router.post("/structure/upload", response_model=StructureUploadResponse, dependencies=[Depends(light_lane.admit)])
 async def upload_structure_file(file: UploadFile = File(...)) -> StructureUploadResponse:
-    result = replace_structure_template(file)
+    result = await run_blocking(replace_structure_template, file)
     return StructureUploadResponse(**result)
 
 
 @router.get("/structure/status", response_model=StructureUploadResponse)
 async def structure_status() -> StructureUploadResponse:
-    result = get_structure_status()
+    result = await run_blocking(get_structure_status)
     return StructureUploadResponse(**result)
 
 
-@router.post("/structure/preview", response_model=StructurePreviewResponse)
+@router.post("/structure/preview", response_model=StructurePreviewResponse, dependencies=[Depends(light_lane.admit)])
 async def preview_structure_file(file: UploadFile = File(...)) -> StructurePreviewResponse:
-    result = preview_structure_from_report(file)
+    result = await run_blocking(preview_structure_from_report, file)
     return StructurePreviewResponse(**result)
 
 
 @router.post("/structure/save", response_model=StructureUploadResponse)
 async def save_structure_file(payload: StructureSaveRequest = Body(...)) -> StructureUploadResponse:
-    result = save_structure_headers(payload.headers, payload.display_name)
+    result = await run_blocking(save_structure_headers, payload.headers, payload.display_name)
     return StructureUploadResponse(**result)
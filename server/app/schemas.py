@@ -27,12 +27,17 @@ class HistoryItem(BaseModel):
     error_message: str | None
     schema_version: str | None
     detected_period_label: str | None
+    served_from_cache: bool = False
     created_at: datetime
     completed_at: datetime | None
 
     model_config = {"from_attributes": True}
 
 
+class ReportRunStatus(HistoryItem):
+    download_url: str | None = None
+
+
 class HistoryResponse(BaseModel):
     items: list[HistoryItem]
     total: int
@@ -52,6 +57,18 @@ class ZoneSuggestionsResponse(BaseModel):
 class PreviewResponse(ZoneSuggestionsResponse):
     ready: bool
     header_row_index: int
+    upload_id: str | None = None
+    upload_expires_at: datetime | None = None
+
+
+class UploadNegotiationRequest(BaseModel):
+    fingerprint: str = Field(pattern=r"^[0-9a-f]{64}$")
+    filename: str = Field(min_length=1, max_length=255)
+
+
+class UploadNegotiationResponse(BaseModel):
+    upload_required: bool
+    preview: PreviewResponse | None = None
 
 
 class StructureUploadResponse(BaseModel):
@@ -75,3 +92,27 @@ class StructurePreviewResponse(BaseModel):
 class StructureSaveRequest(BaseModel):
     headers: list[str] = Field(min_length=1)
     display_name: str | None = None
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class SingleFlightStats(BaseModel):
+    leaders: int
+    coalesced: int
+    in_flight: int
+
+
+class AdmissionLaneStats(BaseModel):
+    concurrency: int
+    queue_size: int
+    active: int
+    waiting: int
+    admitted: int
+    rejected: int
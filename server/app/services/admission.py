@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import AsyncIterator
+
+import anyio
+from fastapi import HTTPException
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionLane:
+    # At most `concurrency` requests run at once; up to `queue_size` more wait, and anything beyond that gets a 429.
+    # State is only touched from the event loop, so waiting requests park on an anyio.Event instead of holding a
+    # threadpool thread, and a released slot is handed straight to the oldest waiter.
+    def __init__(self, name: str, concurrency: int, queue_size: int, wait_seconds: float, retry_after_seconds: int) -> None:
+        self.name = name
+        self.concurrency = max(concurrency, 1)
+        self.queue_size = max(queue_size, 0)
+        self.wait_seconds = wait_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self._waiters: deque[anyio.Event] = deque()
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _reject(self, reason: str) -> HTTPException:
+        self.rejected += 1
+        logger.warning("[Admission] %s lane rejected a request: %s. Active=%s, waiting=%s.", self.name, reason, self.active, self.waiting)
+        return HTTPException(
+            status_code=429,
+            detail="The server is busy with other reports. Please try again shortly.",
+            headers={"Retry-After": str(self.retry_after_seconds)},
+        )
+
+    async def acquire(self) -> None:
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            raise self._reject("queue full")
+
+        handoff = anyio.Event()
+        self._waiters.append(handoff)
+        try:
+            with anyio.fail_after(self.wait_seconds):
+                await handoff.wait()
+        except TimeoutError:
+            # The slot may have been handed over just as the deadline fired; keep it rather than drop it.
+            if not handoff.is_set():
+                raise self._reject(f"waited {self.wait_seconds:.0f}s") from None
+        except BaseException:
+            if handoff.is_set():
+                self.release()
+            raise
+        finally:
+            if not handoff.is_set():
+                self._waiters.remove(handoff)
+        self.admitted += 1
+
+    def release(self) -> None:
+        if self._waiters:
+            self._waiters.popleft().set()
+        else:
+            self.active -= 1
+
+    async def admit(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def release_after(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        # For handlers that acquire() themselves because their work continues in the response body: dependencies
+        # exit before a streamed body runs, so the slot is handed back after the last chunk instead.
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            self.release()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+light_lane = AdmissionLane(
+    "light",
+    settings.light_lane_concurrency,
+    settings.light_lane_queue_size,
+    settings.admission_wait_seconds,
+    settings.admission_retry_after_seconds,
+)
+heavy_lane = AdmissionLane(
+    "heavy",
+    settings.heavy_lane_concurrency,
+    settings.heavy_lane_queue_size,
+    settings.admission_wait_seconds,
+    settings.admission_retry_after_seconds,
+)
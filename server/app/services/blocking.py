@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import ParamSpec, TypeVar
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Workbook parsing and upload copies run here rather than on the event loop or FastAPI's shared threadpool,
+# so a burst of uploads cannot starve cheap requests of either.
+blocking_executor = ThreadPoolExecutor(max_workers=settings.blocking_io_workers, thread_name_prefix="blocking-io")
+
+
+async def run_blocking(fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def iterate_blocking(iterator: Iterator[T]) -> AsyncIterator[T]:
+    # For streamed bodies whose every step does blocking work (rendering, zipping): each next() runs off the loop.
+    done = object()
+    while (item := await run_blocking(next, iterator, done)) is not done:
+        yield item
+
+
+def shutdown_blocking_executor() -> None:
+    blocking_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cached_property
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from .normalization import normalize_text, parse_numeric, parse_numeric_column
+
+# Floats only prune candidates; any comparison that depends on Decimal arithmetic
+# (ratios, sums, scaled percentages) is settled on the few rows inside this band.
+_REFINE_TOLERANCE = 1e-9
+
+
+class BranchTable:
+    def __init__(self, rows: pd.DataFrame) -> None:
+        self.rows = rows
+        self.positions = np.arange(len(rows))
+        self._column_positions: dict[str, int] = {}
+        for position, column in enumerate(rows.columns):
+            self._column_positions.setdefault(column, position)
+        self._series: dict[str, pd.Series | None] = {}
+        self._numeric: dict[str, np.ndarray] = {}
+
+    @cached_property
+    def branches(self) -> np.ndarray:
+        if "BRANCHES" not in self._column_positions:
+            return np.full(len(self.rows), "", dtype=object)
+        return self.column("BRANCHES").map(normalize_text).to_numpy(dtype=object)
+
+    @cached_property
+    def has_branch(self) -> np.ndarray:
+        return self.branches.astype(bool)
+
+    def branch_name(self, position: int) -> str:
+        if "BRANCHES" not in self._column_positions:
+            return ""
+        return normalize_text(self.rows.iat[position, self._column_positions["BRANCHES"]])
+
+    def column(self, column: str) -> pd.Series | None:
+        if column not in self._series:
+            position = self._column_positions.get(column)
+            self._series[column] = None if position is None else self.rows.iloc[:, position]
+        return self._series[column]
+
+    def values(self, column: str) -> np.ndarray:
+        cached = self._numeric.get(column)
+        if cached is not None:
+            return cached
+        series = self.column(column)
+        if series is None:
+            values = np.full(len(self.rows), np.nan)
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy(dtype="float64", na_value=np.nan)
+        else:
+            values = parse_numeric_column(series).to_numpy()
+        self._numeric[column] = values
+        return values
+
+    def decimal(self, position: int, column: str) -> Decimal | None:
+        column_position = self._column_positions.get(column)
+        if column_position is None:
+            return None
+        return parse_numeric(self.rows.iat[position, column_position])
+
+    def total(self, column: str) -> Decimal | None:
+        series = self.column(column)
+        if series is None:
+            return None
+        if series.dtype == np.float64:
+            # Series.sum zero-fills NaN and sums the raw array; doing it here skips the pandas dispatch.
+            values = self.values(column)
+            return parse_numeric(np.where(np.isnan(values), 0.0, values).sum())
+        return parse_numeric(series.sum())
+
+    def valid(self, *columns: str) -> np.ndarray:
+        mask = self.has_branch.copy()
+        for column in columns:
+            mask &= ~np.isnan(self.values(column))
+        return mask
+
+
+def _near(values: np.ndarray, target: float) -> np.ndarray:
+    return np.abs(values - target) <= _REFINE_TOLERANCE * max(abs(target), 1.0)
+
+
+def _first_extreme(
+    candidates: np.ndarray,
+    approximate: np.ndarray,
+    exact: Callable[[int], Decimal],
+    highest: bool,
+) -> tuple[int, Decimal] | None:
+    positions = np.flatnonzero(candidates)
+    if not len(positions):
+        return None
+    target = approximate[positions].max() if highest else approximate[positions].min()
+    best_position = -1
+    best_value: Decimal | None = None
+    for position in positions[_near(approximate[positions], target)]:
+        value = exact(int(position))
+        if best_value is None or (value > best_value if highest else value < best_value):
+            best_position = int(position)
+            best_value = value
+    return best_position, best_value
+
+
+def ratio_percent(value: Decimal | None) -> Decimal:
+    if value is None:
+        return Decimal("0")
+    return value * Decimal("100") if abs(value) <= 1 else value
+
+
+def negative_entries(table: BranchTable, column: str, limit: int = 5) -> list[tuple[str, Decimal]]:
+    values = table.values(column)
+    positions = np.flatnonzero(table.valid(column) & (values < 0))
+    # Most negative first is the same as largest magnitude first; the stable sort keeps row order on ties.
+    ordered = positions[np.argsort(values[positions], kind="stable")][:limit]
+    return [(table.branches[position], abs(table.decimal(position, column))) for position in ordered]
+
+
+def count_negative(table: BranchTable, column: str) -> int:
+    return int(np.count_nonzero(table.values(column) < 0))
+
+
+def count_positive(table: BranchTable, column: str) -> int:
+    return int(np.count_nonzero(table.values(column) > 0))
+
+
+def branch_extreme(table: BranchTable, column: str, highest: bool = True) -> tuple[str, Decimal] | None:
+    values = table.values(column)
+    candidates = table.valid(column)
+    if not candidates.any():
+        return None
+    pick = np.argmax if highest else np.argmin
+    position = int(table.positions[candidates][pick(values[candidates])])
+    return table.branches[position], table.decimal(position, column)
+
+
+def summed_extreme(table: BranchTable, columns: list[str], highest: bool = True) -> tuple[str, Decimal] | None:
+    totals = np.zeros(len(table.rows))
+    for column in columns:
+        totals += np.nan_to_num(table.values(column), nan=0.0)
+
+    def exact_total(position: int) -> Decimal:
+        return sum((table.decimal(position, column) or Decimal("0") for column in columns), Decimal("0"))
+
+    extreme = _first_extreme(table.has_branch, totals, exact_total, highest)
+    if extreme is None:
+        return None
+    position, total = extreme
+    return table.branches[position], total
+
+
+def _scaled_threshold_entries(
+    table: BranchTable,
+    column: str,
+    threshold: Decimal,
+    above: bool,
+) -> list[tuple[int, Decimal]]:
+    values = table.values(column)
+    scaled = np.where(np.abs(values) <= 1, values * 100, values)
+    target = float(threshold)
+    passes = scaled > target if above else scaled < target
+    candidates = table.valid(column) & (passes | _near(scaled, target))
+    entries: list[tuple[int, Decimal]] = []
+    for position in np.flatnonzero(candidates):
+        exact = ratio_percent(table.decimal(int(position), column))
+        if exact > threshold if above else exact < threshold:
+            entries.append((int(position), exact))
+    return entries
+
+
+def branches_above_threshold(
+    table: BranchTable,
+    column: str,
+    threshold: Decimal,
+    limit: int = 3,
+) -> list[tuple[str, Decimal]]:
+    entries = _scaled_threshold_entries(table, column, threshold, above=True)
+    entries.sort(key=lambda item: item[1], reverse=True)
+    return [(table.branches[position], value) for position, value in entries[:limit]]
+
+
+def branches_below_threshold(
+    table: BranchTable,
+    column: str,
+    threshold: Decimal,
+    limit: int = 3,
+) -> list[tuple[str, Decimal]]:
+    entries = _scaled_threshold_entries(table, column, threshold, above=False)
+    entries.sort(key=lambda item: item[1])
+    return [(table.branches[position], value) for position, value in entries[:limit]]
+
+
+def budget_achievement(table: BranchTable, achieved_column: str, budget_column: str) -> tuple[str, Decimal] | None:
+    achieved = table.values(achieved_column)
+    budget = table.values(budget_column)
+    candidates = table.valid(achieved_column, budget_column) & (budget != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        approximate = achieved / budget * 100
+
+    def exact_percentage(position: int) -> Decimal:
+        return (table.decimal(position, achieved_column) / table.decimal(position, budget_column)) * Decimal("100")
+
+    extreme = _first_extreme(candidates, approximate, exact_percentage, highest=True)
+    if extreme is None:
+        return None
+    position, percentage = extreme
+    return table.branches[position], percentage
+
+
+def low_issuance_branches(table: BranchTable, column: str, threshold: Decimal = Decimal("100")) -> list[str]:
+    issued = np.nan_to_num(table.values(column), nan=0.0)
+    return table.branches[table.has_branch & (issued < float(threshold))].tolist()
+
+
+def branches_by_growth_direction(
+    table: BranchTable,
+    previous_column: str,
+    current_column: str,
+    direction: str,
+) -> list[str]:
+    previous = table.values(previous_column)
+    current = table.values(current_column)
+    valid = table.valid(previous_column, current_column)
+    if direction == "positive":
+        return table.branches[valid & (current > previous)].tolist()
+    if direction == "negative":
+        return table.branches[valid & (current < previous)].tolist()
+    return []
+
+
+def positive_growth_summary(
+    table: BranchTable,
+    previous_column: str,
+    current_column: str,
+) -> tuple[list[str], str, str]:
+    previous = table.values(previous_column)
+    current = table.values(current_column)
+    growing = table.valid(previous_column, current_column) & (current > previous)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        approximate = (current - previous) / previous * 100
+
+    def exact_growth(position: int) -> Decimal:
+        previous_value = table.decimal(position, previous_column)
+        return ((table.decimal(position, current_column) - previous_value) / previous_value) * Decimal("100")
+
+    standout = _first_extreme(growing & (previous > 0), approximate, exact_growth, highest=True)
+    standout_branch = ""
+    standout_growth_text = ""
+    if standout is not None and standout[1] > 0:
+        standout_branch = table.branches[standout[0]]
+        standout_growth_text = f"{int(standout[1]):,}"
+    return table.branches[growing].tolist(), standout_branch, standout_growth_text
+
+
+def negative_value_branches(table: BranchTable, column: str) -> list[str]:
+    return table.branches[table.valid(column) & (table.values(column) < 0)].tolist()
+
+
+@dataclass(frozen=True)
+class ColumnRanking:
+    high: int
+    low: int
+    total: Decimal | None
+
+
+def rank_column(table: BranchTable, column: str) -> ColumnRanking:
+    # Same rows as the ends of a stable descending sort_values: the first maximum is high and
+    # NaN rows sort last, so low is the last NaN row if any, otherwise the last minimum.
+    values = table.values(column)
+    missing = np.isnan(values)
+    count = len(values)
+    if missing.all():
+        high, low = 0, count - 1
+    else:
+        high = int(np.nanargmax(values))
+        if missing.any():
+            low = int(np.flatnonzero(missing)[-1])
+        else:
+            low = count - 1 - int(np.argmin(values[::-1]))
+    return ColumnRanking(high=high, low=low, total=table.total(column))
+
+
+def rank_columns(table: BranchTable, columns: list[str]) -> dict[str, ColumnRanking]:
+    return {column: rank_column(table, column) for column in columns}
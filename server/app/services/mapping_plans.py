@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+PLAN_FORMAT_VERSION = 1
+
+
+class MappingPlanStore:
+    # Resolved header mappings stored as column positions per layout key, so a layout seen before skips
+    # classification and alignment and only rebinds positions to this upload's header labels.
+    def __init__(self, path_for: Callable[[], Path], max_entries: int) -> None:
+        self._path_for = path_for
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._plans: OrderedDict[str, dict[str, dict[str, int]]] = OrderedDict()
+        self._loaded_from: tuple[Path, int | None] | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _file_mtime_ns(self, path: Path) -> int | None:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self, path: Path) -> None:
+        state = (path, self._file_mtime_ns(path))
+        if state == self._loaded_from:
+            return
+        plans: OrderedDict[str, dict[str, dict[str, int]]] = OrderedDict()
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            if payload.get("version") == PLAN_FORMAT_VERSION:
+                plans.update(payload["plans"])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("[Mapping Plans] Ignoring unreadable plan cache '%s': %s", path, exc)
+        self._plans = plans
+        self._loaded_from = state
+
+    def _save(self, path: Path) -> None:
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            temp_path.write_text(json.dumps({"version": PLAN_FORMAT_VERSION, "plans": self._plans}), encoding="utf-8")
+            os.replace(temp_path, path)
+        except OSError as exc:
+            logger.warning("[Mapping Plans] Could not persist plan cache '%s': %s", path, exc)
+            return
+        self._loaded_from = (path, self._file_mtime_ns(path))
+
+    def get(self, layout_key: str, part: str) -> dict[str, int] | None:
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            self._load(self._path_for())
+            positions = self._plans.get(layout_key, {}).get(part)
+            if positions is None:
+                self.misses += 1
+                return None
+            self._plans.move_to_end(layout_key)
+            self.hits += 1
+            return positions
+
+    def put(self, layout_key: str, part: str, positions: dict[str, int]) -> None:
+        if self.max_entries <= 0:
+            return
+        path = self._path_for()
+        with self._lock:
+            self._load(path)
+            self._plans.setdefault(layout_key, {})[part] = positions
+            self._plans.move_to_end(layout_key)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+                self.evictions += 1
+            self._save(path)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self._plans)}
+
+
+mapping_plans = MappingPlanStore(
+    lambda: Path(settings.fallback_structure_path).resolve().with_suffix(".plans.json"),
+    settings.mapping_plan_cache_max_entries,
+)
@@ -1,6 +1,8 @@
 import re
 from decimal import Decimal, InvalidOperation, ROUND_DOWN
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
 
@@ -18,13 +20,28 @@ def normalize_key(value: object) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
+def to_decimal(value: float) -> Decimal | None:
+    # Metric columns hold float64 values that are the nearest double to what parse_numeric
+    # returns for the source cell. repr() gives the shortest text that round-trips, which is
+    # the original cell text for any value with up to 15 significant digits, so formatting
+    # helpers still round from the exact decimal the workbook showed.
+    numeric = float(value)
+    if np.isnan(numeric):
+        return None
+    if numeric.is_integer():
+        return Decimal(numeric)
+    return Decimal(repr(numeric))
+
+
 def parse_numeric(value: object) -> Decimal | None:
     if value is None or (isinstance(value, float) and pd.isna(value)):
         return None
     if isinstance(value, Decimal):
         return value
-    if isinstance(value, (int, float)) and not pd.isna(value):
-        return Decimal(str(value))
+    if isinstance(value, (float, np.floating)):
+        return to_decimal(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return Decimal(value)
 
     text = normalize_text(value)
     if not text:
@@ -59,6 +76,68 @@ def parse_numeric(value: object) -> Decimal | None:
     return numeric
 
 
+@lru_cache(maxsize=65536)
+def _decimal_from_parts(digits: str, negative: bool, has_percent: bool) -> Decimal:
+    numeric = Decimal(digits)
+    if negative:
+        numeric = -numeric
+    if has_percent and abs(numeric) > 1:
+        numeric = numeric / Decimal("100")
+    return numeric
+
+
+def _clean_numeric_text(text: pd.Series) -> tuple[pd.Series, pd.Series, pd.Series]:
+    # Mirrors parse_numeric step by step: accounting parentheses, a leading minus,
+    # thousands separators, a trailing percent sign, then any stray characters.
+    cleaned = text.str.replace(r"\s+", " ", regex=True).str.strip()
+    wrapped = cleaned.str.startswith("(") & cleaned.str.endswith(")")
+    cleaned = cleaned.mask(wrapped, cleaned.str[1:-1].str.strip())
+    signed = cleaned.str.startswith("-")
+    cleaned = cleaned.mask(signed, cleaned.str[1:].str.strip())
+    cleaned = cleaned.str.replace(",", "", regex=False)
+    has_percent = cleaned.str.endswith("%")
+    cleaned = cleaned.mask(has_percent, cleaned.str[:-1].str.strip())
+    cleaned = cleaned.str.replace(r"[^0-9.]", "", regex=True)
+    return cleaned, wrapped | signed, has_percent
+
+
+def parse_numeric_column(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        return values.astype("float64")
+
+    raw = values.to_numpy(dtype=object)
+    parsed = np.full(len(raw), np.nan, dtype="float64")
+    cell_types = values.map(type)
+    text_mask = cell_types.eq(str).to_numpy()
+    # Plain Python numbers already are the nearest double of their parse_numeric value.
+    native_mask = cell_types.isin([float, int]).to_numpy()
+    parsed[native_mask] = raw[native_mask].astype("float64")
+
+    if text_mask.any():
+        digits, negative, has_percent = _clean_numeric_text(pd.Series(raw[text_mask], dtype=object))
+        valid = digits.str.fullmatch(r"\d+\.?\d*|\.\d+").to_numpy(dtype=bool)
+        # float() rounds correctly; pandas' fast text parser can land one ulp off for 16-17 significant digits.
+        magnitudes = np.array(digits[valid].tolist(), dtype="float64")
+        signed = np.where(negative[valid].to_numpy(dtype=bool), -magnitudes, magnitudes)
+        # Scaled percentages are divided in Decimal so they land on the same nearest double. Magnitudes that
+        # round to 1.0 go through Decimal too, which decides whether the text was really above 1.
+        scaled = has_percent[valid].to_numpy(dtype=bool) & (magnitudes >= 1)
+        if scaled.any():
+            scaled_parts = zip(
+                digits[valid][scaled].tolist(),
+                negative[valid][scaled].tolist(),
+                has_percent[valid][scaled].tolist(),
+            )
+            signed[scaled] = [float(_decimal_from_parts(*parts)) for parts in scaled_parts]
+        parsed[np.flatnonzero(text_mask)[valid]] = signed
+
+    other_positions = np.flatnonzero(~(text_mask | native_mask))
+    parsed[other_positions] = [
+        np.nan if (numeric := parse_numeric(value)) is None else float(numeric) for value in raw[other_positions]
+    ]
+    return pd.Series(parsed, index=values.index, dtype="float64")
+
+
 def _format_scaled_number(value: Decimal) -> str:
     rounded = value.quantize(Decimal("0.01"), rounding=ROUND_DOWN)
     if rounded == rounded.to_integral_value():
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from ..config import settings
+from .upload_parser import ParsedWorkbook
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    parsed: ParsedWorkbook
+    size_bytes: int
+
+
+def estimate_parsed_size(parsed: ParsedWorkbook) -> int:
+    return int(parsed.dataframe.memory_usage(index=True, deep=True).sum())
+
+
+class ParsedWorkbookCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], _CacheEntry] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, fingerprint: str, structure_version: str) -> ParsedWorkbook | None:
+        key = (fingerprint, structure_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.parsed
+
+    def put(self, fingerprint: str, structure_version: str, parsed: ParsedWorkbook) -> None:
+        if self.max_bytes <= 0:
+            return
+        size_bytes = estimate_parsed_size(parsed)
+        if size_bytes > self.max_bytes:
+            logger.info(
+                "[Cache] Parsed workbook %s is %s bytes, above the %s byte budget. Not cached.",
+                fingerprint[:12],
+                size_bytes,
+                self.max_bytes,
+            )
+            return
+
+        key = (fingerprint, structure_version)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous.size_bytes
+            self._entries[key] = _CacheEntry(parsed=parsed, size_bytes=size_bytes)
+            self._size_bytes += size_bytes
+            while self._size_bytes > self.max_bytes and self._entries:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= evicted.size_bytes
+                self.evictions += 1
+                logger.info("[Cache] Evicted parsed workbook %s (%s bytes).", evicted_key[0][:12], evicted.size_bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+parsed_workbook_cache = ParsedWorkbookCache(settings.parsed_workbook_cache_max_bytes)
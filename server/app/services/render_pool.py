@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+
+from ..config import settings
+from .template_cache import docx_template_cache
+from .upload_parser import ParsedWorkbook
+
+logger = logging.getLogger(__name__)
+
+RenderFn = Callable[[str, ParsedWorkbook, str], str]
+
+# Per worker process: the batch snapshot it last loaded, so each worker unpickles the workbook once per batch.
+_worker_snapshot: dict[str, object] = {}
+
+
+@dataclass
+class RenderOutcome:
+    report_filename: str | None = None
+    status_code: int | None = None
+    error: str | None = None
+
+
+def _render_one(render_fn: RenderFn, zone_name: str, parsed: ParsedWorkbook, output_path: str) -> RenderOutcome:
+    # HTTPException does not survive pickling across processes, so failures travel as plain fields.
+    try:
+        return RenderOutcome(report_filename=render_fn(zone_name, parsed, output_path))
+    except HTTPException as exc:
+        logger.warning("[Render] Zone '%s' failed with handled error: %s", zone_name, exc.detail)
+        return RenderOutcome(status_code=exc.status_code, error=str(exc.detail))
+    except Exception as exc:
+        logger.exception("[Render] Zone '%s' crashed unexpectedly.", zone_name)
+        return RenderOutcome(status_code=500, error=f"Server error: {exc}")
+
+
+def _initialize_worker(template_path: str) -> None:
+    try:
+        docx_template_cache.get(template_path)
+    except OSError:
+        logger.warning("[Render] Worker %s could not preload template '%s'.", os.getpid(), template_path)
+
+
+def _render_task(render_fn: RenderFn, snapshot_path: str, zone_name: str, output_path: str) -> RenderOutcome:
+    if _worker_snapshot.get("path") != snapshot_path:
+        with open(snapshot_path, "rb") as snapshot_file:
+            _worker_snapshot["parsed"] = pickle.load(snapshot_file)
+        _worker_snapshot["path"] = snapshot_path
+    return _render_one(render_fn, zone_name, _worker_snapshot["parsed"], output_path)
+
+
+class ReportRenderPool:
+    def __init__(self, workers: int, template_path: str) -> None:
+        self.workers = workers
+        self.template_path = template_path
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the API process runs threads (uvicorn, caches) that fork would copy mid-lock.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_initialize_worker,
+                    initargs=(self.template_path,),
+                )
+                logger.info("[Render] Started %s render workers.", self.workers)
+            return self._executor
+
+    def render(
+        self,
+        render_fn: RenderFn,
+        parsed: ParsedWorkbook,
+        jobs: list[tuple[str, str]],
+        work_dir: str,
+    ) -> list[RenderOutcome]:
+        return list(self.iter_render(render_fn, parsed, jobs, work_dir))
+
+    def iter_render(
+        self,
+        render_fn: RenderFn,
+        parsed: ParsedWorkbook,
+        jobs: list[tuple[str, str]],
+        work_dir: str,
+    ) -> Iterator[RenderOutcome]:
+        # Outcomes come back in job order, each as soon as its zone is done, so callers can stream them.
+        if self.workers <= 1 or len(jobs) < 2:
+            for zone_name, output_path in jobs:
+                yield _render_one(render_fn, zone_name, parsed, output_path)
+            return
+
+        snapshot_path = os.path.join(work_dir, "workbook.pickle")
+        with open(snapshot_path, "wb") as snapshot_file:
+            pickle.dump(parsed, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info("[Render] Fanning %s zones across %s workers.", len(jobs), self.workers)
+
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_render_task, render_fn, snapshot_path, zone_name, output_path)
+            for zone_name, output_path in jobs
+        ]
+        try:
+            for (zone_name, _), future in zip(jobs, futures):
+                try:
+                    yield future.result()
+                except BrokenProcessPool as exc:
+                    if self._discard(executor):
+                        logger.error("[Render] Worker pool broke while rendering '%s'. It will be restarted.", zone_name)
+                    yield RenderOutcome(status_code=500, error=f"Server error: {exc}")
+                except Exception as exc:
+                    logger.exception("[Render] Render task for '%s' failed.", zone_name)
+                    yield RenderOutcome(status_code=500, error=f"Server error: {exc}")
+        finally:
+            # A caller that stops early (a dropped download) does not leave queued zones rendering for nobody.
+            for future in futures:
+                future.cancel()
+
+    def _discard(self, executor: ProcessPoolExecutor) -> bool:
+        with self._lock:
+            if self._executor is not executor:
+                return False
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+render_pool = ReportRenderPool(settings.report_render_workers, settings.template_path)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ArtifactKey:
+    fingerprint: str
+    zone_name: str
+    template_hash: str
+    schema_version: str
+
+    def digest(self) -> str:
+        raw = "\x1f".join([self.fingerprint, self.zone_name, self.template_hash, self.schema_version])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ReportArtifact:
+    path: str
+    report_filename: str
+    detected_period_label: str | None
+    size_bytes: int
+
+
+def link_or_copy(source: Path, destination: str) -> None:
+    # A hard link keeps the response readable even if the cached copy is evicted mid-download.
+    if os.path.exists(destination):
+        os.unlink(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+class ReportArtifactStore:
+    def __init__(self, root_dir: str, max_bytes: int) -> None:
+        self.root_dir = Path(root_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _paths(self, key: ArtifactKey) -> tuple[Path, Path]:
+        digest = key.digest()
+        return self.root_dir / f"{digest}.docx", self.root_dir / f"{digest}.json"
+
+    def get(self, key: ArtifactKey, destination: str) -> ReportArtifact | None:
+        if self.max_bytes <= 0:
+            return None
+        artifact_path, meta_path = self._paths(key)
+        with self._lock:
+            try:
+                metadata = json.loads(meta_path.read_text(encoding="utf-8"))
+                report_filename = metadata["report_filename"]
+                size_bytes = artifact_path.stat().st_size
+                link_or_copy(artifact_path, destination)
+                # The artifact's mtime doubles as its last-used time for eviction.
+                os.utime(artifact_path)
+            except (OSError, ValueError, KeyError):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return ReportArtifact(
+            path=destination,
+            report_filename=report_filename,
+            detected_period_label=metadata.get("detected_period_label"),
+            size_bytes=size_bytes,
+        )
+
+    def put(
+        self,
+        key: ArtifactKey,
+        source_path: str,
+        report_filename: str,
+        detected_period_label: str | None,
+    ) -> None:
+        if self.max_bytes <= 0:
+            return
+        size_bytes = os.path.getsize(source_path)
+        if size_bytes > self.max_bytes:
+            logger.info("[Artifacts] Report '%s' is %s bytes, above the %s byte budget. Not stored.", report_filename, size_bytes, self.max_bytes)
+            return
+
+        artifact_path, meta_path = self._paths(key)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        staging_path = self.root_dir / f".{uuid.uuid4().hex}.tmp"
+        shutil.copyfile(source_path, staging_path)
+        metadata = {
+            "fingerprint": key.fingerprint,
+            "zone_name": key.zone_name,
+            "template_hash": key.template_hash,
+            "schema_version": key.schema_version,
+            "report_filename": report_filename,
+            "detected_period_label": detected_period_label,
+        }
+        with self._lock:
+            os.replace(staging_path, artifact_path)
+            meta_path.write_text(json.dumps(metadata), encoding="utf-8")
+            self._evict_locked()
+        logger.info("[Artifacts] Stored '%s' as %s (%s bytes).", report_filename, artifact_path.name, size_bytes)
+
+    def _evict_locked(self) -> None:
+        artifacts = sorted(
+            ((path, path.stat()) for path in self.root_dir.glob("*.docx")),
+            key=lambda item: item[1].st_mtime_ns,
+        )
+        total = sum(stat.st_size for _, stat in artifacts)
+        for path, stat in artifacts:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+            total -= stat.st_size
+            self.evictions += 1
+            logger.info("[Artifacts] Evicted cached report %s.", path.name)
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self.root_dir.glob("*.docx"):
+                path.unlink(missing_ok=True)
+                path.with_suffix(".json").unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            artifacts = list(self.root_dir.glob("*.docx")) if self.root_dir.exists() else []
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(artifacts),
+                "size_bytes": sum(path.stat().st_size for path in artifacts),
+                "max_bytes": self.max_bytes,
+            }
+
+
+report_artifacts = ReportArtifactStore(settings.report_artifact_dir, settings.report_artifact_cache_max_bytes)
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..config import settings
+from ..db import SessionLocal
+from ..models import ReportJob, ReportRun
+from .profiles import get_profile
+from .report_artifacts import link_or_copy
+from .report_progress import TERMINAL_STAGES, report_progress
+from .reporting import _fail_report_run, _new_report_run, _resolve_upload_session, run_report_job, stage_upload
+from .upload_sessions import UploadSession
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_POLL_SECONDS = 0.25
+PROGRESS_STATUS_CHECK_SECONDS = 1.0
+PROGRESS_KEEPALIVE_SECONDS = 15.0
+
+
+class LeaseLost(RuntimeError):
+    pass
+
+
+class ReportJobQueue:
+    # Jobs live in the report_jobs table so any replica can claim them and a crashed worker's lease simply expires.
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        workers: int,
+        output_dir: str,
+        retention_seconds: int,
+        lease_seconds: int,
+        max_attempts: int,
+        retry_backoff_seconds: int,
+        poll_seconds: float,
+    ) -> None:
+        self.session_factory = session_factory
+        self.workers = workers
+        self.output_dir = Path(output_dir)
+        self.input_dir = self.output_dir / "inputs"
+        self.retention_seconds = retention_seconds
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.retry_backoff = timedelta(seconds=retry_backoff_seconds)
+        self.poll_seconds = poll_seconds
+        self._claim_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def output_path(self, run_id: int) -> Path:
+        return self.output_dir / f"{run_id}.docx"
+
+    def enqueue(self, db: Session, report_run: ReportRun, zone_name: str, session: UploadSession) -> ReportJob:
+        self.purge_expired()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.input_dir.mkdir(parents=True, exist_ok=True)
+        # The job keeps its own link to the workbook; upload sessions expire independently of the queue.
+        input_path = self.input_dir / f"{uuid.uuid4().hex}{os.path.splitext(session.staged_path)[1]}"
+        link_or_copy(Path(session.staged_path), str(input_path))
+        job = ReportJob(
+            report_run=report_run,
+            zone_name=zone_name,
+            input_path=str(input_path),
+            status="queued",
+            attempts=0,
+            max_attempts=self.max_attempts,
+            available_at=datetime.now(UTC),
+        )
+        db.add(job)
+        db.commit()
+        self._wake.set()
+        logger.info("[Jobs] Queued report run %s for zone '%s' as job %s.", report_run.id, zone_name, job.id)
+        return job
+
+    def _claim(self, db: Session, worker_id: str) -> ReportJob | None:
+        postgres = db.get_bind().dialect.name == "postgresql"
+        while True:
+            now = datetime.now(UTC)
+            statement = (
+                select(ReportJob)
+                .where(
+                    or_(
+                        and_(ReportJob.status == "queued", ReportJob.available_at <= now),
+                        and_(ReportJob.status == "leased", ReportJob.lease_expires_at < now),
+                    )
+                )
+                .order_by(ReportJob.available_at, ReportJob.id)
+                .limit(1)
+            )
+            if postgres:
+                statement = statement.with_for_update(skip_locked=True)
+            job = db.scalars(statement).first()
+            if job is None:
+                db.rollback()
+                return None
+
+            if job.attempts >= job.max_attempts:
+                self._exhaust(db, job)
+                continue
+
+            # Compare-and-set on the state we read: on SQLite, which has no row locks, this is what stops two
+            # processes claiming the same job; on Postgres the SKIP LOCKED row lock already guarantees it.
+            claimed = db.execute(
+                update(ReportJob)
+                .where(ReportJob.id == job.id, ReportJob.status == job.status, ReportJob.attempts == job.attempts)
+                .values(
+                    status="leased",
+                    attempts=job.attempts + 1,
+                    lease_owner=worker_id,
+                    lease_expires_at=now + self.lease,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if claimed.rowcount != 1:
+                db.rollback()
+                continue
+            db.commit()
+            db.refresh(job)
+            if job.attempts > 1:
+                logger.info("[Jobs] Worker %s reclaimed job %s (attempt %s of %s).", worker_id, job.id, job.attempts, job.max_attempts)
+            return job
+
+    def _exhaust(self, db: Session, job: ReportJob) -> None:
+        message = job.last_error or f"Report generation did not finish after {job.attempts} attempt(s)."
+        logger.error("[Jobs] Job %s for run %s gave up after %s attempt(s): %s", job.id, job.report_run_id, job.attempts, message)
+        job.status = "failed"
+        job.lease_owner = None
+        job.lease_expires_at = None
+        _fail_report_run(db, job.report_run, message)
+        report_progress.record(job.report_run_id, "failed", message)
+        self._discard_input(job)
+
+    def _owns_lease(self, db: Session, job: ReportJob, worker_id: str) -> bool:
+        db.refresh(job)
+        if job.status == "leased" and job.lease_owner == worker_id:
+            return True
+        logger.warning("[Jobs] Worker %s lost the lease on job %s before finishing it.", worker_id, job.id)
+        return False
+
+    def _renew_lease(self, job_id: int, worker_id: str) -> None:
+        # Called at every progress stage so a long render keeps its job; a worker that already lost it stops here.
+        db = self.session_factory()
+        try:
+            renewed = db.execute(
+                update(ReportJob)
+                .where(ReportJob.id == job_id, ReportJob.status == "leased", ReportJob.lease_owner == worker_id)
+                .values(lease_expires_at=datetime.now(UTC) + self.lease)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
+        if renewed.rowcount != 1:
+            raise LeaseLost(f"Worker {worker_id} no longer holds the lease on job {job_id}.")
+
+    def process_next(self, worker_id: str) -> bool:
+        db = self.session_factory()
+        try:
+            if db.get_bind().dialect.name == "sqlite":
+                with self._claim_lock:
+                    job = self._claim(db, worker_id)
+            else:
+                job = self._claim(db, worker_id)
+            if job is None:
+                return False
+
+            report_run = job.report_run
+            session = UploadSession(
+                upload_id=f"job-{job.id}",
+                fingerprint=report_run.source_file_fingerprint,
+                source_filename=report_run.source_filename,
+                staged_path=job.input_path,
+                expires_at=job.lease_expires_at,
+            )
+            try:
+                run_report_job(
+                    db,
+                    report_run,
+                    job.zone_name,
+                    session,
+                    str(self.output_path(report_run.id)),
+                    heartbeat=lambda: self._renew_lease(job.id, worker_id),
+                )
+            except Exception as exc:
+                db.rollback()
+                logger.exception("[Jobs] Job %s crashed on attempt %s of %s.", job.id, job.attempts, job.max_attempts)
+                if self._owns_lease(db, job, worker_id):
+                    self._retry(db, job, str(exc))
+                return True
+
+            if self._owns_lease(db, job, worker_id):
+                job.status = "completed" if report_run.status == "completed" else "failed"
+                job.last_error = report_run.error_message
+                job.lease_owner = None
+                job.lease_expires_at = None
+                db.commit()
+                self._discard_input(job)
+            return True
+        finally:
+            db.close()
+
+    def _retry(self, db: Session, job: ReportJob, message: str) -> None:
+        job.last_error = message
+        if job.attempts >= job.max_attempts:
+            self._exhaust(db, job)
+            return
+        job.status = "queued"
+        job.lease_owner = None
+        job.lease_expires_at = None
+        job.available_at = datetime.now(UTC) + self.retry_backoff * job.attempts
+        job.report_run.status = "pending"
+        db.commit()
+        report_progress.record(job.report_run_id, "retrying", message)
+        logger.info("[Jobs] Job %s will be retried after %s.", job.id, job.available_at.isoformat())
+
+    def _discard_input(self, job: ReportJob) -> None:
+        try:
+            os.unlink(job.input_path)
+        except OSError:
+            pass
+
+    def _worker_loop(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.process_next(worker_id):
+                    continue
+            except Exception:
+                logger.exception("[Jobs] Worker %s could not poll the job queue.", worker_id)
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+    def start(self) -> None:
+        if self.workers <= 0 or self._threads:
+            return
+        self._stop.clear()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, args=(f"{prefix}:{index}",), name=f"report-job-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("[Jobs] Started %s report job workers.", self.workers)
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def purge_expired(self) -> None:
+        if not self.output_dir.exists():
+            return
+        cutoff = time.time() - self.retention_seconds
+        for path in self.output_dir.glob("*.docx"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    logger.info("[Jobs] Removed expired report output '%s'.", path.name)
+            except OSError:
+                continue
+
+
+report_jobs = ReportJobQueue(
+    SessionLocal,
+    workers=settings.report_job_workers,
+    output_dir=settings.report_output_dir,
+    retention_seconds=settings.report_output_retention_seconds,
+    lease_seconds=settings.report_job_lease_seconds,
+    max_attempts=settings.report_job_max_attempts,
+    retry_backoff_seconds=settings.report_job_retry_backoff_seconds,
+    poll_seconds=settings.report_job_poll_seconds,
+)
+
+
+def enqueue_report(
+    db: Session,
+    profile_id: int,
+    zone_name: str,
+    upload: UploadFile | None = None,
+    upload_id: str | None = None,
+) -> ReportRun:
+    profile = get_profile(db, profile_id)
+    if not profile:
+        logger.warning("[Jobs] Enqueue stopped because profile %s was not found.", profile_id)
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    if not upload_id and upload is None:
+        raise HTTPException(status_code=400, detail="Provide either an uploaded file or an upload_id from the preview step.")
+
+    started = time.perf_counter()
+    session = _resolve_upload_session(upload_id) if upload_id else stage_upload(upload)
+    report_run = _new_report_run(profile_id, zone_name, session.source_filename, session.fingerprint, status="pending")
+    # Flush for the run id and record the upload first: a live worker may pick the job up as soon as it is queued.
+    db.add(report_run)
+    db.flush()
+    report_progress.begin(report_run.id, started)
+    report_progress.record(report_run.id, "upload_saved", session.source_filename)
+    report_jobs.enqueue(db, report_run, zone_name, session)
+    return report_run
+
+
+def get_report_run(db: Session, run_id: int) -> ReportRun:
+    report_run = db.get(ReportRun, run_id)
+    if report_run is None:
+        raise HTTPException(status_code=404, detail="Report run not found.")
+    return report_run
+
+
+def report_run_download(db: Session, run_id: int) -> tuple[str, str]:
+    report_run = get_report_run(db, run_id)
+    if report_run.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Report run is {report_run.status}; the download is not ready.")
+    output_path = report_jobs.output_path(run_id)
+    if not output_path.exists():
+        raise HTTPException(status_code=410, detail="The generated report is no longer available. Please generate it again.")
+    return str(output_path), report_run.report_filename or output_path.name
+
+
+def _sse_message(event_id: int, payload: dict[str, object]) -> str:
+    return f"id: {event_id}\nevent: progress\ndata: {json.dumps(payload)}\n\n"
+
+
+def _final_run_state(run_id: int) -> dict[str, object] | None:
+    db = report_jobs.session_factory()
+    try:
+        report_run = db.get(ReportRun, run_id)
+        if report_run is None or report_run.status not in TERMINAL_STAGES:
+            return None
+        elapsed_ms = None
+        if report_run.completed_at and report_run.created_at:
+            elapsed_ms = round((report_run.completed_at - report_run.created_at).total_seconds() * 1000, 1)
+        return {
+            "run_id": run_id,
+            "stage": report_run.status,
+            "elapsed_ms": elapsed_ms,
+            "detail": report_run.report_filename if report_run.status == "completed" else report_run.error_message,
+        }
+    finally:
+        db.close()
+
+
+async def stream_report_progress(run_id: int, after: int = 0) -> AsyncIterator[str]:
+    # Stage events come from this process; the database status is the fallback when the job ran on another replica.
+    sequence = after
+    last_status_check = last_sent = time.monotonic()
+    while True:
+        for event in report_progress.events_since(run_id, sequence):
+            sequence = event.sequence
+            last_sent = time.monotonic()
+            yield _sse_message(event.sequence, event.to_dict())
+            if event.stage in TERMINAL_STAGES:
+                return
+
+        now = time.monotonic()
+        if now - last_status_check >= PROGRESS_STATUS_CHECK_SECONDS:
+            last_status_check = now
+            final_state = await run_in_threadpool(_final_run_state, run_id)
+            if final_state is not None and not report_progress.events_since(run_id, sequence):
+                yield _sse_message(sequence + 1, final_state)
+                return
+        if now - last_sent >= PROGRESS_KEEPALIVE_SECONDS:
+            last_sent = now
+            yield ": keepalive\n\n"
+        await asyncio.sleep(PROGRESS_POLL_SECONDS)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STAGES = {"completed", "failed"}
+
+
+@dataclass
+class ProgressEvent:
+    run_id: int
+    sequence: int
+    stage: str
+    elapsed_ms: float
+    stage_ms: float
+    at: str
+    detail: str | None = None
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+@dataclass
+class _RunProgress:
+    started: float
+    last: float
+    finished_at: float | None = None
+    events: list[ProgressEvent] = field(default_factory=list)
+
+
+class ReportProgressHub:
+    # Stage timings per run for this process; subscribers poll events_since with the last sequence they saw.
+    def __init__(self, retention_seconds: int) -> None:
+        self.retention_seconds = retention_seconds
+        self._runs: dict[int, _RunProgress] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, run_id: int, started: float | None = None) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            self._purge_locked(now)
+            self._runs.setdefault(run_id, _RunProgress(started=started or now, last=started or now))
+
+    def record(self, run_id: int, stage: str, detail: str | None = None) -> ProgressEvent:
+        now = time.perf_counter()
+        with self._lock:
+            progress = self._runs.setdefault(run_id, _RunProgress(started=now, last=now))
+            event = ProgressEvent(
+                run_id=run_id,
+                sequence=len(progress.events) + 1,
+                stage=stage,
+                elapsed_ms=round((now - progress.started) * 1000, 1),
+                stage_ms=round((now - progress.last) * 1000, 1),
+                at=datetime.now(UTC).isoformat(),
+                detail=detail,
+            )
+            progress.events.append(event)
+            progress.last = now
+            if stage in TERMINAL_STAGES:
+                progress.finished_at = now
+        logger.info("[Progress] Run %s: %s after %.1f ms (stage %.1f ms).", run_id, stage, event.elapsed_ms, event.stage_ms)
+        return event
+
+    def events_since(self, run_id: int, sequence: int = 0) -> list[ProgressEvent]:
+        with self._lock:
+            progress = self._runs.get(run_id)
+            return list(progress.events[sequence:]) if progress else []
+
+    def _purge_locked(self, now: float) -> None:
+        expired = [
+            run_id
+            for run_id, progress in self._runs.items()
+            if progress.finished_at is not None and now - progress.finished_at > self.retention_seconds
+        ]
+        for run_id in expired:
+            self._runs.pop(run_id)
+
+
+report_progress = ReportProgressHub(retention_seconds=15 * 60)
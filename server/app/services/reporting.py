@@ -1,23 +1,44 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
 import re
 import shutil
 import tempfile
+import zipfile
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
 from pathlib import Path
 
 import pandas as pd
-from docxtpl import DocxTemplate, RichText
+from docxtpl import RichText
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
 from ..analysis import build_report_analysis
 from ..config import settings
 from ..models import ReportRun
+from .branch_analytics import (
+    BranchTable,
+    branch_extreme,
+    branches_above_threshold,
+    branches_below_threshold,
+    branches_by_growth_direction,
+    budget_achievement,
+    count_negative,
+    count_positive,
+    low_issuance_branches,
+    negative_entries,
+    negative_value_branches,
+    positive_growth_summary,
+    ratio_percent,
+    rank_columns,
+    summed_extreme,
+)
 from .normalization import (
     format_billions,
     format_dp_millions,
@@ -26,20 +47,30 @@ from .normalization import (
     normalize_text,
     parse_numeric,
 )
+from .parse_cache import parsed_workbook_cache
 from .profiles import get_profile
+from .render_pool import render_pool
+from .report_progress import report_progress
+from .single_flight import SingleFlight
+from .report_artifacts import ArtifactKey, ReportArtifact, link_or_copy, report_artifacts
+from .template_cache import docx_template_cache
+from .upload_sessions import UploadSession, upload_sessions
 from .upload_parser import (
+    HeaderMappingPlan,
     ParsedWorkbook,
-    _aligned_template_mapping,
+    WorkbookPreview,
+    ZoneIndex,
     _compose_headers,
     _detected_period_label,
     _detect_header_row,
-    _load_template_headers,
     _parse_dynamic_workbook,
     _read_raw_table,
-    _resolve_dynamic_period_mappings,
-    _resolve_static_mappings,
+    build_zone_index,
     file_fingerprint,
     parse_uploaded_workbook,
+    preview_uploaded_headers,
+    structure_signatures,
+    structure_version,
 )
 
 logger = logging.getLogger(__name__)
@@ -155,14 +186,75 @@ REPORT_REQUIRED_COLUMNS = [
     "% Reactivated DMT_ACT",
 ]
 
+BRANCH_RANKING_COLUMNS = [
+    "PBT 2025 YTD ACHVD",
+    "DDA Jul-25",
+    "SAV Jul-25",
+    "FD Jul-25",
+    "DP Jul-25",
+    "PBT Cost to Income Ratio",
+    "TOTAL_DMT_ACT",
+]
+
+BATCH_ALL_ZONES = "all"
+BATCH_SUMMARY_FILENAME = "batch_summary.json"
 
-def save_upload_to_temp(upload: UploadFile) -> str:
-    if not upload.filename or not upload.filename.lower().endswith((".xlsx", ".xls", ".csv")):
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass
+class IngestedUpload:
+    path: str
+    filename: str
+    fingerprint: str
+    size_bytes: int
+
+
+def _upload_too_large() -> HTTPException:
+    limit_mb = settings.max_upload_bytes / (1024 * 1024)
+    return HTTPException(status_code=413, detail=f"Uploaded file is larger than the {limit_mb:.0f} MB limit.")
+
+
+def _validate_upload_filename(filename: str | None) -> None:
+    if not filename or not filename.lower().endswith((".xlsx", ".xls", ".csv")):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload an Excel or CSV file.")
+
+
+def ingest_upload(upload: UploadFile) -> IngestedUpload:
+    _validate_upload_filename(upload.filename)
+    if upload.size is not None and upload.size > settings.max_upload_bytes:
+        raise _upload_too_large()
+
+    # Copy, hash and measure in one pass so the fingerprint is known before anything parses the file.
+    digest = hashlib.sha256()
+    size_bytes = 0
     with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(upload.filename)[1]) as temp_file:
-        shutil.copyfileobj(upload.file, temp_file)
-        logger.info("[Files] Saved upload '%s' to temporary path '%s'.", upload.filename, temp_file.name)
-        return temp_file.name
+        try:
+            while chunk := upload.file.read(UPLOAD_CHUNK_BYTES):
+                size_bytes += len(chunk)
+                if size_bytes > settings.max_upload_bytes:
+                    raise _upload_too_large()
+                digest.update(chunk)
+                temp_file.write(chunk)
+        except BaseException:
+            temp_file.close()
+            os.unlink(temp_file.name)
+            raise
+
+    fingerprint = digest.hexdigest()
+    logger.info(
+        "[Files] Saved upload '%s' (%s bytes, fingerprint %s) to temporary path '%s'.",
+        upload.filename,
+        size_bytes,
+        fingerprint[:12],
+        temp_file.name,
+    )
+    return IngestedUpload(path=temp_file.name, filename=upload.filename, fingerprint=fingerprint, size_bytes=size_bytes)
+
+
+def save_upload_to_temp(upload: UploadFile) -> str:
+    return ingest_upload(upload).path
 
 
 def _structure_meta_path() -> Path:
@@ -211,7 +303,7 @@ def get_structure_status() -> dict[str, str | int | None]:
     target_path.parent.mkdir(parents=True, exist_ok=True)
     if not target_path.exists():
         raise HTTPException(status_code=404, detail="No active structure file found.")
-    headers = _load_template_headers(target_path)
+    headers = structure_signatures.headers(target_path)
     logger.info(
         "[Structure] Active structure is '%s' (%s headers) at '%s'.",
         _read_structure_display_name(target_path),
@@ -282,18 +374,19 @@ def preview_structure_from_report(upload: UploadFile) -> dict[str, object]:
         raw = _read_raw_table(temp_path)
         header_row_index = _detect_header_row(raw)
         original_headers = _compose_headers(raw, header_row_index)
-        _, _, _, mapping = _parse_dynamic_workbook(temp_path)
+        _, _, _, mapping = _parse_dynamic_workbook(raw)
+        plan = HeaderMappingPlan(original_headers)
 
         suggested_headers = list(original_headers)
         original_index = {header: index for index, header in enumerate(original_headers)}
 
-        for canonical, original in _resolve_static_mappings(original_headers).items():
+        for canonical, original in plan.mapping("static").items():
             if original in original_index:
                 suggested_headers[original_index[original]] = canonical
-        for canonical, original in _resolve_dynamic_period_mappings(original_headers).items():
+        for canonical, original in plan.mapping("dynamic").items():
             if original in original_index:
                 suggested_headers[original_index[original]] = canonical
-        for template_header, original in _aligned_template_mapping(original_headers).items():
+        for template_header, original in plan.mapping("aligned").items():
             if original in original_index:
                 suggested_headers[original_index[original]] = template_header
 
@@ -336,7 +429,7 @@ def save_structure_headers(headers: list[str], display_name: str | None = None)
         duplicate_headers_resolved,
     )
 
-    active_headers = _load_template_headers(target_path)
+    active_headers = structure_signatures.headers(target_path)
     return {
         "filename": target_path.name,
         "display_name": _read_structure_display_name(target_path),
@@ -353,13 +446,76 @@ def cleanup_files(*paths: str) -> None:
             os.unlink(path)
 
 
-def preview_workbook(path: str) -> ParsedWorkbook:
+def preview_workbook(path: str, fingerprint: str | None = None) -> ParsedWorkbook:
     logger.info("[Report] Preview requested for uploaded workbook '%s'.", path)
+    fingerprint = fingerprint or file_fingerprint(path)
+    active_structure_version = structure_version()
+    cached = parsed_workbook_cache.get(fingerprint, active_structure_version)
+    if cached is not None:
+        logger.info("[Report] Reusing cached parse for fingerprint %s.", fingerprint[:12])
+        return cached
     try:
-        return parse_uploaded_workbook(path)
+        parsed = parse_uploaded_workbook(path)
     except ValueError as exc:
         logger.warning("[Report] Preview blocked: %s", exc)
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    parsed_workbook_cache.put(fingerprint, active_structure_version, parsed)
+    return parsed
+
+
+def preview_zones(path: str, fingerprint: str) -> ParsedWorkbook | WorkbookPreview:
+    # Zone suggestions only need the header rows and the ZONES column; the full parse waits for generation.
+    cached = parsed_workbook_cache.get(fingerprint, structure_version())
+    if cached is not None:
+        logger.info("[Report] Reusing cached parse for fingerprint %s.", fingerprint[:12])
+        return cached
+    preview = preview_uploaded_headers(path)
+    if preview is not None:
+        return preview
+    return preview_workbook(path, fingerprint)
+
+
+def preview_and_stage_upload(upload: UploadFile) -> tuple[UploadSession, ParsedWorkbook]:
+    ingested = ingest_upload(upload)
+    temp_path = ingested.path
+    try:
+        parsed = preview_workbook(temp_path, ingested.fingerprint)
+        session = upload_sessions.stage(temp_path, ingested.filename, ingested.fingerprint)
+        temp_path = ""
+        return session, parsed
+    finally:
+        cleanup_files(temp_path)
+
+
+def negotiate_upload(fingerprint: str, filename: str) -> tuple[UploadSession, ParsedWorkbook] | None:
+    _validate_upload_filename(filename)
+    session = upload_sessions.claim(fingerprint, filename)
+    if session is None:
+        logger.info("[Uploads] No staged content for fingerprint %s; upload required.", fingerprint[:12])
+        return None
+    return session, preview_workbook(session.staged_path, fingerprint)
+
+
+def stage_upload(upload: UploadFile) -> UploadSession:
+    ingested = ingest_upload(upload)
+    temp_path = ingested.path
+    try:
+        session = upload_sessions.stage(temp_path, ingested.filename, ingested.fingerprint)
+        temp_path = ""
+        return session
+    finally:
+        cleanup_files(temp_path)
+
+
+def _resolve_upload_session(upload_id: str) -> UploadSession:
+    session = upload_sessions.get(upload_id)
+    if session is None:
+        logger.warning("[Report] Upload session '%s' was not found or has expired.", upload_id)
+        raise HTTPException(
+            status_code=404,
+            detail="Upload session not found or expired. Please upload the file again.",
+        )
+    return session
 
 
 def _format_ratio_percentage(value: Decimal | None) -> str:
@@ -529,11 +685,11 @@ def _period_month_context(period_label: str | None) -> dict[str, str]:
     }
 
 
-def _zone_rows(dataframe: pd.DataFrame, zone_name: str) -> pd.DataFrame:
+def _zone_rows(dataframe: pd.DataFrame, zone_name: str, zone_index: ZoneIndex | None = None) -> pd.DataFrame:
     normalized_zone = normalize_text(zone_name).lower()
-    filtered = dataframe[
-        dataframe["ZONES"].fillna("").map(lambda value: normalize_text(value).lower()) == normalized_zone
-    ]
+    if zone_index is None:
+        zone_index = build_zone_index(dataframe)
+    filtered = dataframe.iloc[zone_index.zone_positions(normalized_zone)]
     if filtered.empty:
         logger.warning("[Report] Zone row not found for '%s'.", zone_name)
         raise HTTPException(status_code=404, detail=f"No data found for zone '{zone_name}'.")
@@ -541,12 +697,11 @@ def _zone_rows(dataframe: pd.DataFrame, zone_name: str) -> pd.DataFrame:
     return filtered
 
 
-def _branch_subset(dataframe: pd.DataFrame, zone_name: str) -> pd.DataFrame:
+def _branch_subset(dataframe: pd.DataFrame, zone_name: str, zone_index: ZoneIndex | None = None) -> pd.DataFrame:
     normalized_zone = re.sub(r"\s*total\s*$", "", zone_name, flags=re.IGNORECASE).strip().lower()
-    return dataframe[
-        dataframe["ZONES"].fillna("").map(lambda value: normalize_text(value).lower() == normalized_zone)
-        & dataframe["BRANCHES"].fillna("").map(lambda value: normalize_text(value) != "")
-    ]
+    if zone_index is None:
+        zone_index = build_zone_index(dataframe)
+    return dataframe.iloc[zone_index.branch_positions(normalized_zone)]
 
 
 def _branch_names(dataframe: pd.DataFrame) -> list[str]:
@@ -558,51 +713,14 @@ def _branch_names(dataframe: pd.DataFrame) -> list[str]:
     return seen
 
 
-def _ratio_percent(value: Decimal | None) -> Decimal:
-    if value is None:
-        return Decimal("0")
-    return value * Decimal("100") if abs(value) <= 1 else value
-
-
-def _branch_budget_achievement(
-    dataframe: pd.DataFrame,
-    achieved_column: str,
-    budget_column: str,
-) -> tuple[str, Decimal] | None:
-    best_branch = ""
-    best_percentage: Decimal | None = None
-    for _, row in dataframe.iterrows():
-        achieved = parse_numeric(row.get(achieved_column))
-        budget = parse_numeric(row.get(budget_column))
-        branch = normalize_text(row.get("BRANCHES"))
-        if not branch or achieved is None or budget in (None, Decimal("0")):
-            continue
-        percentage = (achieved / budget) * Decimal("100")
-        if best_percentage is None or percentage > best_percentage:
-            best_percentage = percentage
-            best_branch = branch
-    if best_percentage is None:
-        return None
-    return best_branch, best_percentage
-
-
 def _negative_branch_entries(
-    dataframe: pd.DataFrame,
+    table: BranchTable,
     column: str,
     formatter: str,
     limit: int = 5,
 ) -> list[str]:
-    entries: list[tuple[str, Decimal]] = []
-    for _, row in dataframe.iterrows():
-        branch = normalize_text(row.get("BRANCHES"))
-        value = parse_numeric(row.get(column))
-        if not branch or value is None or value >= 0:
-            continue
-        entries.append((branch, abs(value)))
-
-    entries.sort(key=lambda item: item[1], reverse=True)
     output: list[str] = []
-    for branch, value in entries[:limit]:
+    for branch, value in negative_entries(table, column, limit):
         if formatter == "billions":
             rendered = format_billions(value)
             output.append(f"{branch} branch ({_currency(rendered)})")
@@ -627,146 +745,6 @@ def _join_readable(items: list[str]) -> str:
     return f"{', '.join(items[:-1])}, and {items[-1]}"
 
 
-def _cards_low_issuance_branches(
-    dataframe: pd.DataFrame,
-    current_column: str,
-    threshold: Decimal = Decimal("100"),
-) -> list[str]:
-    branches: list[str] = []
-    for _, row in dataframe.iterrows():
-        branch = normalize_text(row.get("BRANCHES"))
-        issued = parse_numeric(row.get(current_column)) or Decimal("0")
-        if branch and issued < threshold:
-            branches.append(branch)
-    return branches
-
-
-def _positive_mom_growth_summary(
-    dataframe: pd.DataFrame,
-    previous_column: str,
-    current_column: str,
-) -> tuple[list[str], str, str]:
-    positive_branches: list[str] = []
-    standout_branch = ""
-    standout_growth = Decimal("0")
-
-    for _, row in dataframe.iterrows():
-        branch = normalize_text(row.get("BRANCHES"))
-        previous_value = parse_numeric(row.get(previous_column))
-        current_value = parse_numeric(row.get(current_column))
-        if not branch or previous_value is None or current_value is None:
-            continue
-        if current_value <= previous_value:
-            continue
-
-        positive_branches.append(branch)
-
-        if previous_value > 0:
-            growth = ((current_value - previous_value) / previous_value) * Decimal("100")
-            if growth > standout_growth:
-                standout_growth = growth
-                standout_branch = branch
-
-    standout_growth_text = f"{int(standout_growth):,}" if standout_growth > 0 else ""
-    return positive_branches, standout_branch, standout_growth_text
-
-
-def _branches_by_growth_direction(
-    dataframe: pd.DataFrame,
-    previous_column: str,
-    current_column: str,
-    direction: str,
-) -> list[str]:
-    branches: list[str] = []
-    for _, row in dataframe.iterrows():
-        branch = normalize_text(row.get("BRANCHES"))
-        previous_value = parse_numeric(row.get(previous_column))
-        current_value = parse_numeric(row.get(current_column))
-        if not branch or previous_value is None or current_value is None:
-            continue
-        if direction == "positive" and current_value > previous_value:
-            branches.append(branch)
-        if direction == "negative" and current_value < previous_value:
-            branches.append(branch)
-    return branches
-
-
-def _branches_by_negative_value(
-    dataframe: pd.DataFrame,
-    column: str,
-) -> list[str]:
-    branches: list[str] = []
-    for _, row in dataframe.iterrows():
-        branch = normalize_text(row.get("BRANCHES"))
-        value = parse_numeric(row.get(column))
-        if branch and value is not None and value < 0:
-            branches.append(branch)
-    return branches
-
-
-def _branches_above_threshold(
-    dataframe: pd.DataFrame,
-    column: str,
-    threshold: Decimal,
-    limit: int = 3,
-) -> list[tuple[str, Decimal]]:
-    items: list[tuple[str, Decimal]] = []
-    for _, row in dataframe.iterrows():
-        branch = normalize_text(row.get("BRANCHES"))
-        value = parse_numeric(row.get(column))
-        if not branch or value is None:
-            continue
-        scaled = _ratio_percent(value)
-        if scaled > threshold:
-            items.append((branch, scaled))
-    items.sort(key=lambda item: item[1], reverse=True)
-    return items[:limit]
-
-
-def _branches_below_threshold(
-    dataframe: pd.DataFrame,
-    column: str,
-    threshold: Decimal,
-    limit: int = 3,
-) -> list[tuple[str, Decimal]]:
-    items: list[tuple[str, Decimal]] = []
-    for _, row in dataframe.iterrows():
-        branch = normalize_text(row.get("BRANCHES"))
-        value = parse_numeric(row.get(column))
-        if not branch or value is None:
-            continue
-        scaled = _ratio_percent(value)
-        if scaled < threshold:
-            items.append((branch, scaled))
-    items.sort(key=lambda item: item[1])
-    return items[:limit]
-
-
-def _count_negative(dataframe: pd.DataFrame, column: str) -> int:
-    count = 0
-    for _, row in dataframe.iterrows():
-        value = parse_numeric(row.get(column))
-        if value is not None and value < 0:
-            count += 1
-    return count
-
-
-def _branch_extreme(dataframe: pd.DataFrame, column: str, highest: bool = True) -> tuple[str, Decimal] | None:
-    branch_name = ""
-    selected_value: Decimal | None = None
-    for _, row in dataframe.iterrows():
-        branch = normalize_text(row.get("BRANCHES"))
-        value = parse_numeric(row.get(column))
-        if not branch or value is None:
-            continue
-        if selected_value is None or (value > selected_value if highest else value < selected_value):
-            selected_value = value
-            branch_name = branch
-    if selected_value is None:
-        return None
-    return branch_name, selected_value
-
-
 def _additional_narrative_context(zone_name: str, zone_row: pd.Series, branch_rows: pd.DataFrame) -> dict[str, str]:
     branch_names = _branch_names(branch_rows)
     zonal_head_name = "-"
@@ -788,54 +766,46 @@ def _additional_narrative_context(zone_name: str, zone_row: pd.Series, branch_ro
     ao_total = ao_current + ao_savings
     ao_unfunded_share = (ao_unfunded / ao_total * Decimal("100")) if ao_total else Decimal("0")
 
-    branch_rows_with_totals = branch_rows.copy()
-    branch_rows_with_totals["__ao_total"] = branch_rows_with_totals.apply(
-        lambda item: (parse_numeric(item.get("AO C/A Opened - Total")) or Decimal("0"))
-        + (parse_numeric(item.get("AO S/A Opened - Total")) or Decimal("0")),
-        axis=1,
-    )
-    ao_low_branch = _branch_extreme(branch_rows_with_totals, "__ao_total", highest=False)
-
-    tra_high = _branch_extreme(branch_rows, "TRA Loan to Dep", highest=True)
-    tra_low = _branch_extreme(branch_rows, "TRA Loan to Dep", highest=False)
-    tra_overutilized = _branches_above_threshold(branch_rows, "TRA Loan to Dep", Decimal("150"))
-    tra_low_ldr = _branches_below_threshold(branch_rows, "TRA Loan to Dep", Decimal("20"))
-
-    aob_active_branches = 0
-    for _, branch_row in branch_rows.iterrows():
-        if (parse_numeric(branch_row.get("AOB Jul-25")) or Decimal("0")) > 0:
-            aob_active_branches += 1
-
-    dda_top = _branch_budget_achievement(branch_rows, "DDA Jul-25", "DDA 2025 FULL YR BGT")
-    sav_top = _branch_budget_achievement(branch_rows, "SAV Jul-25", "SAV 2025 FULL YR BGT")
-    fd_top = _branch_budget_achievement(branch_rows, "FD Jul-25", "FD 2025 FULL YR BGT")
-    dp_top = _branch_budget_achievement(branch_rows, "DP Jul-25", "DP 2025 FULL YR BGT")
+    table = BranchTable(branch_rows)
+    ao_low_branch = summed_extreme(table, ["AO C/A Opened - Total", "AO S/A Opened - Total"], highest=False)
+
+    tra_high = branch_extreme(table, "TRA Loan to Dep", highest=True)
+    tra_low = branch_extreme(table, "TRA Loan to Dep", highest=False)
+    tra_overutilized = branches_above_threshold(table, "TRA Loan to Dep", Decimal("150"))
+    tra_low_ldr = branches_below_threshold(table, "TRA Loan to Dep", Decimal("20"))
+
+    aob_active_branches = count_positive(table, "AOB Jul-25")
+
+    dda_top = budget_achievement(table, "DDA Jul-25", "DDA 2025 FULL YR BGT")
+    sav_top = budget_achievement(table, "SAV Jul-25", "SAV 2025 FULL YR BGT")
+    fd_top = budget_achievement(table, "FD Jul-25", "FD 2025 FULL YR BGT")
+    dp_top = budget_achievement(table, "DP Jul-25", "DP 2025 FULL YR BGT")
     cds_previous_issued = parse_numeric(zone_row.get("CDS1 No. of Cards Issued")) or Decimal("0")
     cds_current_issued = parse_numeric(zone_row.get("CDS2 No. of Cards Issued")) or Decimal("0")
     cds_growth = Decimal("0")
     if cds_previous_issued != 0:
         cds_growth = ((cds_current_issued - cds_previous_issued) / cds_previous_issued) * Decimal("100")
-    cds_low_branches = _cards_low_issuance_branches(branch_rows, "CDS2 No. of Cards Issued")
-    nxp_positive_branches, nxp_top_growth_branch, nxp_top_growth_pct = _positive_mom_growth_summary(
-        branch_rows,
+    cds_low_branches = low_issuance_branches(table, "CDS2 No. of Cards Issued")
+    nxp_positive_branches, nxp_top_growth_branch, nxp_top_growth_pct = positive_growth_summary(
+        table,
         "NXP Jun-25",
         "NXP Jul-25",
     )
-    dp_positive_mom_branches = _branches_by_growth_direction(branch_rows, "DP Jun-25", "DP Jul-25", "positive")
-    ab_decline_branches = _branches_by_negative_value(branch_rows, "AB VAR")
+    dp_positive_mom_branches = branches_by_growth_direction(table, "DP Jun-25", "DP Jul-25", "positive")
+    ab_decline_branches = negative_value_branches(table, "AB VAR")
 
     return {
         "zone_branch_count": str(len(branch_names)),
         "zonal_head_name": zonal_head_name,
         "zone_base_name": re.sub(r"\s*total\s*$", "", zone_name, flags=re.IGNORECASE).strip(),
-        "PBT_negative_yoy_branches": _join_readable(_negative_branch_entries(branch_rows, "PBT 2025 YOY VAR", "billions")),
-        "PBT_negative_mom_branch_count": str(_count_negative(branch_rows, "PBT Mthly Var")),
-        "PBT_negative_mom_branches": _join_readable(_negative_branch_entries(branch_rows, "PBT Mthly Var", "billions")),
-        "DDA_negative_ytd_branches": _join_readable(_negative_branch_entries(branch_rows, "DDA YTD Variance", "billions")),
-        "SAV_negative_ytd_branches": _join_readable(_negative_branch_entries(branch_rows, "SAV YTD Variance", "billions")),
-        "FD_negative_mom_branches": _join_readable(_negative_branch_entries(branch_rows, "FD MOM Variance", "billions")),
-        "DP_negative_ytd_branches": _join_readable(_negative_branch_entries(branch_rows, "DP YTD Variance", "dp")),
-        "AB_negative_variance_branches": _join_readable(_negative_branch_entries(branch_rows, "AB VAR", "millions")),
+        "PBT_negative_yoy_branches": _join_readable(_negative_branch_entries(table, "PBT 2025 YOY VAR", "billions")),
+        "PBT_negative_mom_branch_count": str(count_negative(table, "PBT Mthly Var")),
+        "PBT_negative_mom_branches": _join_readable(_negative_branch_entries(table, "PBT Mthly Var", "billions")),
+        "DDA_negative_ytd_branches": _join_readable(_negative_branch_entries(table, "DDA YTD Variance", "billions")),
+        "SAV_negative_ytd_branches": _join_readable(_negative_branch_entries(table, "SAV YTD Variance", "billions")),
+        "FD_negative_mom_branches": _join_readable(_negative_branch_entries(table, "FD MOM Variance", "billions")),
+        "DP_negative_ytd_branches": _join_readable(_negative_branch_entries(table, "DP YTD Variance", "dp")),
+        "AB_negative_variance_branches": _join_readable(_negative_branch_entries(table, "AB VAR", "millions")),
         "DDA_top_budget_branch": dda_top[0] if dda_top else "",
         "DDA_top_budget_pct": f"{dda_top[1]:,.0f}" if dda_top else "0",
         "SAV_top_budget_branch": sav_top[0] if sav_top else "",
@@ -845,9 +815,9 @@ def _additional_narrative_context(zone_name: str, zone_row: pd.Series, branch_ro
         "DP_top_budget_branch": dp_top[0] if dp_top else "",
         "DP_top_budget_pct": f"{dp_top[1]:,.0f}" if dp_top else "0",
         "TRA_high_ldr_branch": tra_high[0] if tra_high else "",
-        "TRA_high_ldr_value": f"{_ratio_percent(tra_high[1]):,.0f}" if tra_high else "0",
+        "TRA_high_ldr_value": f"{ratio_percent(tra_high[1]):,.0f}" if tra_high else "0",
         "TRA_low_ldr_branch": tra_low[0] if tra_low else "",
-        "TRA_low_ldr_value": f"{_ratio_percent(tra_low[1]):,.0f}" if tra_low else "0",
+        "TRA_low_ldr_value": f"{ratio_percent(tra_low[1]):,.0f}" if tra_low else "0",
         "TRA_overutilized_branches": _join_readable([f"{branch} branch" for branch, _ in tra_overutilized]),
         "TRA_low_ldr_branches": _join_readable(
             [f"{branch} branch at {value:,.0f}%" for branch, value in tra_low_ldr]
@@ -876,88 +846,88 @@ def _additional_narrative_context(zone_name: str, zone_row: pd.Series, branch_ro
     }
 
 
-def _branch_metrics(zone_name: str, dataframe: pd.DataFrame) -> dict[str, str]:
+def _branch_metrics(zone_name: str, dataframe: pd.DataFrame, zone_index: ZoneIndex | None = None) -> dict[str, str]:
     logger.info("[Report] Calculating branch ranking metrics for '%s'.", zone_name)
-    zone_data = _branch_subset(dataframe, zone_name)
+    zone_data = _branch_subset(dataframe, zone_name, zone_index)
     if zone_data.empty:
         logger.warning("[Report] No branch-level rows found under '%s'.", zone_name)
         return {}
 
-    def first_last(sorted_frame: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
-        return sorted_frame.iloc[0], sorted_frame.iloc[-1]
+    table = BranchTable(zone_data)
+    rankings = rank_columns(table, BRANCH_RANKING_COLUMNS)
+    pbt_high, pbt_low = rankings["PBT 2025 YTD ACHVD"].high, rankings["PBT 2025 YTD ACHVD"].low
+    dda_high, dda_low = rankings["DDA Jul-25"].high, rankings["DDA Jul-25"].low
+    sav_high, sav_low = rankings["SAV Jul-25"].high, rankings["SAV Jul-25"].low
+    fd_high, fd_low = rankings["FD Jul-25"].high, rankings["FD Jul-25"].low
+    dp_high, dp_low = rankings["DP Jul-25"].high, rankings["DP Jul-25"].low
+    pbt_cti_high, pbt_cti_low = rankings["PBT Cost to Income Ratio"].high, rankings["PBT Cost to Income Ratio"].low
+    dmt_high, dmt_low = rankings["TOTAL_DMT_ACT"].high, rankings["TOTAL_DMT_ACT"].low
 
-    pbt_high, pbt_low = first_last(zone_data.sort_values(by="PBT 2025 YTD ACHVD", ascending=False))
-    dda_high, dda_low = first_last(zone_data.sort_values(by="DDA Jul-25", ascending=False))
-    sav_high, sav_low = first_last(zone_data.sort_values(by="SAV Jul-25", ascending=False))
-    fd_high, fd_low = first_last(zone_data.sort_values(by="FD Jul-25", ascending=False))
-    dp_high, dp_low = first_last(zone_data.sort_values(by="DP Jul-25", ascending=False))
-    pbt_cti_high, pbt_cti_low = first_last(zone_data.sort_values(by="PBT Cost to Income Ratio", ascending=False))
-    dmt_high, dmt_low = first_last(zone_data.sort_values(by="TOTAL_DMT_ACT", ascending=False))
+    def branch(position: int) -> str:
+        return table.branch_name(position)
 
-    def share(row: pd.Series, column: str) -> str:
-        total = parse_numeric(zone_data[column].sum())
-        value = parse_numeric(row[column])
-        return _format_share_percentage(value, total)
+    def share(position: int, column: str) -> str:
+        return _format_share_percentage(table.decimal(position, column), rankings[column].total)
 
-    def variance_value(row: pd.Series, column: str) -> str:
-        value = parse_numeric(row[column]) or Decimal("0")
+    def variance_value(position: int, column: str) -> str:
+        value = table.decimal(position, column) or Decimal("0")
         return f"{value:,.2f}"
 
-    def formatted_variance(row: pd.Series, column: str, formatter: str) -> str:
-        value = parse_numeric(row[column]) or Decimal("0")
+    def formatted_variance(position: int, column: str, formatter: str) -> str:
+        value = table.decimal(position, column) or Decimal("0")
         if formatter == "billions":
             return _currency(format_billions(value))
         if formatter == "dp":
             return _currency(format_dp_millions(value))
         if formatter == "millions":
             return _currency(format_millions(value))
-        return _currency(variance_value(row, column))
+        return _currency(variance_value(position, column))
 
     metrics = {
-        "PBT_branch_high": normalize_text(pbt_high["BRANCHES"]),
-        "PBT_branch_low": normalize_text(pbt_low["BRANCHES"]),
+        "PBT_branch_high": branch(pbt_high),
+        "PBT_branch_low": branch(pbt_low),
         "PBT_branch_high_var": formatted_variance(pbt_high, "PBT Mthly Var", "billions"),
         "PBT_branch_low_var": formatted_variance(pbt_low, "PBT Mthly Var", "billions"),
         "PBT_branch_high_var_label": _variance_label(variance_value(pbt_high, "PBT Mthly Var")),
         "PBT_branch_low_var_label": _variance_label(variance_value(pbt_low, "PBT Mthly Var")),
         "PBT_branch_high_perc": share(pbt_high, "PBT 2025 YTD ACHVD"),
         "PBT_branch_low_perc": share(pbt_low, "PBT 2025 YTD ACHVD"),
-        "PBT_branch_cost_to_income_high": normalize_text(pbt_cti_high["BRANCHES"]),
-        "PBT_branch_cost_to_income_low": normalize_text(pbt_cti_low["BRANCHES"]),
+        "PBT_branch_cost_to_income_high": branch(pbt_cti_high),
+        "PBT_branch_cost_to_income_low": branch(pbt_cti_low),
         "PBT_branch_cost_to_income_high_perc": share(pbt_cti_high, "PBT Cost to Income Ratio"),
         "PBT_branch_cost_to_income_low_perc": share(pbt_cti_low, "PBT Cost to Income Ratio"),
-        "DDA_branch_high": normalize_text(dda_high["BRANCHES"]),
-        "DDA_branch_low": normalize_text(dda_low["BRANCHES"]),
+        "DDA_branch_high": branch(dda_high),
+        "DDA_branch_low": branch(dda_low),
         "DDA_branch_high_var": formatted_variance(dda_high, "DDA MOM Variance", "billions"),
         "DDA_branch_low_var": formatted_variance(dda_low, "DDA MOM Variance", "billions"),
         "DDA_branch_high_var_label": _variance_label(variance_value(dda_high, "DDA MOM Variance")),
         "DDA_branch_low_var_label": _variance_label(variance_value(dda_low, "DDA MOM Variance")),
         "DDA_branch_high_perc": share(dda_high, "DDA Jul-25"),
         "DDA_branch_low_perc": share(dda_low, "DDA Jul-25"),
-        "SAV_branch_high": normalize_text(sav_high["BRANCHES"]),
-        "SAV_branch_low": normalize_text(sav_low["BRANCHES"]),
+        "SAV_branch_high": branch(sav_high),
+        "SAV_branch_low": branch(sav_low),
         "SAV_branch_high_var": formatted_variance(sav_high, "SAV MOM Variance", "billions"),
         "SAV_branch_low_var": formatted_variance(sav_low, "SAV MOM Variance", "billions"),
         "SAV_branch_high_var_label": _variance_label(variance_value(sav_high, "SAV MOM Variance")),
         "SAV_branch_low_var_label": _variance_label(variance_value(sav_low, "SAV MOM Variance")),
         "SAV_branch_high_perc": share(sav_high, "SAV Jul-25"),
         "SAV_branch_low_perc": share(sav_low, "SAV Jul-25"),
-        "FD_branch_high": normalize_text(fd_high["BRANCHES"]),
-        "FD_branch_low": normalize_text(fd_low["BRANCHES"]),
+        "FD_branch_high": branch(fd_high),
+        "FD_branch_low": branch(fd_low),
         "FD_branch_high_var": formatted_variance(fd_high, "FD MOM Variance", "billions"),
         "FD_branch_low_var": formatted_variance(fd_low, "FD MOM Variance", "billions"),
         "FD_branch_high_var_label": _variance_label(variance_value(fd_high, "FD MOM Variance")),
         "FD_branch_low_var_label": _variance_label(variance_value(fd_low, "FD MOM Variance")),
         "FD_branch_high_perc": share(fd_high, "FD Jul-25"),
         "FD_branch_low_perc": share(fd_low, "FD Jul-25"),
-        "DP_branch_high": normalize_text(dp_high["BRANCHES"]),
-        "DP_branch_low": normalize_text(dp_low["BRANCHES"]),
+        "DP_branch_high": branch(dp_high),
+        "DP_branch_low": branch(dp_low),
         "DP_branch_high_var": formatted_variance(dp_high, "DP YTD Variance", "dp"),
         "DP_branch_low_var": formatted_variance(dp_low, "DP YTD Variance", "dp"),
         "DP_branch_high_perc": share(dp_high, "DP Jul-25"),
         "DP_branch_low_perc": share(dp_low, "DP Jul-25"),
-        "DMT_ACT_branch_high": normalize_text(dmt_high["BRANCHES"]),
-        "DMT_ACT_branch_low": normalize_text(dmt_low["BRANCHES"]),
+        "DMT_ACT_branch_high": branch(dmt_high),
+        "DMT_ACT_branch_low": branch(dmt_low),
         "DMT_ACT_branch_high_perc": share(dmt_high, "TOTAL_DMT_ACT"),
         "DMT_ACT_branch_low_perc": share(dmt_low, "TOTAL_DMT_ACT"),
     }
@@ -992,9 +962,9 @@ def _build_context(zone_name: str, parsed: ParsedWorkbook) -> dict[str, object]:
         parsed.detected_period_label,
     )
     _validate_report_columns(parsed, zone_name)
-    row = _zone_rows(parsed.dataframe, zone_name).iloc[0]
-    branch_rows = _branch_subset(parsed.dataframe, zone_name)
-    branch_data = _branch_metrics(zone_name, parsed.dataframe)
+    row = _zone_rows(parsed.dataframe, zone_name, parsed.zone_index).iloc[0]
+    branch_rows = _branch_subset(parsed.dataframe, zone_name, parsed.zone_index)
+    branch_data = _branch_metrics(zone_name, parsed.dataframe, parsed.zone_index)
     narrative_context = _additional_narrative_context(zone_name, row, branch_rows)
 
     def value(column: str) -> Decimal:
@@ -1074,7 +1044,7 @@ def _build_context(zone_name: str, parsed: ParsedWorkbook) -> dict[str, object]:
         "TRA_value3": _signed_value(format_billions(value("TRA Jul-25")), "₦"),
         "TRA_value2_r": _trend_rich_text(format_billions(value("TRA Jun-25")), value("TRA May-25"), value("TRA Jun-25"), "₦"),
         "TRA_value3_r": _trend_rich_text(format_billions(value("TRA Jul-25")), value("TRA Jun-25"), value("TRA Jul-25"), "₦"),
-        "TRA_value4": f"{_ratio_percent(tra_ratio):,.0f}",
+        "TRA_value4": f"{ratio_percent(tra_ratio):,.0f}",
         "TRA_value5": _format_variance_text(value("TRA YTD Variance"), "billions"),
         "TRA_value5_r": _variance_rich_text(value("TRA YTD Variance"), "billions", "₦"),
         "TRA_value5_summary": _summary_variance_display(value("TRA YTD Variance"), "billions", "₦"),
@@ -1138,83 +1108,478 @@ def _build_context(zone_name: str, parsed: ParsedWorkbook) -> dict[str, object]:
     return context
 
 
-def generate_report(db: Session, profile_id: int, zone_name: str, upload: UploadFile) -> tuple[str, str]:
+def _artifact_key(fingerprint: str, zone_name: str) -> ArtifactKey:
+    # structure_version() carries settings.schema_version plus the active structure file's identity.
+    return ArtifactKey(
+        fingerprint=fingerprint,
+        zone_name=zone_name,
+        template_hash=docx_template_cache.template_hash(settings.template_path),
+        schema_version=structure_version(),
+    )
+
+
+@dataclass
+class BatchZoneResult:
+    zone_name: str
+    status: str
+    run_id: int | None = None
+    report_filename: str | None = None
+    served_from_cache: bool = False
+    error: str | None = None
+
+
+def _resolve_report_source(
+    upload: UploadFile | None,
+    upload_id: str | None,
+) -> tuple[UploadSession | None, str, str, str]:
+    if upload_id:
+        session = _resolve_upload_session(upload_id)
+        return session, "", session.source_filename, session.fingerprint
+    ingested = ingest_upload(upload)
+    return None, ingested.path, ingested.filename, ingested.fingerprint
+
+
+def _load_report_workbook(session: UploadSession | None, temp_input_path: str, fingerprint: str) -> ParsedWorkbook:
+    if session:
+        # Sessions hold no parse of their own: the cache entry is keyed on the structure active right now,
+        # which is also the structure the artifact key records.
+        parsed = preview_workbook(session.staged_path, fingerprint)
+        logger.info("[Report] Using staged upload %s for '%s'.", session.upload_id, session.source_filename)
+    else:
+        parsed = preview_workbook(temp_input_path, fingerprint)
     logger.info(
-        "[Report] Starting generation. Profile ID=%s, Zone='%s', Source file='%s'.",
+        "[Report] Preview complete. Structure='%s'. Missing required fields=%s. Zones available=%s.",
+        parsed.structure_source_path,
+        parsed.missing_fields,
+        len(parsed.zones),
+    )
+    if parsed.missing_fields:
+        logger.error("[Report] Generation blocked. Preview is missing required mapped fields: %s.", parsed.missing_fields)
+        raise HTTPException(status_code=400, detail=f"Missing required mapped fields: {', '.join(parsed.missing_fields)}")
+    return parsed
+
+
+def _new_report_run(
+    profile_id: int,
+    zone_name: str,
+    source_filename: str,
+    source_fingerprint: str,
+    **fields: object,
+) -> ReportRun:
+    return ReportRun(
+        profile_id=profile_id,
+        zone_name=normalize_text(zone_name),
+        normalized_zone_name=normalize_text(zone_name).lower(),
+        source_filename=source_filename,
+        source_file_fingerprint=source_fingerprint,
+        schema_version=settings.schema_version,
+        **fields,
+    )
+
+
+def _record_cached_run(
+    db: Session,
+    profile_id: int,
+    zone_name: str,
+    source_filename: str,
+    source_fingerprint: str,
+    artifact: ReportArtifact,
+) -> ReportRun:
+    report_run = _new_report_run(
         profile_id,
         zone_name,
-        upload.filename,
+        source_filename,
+        source_fingerprint,
+        report_filename=artifact.report_filename,
+        status="completed",
+        detected_period_label=artifact.detected_period_label,
+        served_from_cache=True,
+        completed_at=datetime.now(UTC),
+    )
+    db.add(report_run)
+    db.commit()
+    logger.info("[Report] Served '%s' from the artifact cache. Run ID=%s.", artifact.report_filename, report_run.id)
+    return report_run
+
+
+def _fail_report_run(db: Session, report_run: ReportRun | None, message: str) -> None:
+    if report_run:
+        report_run.status = "failed"
+        report_run.error_message = message
+        report_run.completed_at = datetime.now(UTC)
+        db.commit()
+
+
+def _render_zone_report(
+    zone_name: str,
+    parsed: ParsedWorkbook,
+    output_path: str,
+    on_stage: Callable[[str], object] | None = None,
+) -> str:
+    if zone_name not in parsed.zones:
+        logger.warning("[Report] Selected zone '%s' is not present in the uploaded file. Available zones=%s.", zone_name, len(parsed.zones))
+        raise HTTPException(status_code=400, detail="Selected zone is not available in the uploaded file.")
+
+    context = _build_context(zone_name, parsed)
+    if on_stage:
+        on_stage("context_built")
+    logger.info("[Report] Rendering Word template from '%s'.", settings.template_path)
+    doc = docx_template_cache.open(settings.template_path)
+    doc.render(context)
+    doc.save(output_path)
+    if on_stage:
+        on_stage("rendered")
+    logger.info("[Report] Word template rendered successfully to '%s'.", output_path)
+    return f"{context['title'].replace(' ', '_')}_Report.docx"
+
+
+def _store_artifact(artifact_key: ArtifactKey, output_path: str, report_filename: str, detected_period_label: str | None) -> None:
+    try:
+        report_artifacts.put(artifact_key, output_path, report_filename, detected_period_label)
+    except OSError:
+        logger.warning("[Report] Could not store the rendered report in the artifact cache.", exc_info=True)
+
+
+def _complete_report_run(db: Session, report_run: ReportRun, report_filename: str) -> None:
+    report_run.report_filename = report_filename
+    report_run.status = "completed"
+    report_run.completed_at = datetime.now(UTC)
+    db.commit()
+    logger.info("[Report] Generation complete. Run ID=%s, output filename='%s'.", report_run.id, report_filename)
+
+
+@dataclass(frozen=True)
+class RenderedReport:
+    path: str
+    report_filename: str
+    detected_period_label: str | None
+
+
+def _share_render_failure(exc: BaseException) -> BaseException | None:
+    # Validation and render errors are about the file and zone, so they are every follower's answer too. Anything
+    # else (a lost job lease, a full disk) belongs to the leader, and a follower renders for itself instead.
+    if isinstance(exc, HTTPException):
+        return HTTPException(status_code=exc.status_code, detail=exc.detail, headers=exc.headers)
+    return None
+
+
+report_render_flights: SingleFlight[RenderedReport] = SingleFlight("report-render", share_error=_share_render_failure)
+
+
+def _render_coalesced(
+    artifact_key: ArtifactKey,
+    zone_name: str,
+    load_parsed: Callable[[], ParsedWorkbook],
+    output_path: str,
+    on_stage: Callable[[str], object] | None = None,
+) -> RenderedReport:
+    def render_into(path: str) -> RenderedReport:
+        parsed = load_parsed()
+        if on_stage:
+            on_stage("parsed")
+        report_filename = _render_zone_report(zone_name, parsed, path, on_stage)
+        _store_artifact(artifact_key, path, report_filename, parsed.detected_period_label)
+        return RenderedReport(path, report_filename, parsed.detected_period_label)
+
+    # Keyed on the exact zone name like the artifact cache: zone validation and the report title both use it verbatim.
+    rendered, shared = report_render_flights.do(artifact_key.digest(), lambda: render_into(output_path))
+    if not shared:
+        return rendered
+    if on_stage:
+        on_stage("coalesced")
+    try:
+        # The leader's output is removed once its own response is sent; link it before that happens.
+        link_or_copy(Path(rendered.path), output_path)
+    except OSError:
+        logger.info("[Report] Shared render for '%s' was already cleaned up. Rendering again.", zone_name)
+        return render_into(output_path)
+    return RenderedReport(output_path, rendered.report_filename, rendered.detected_period_label)
+
+
+def generate_report(
+    db: Session,
+    profile_id: int,
+    zone_name: str,
+    upload: UploadFile | None = None,
+    upload_id: str | None = None,
+) -> tuple[str, str]:
+    logger.info(
+        "[Report] Starting generation. Profile ID=%s, Zone='%s', Source file='%s', Upload ID='%s'.",
+        profile_id,
+        zone_name,
+        upload.filename if upload else None,
+        upload_id,
     )
     profile = get_profile(db, profile_id)
     if not profile:
         logger.warning("[Report] Generation stopped because profile %s was not found.", profile_id)
         raise HTTPException(status_code=404, detail="Profile not found.")
+    if not upload_id and upload is None:
+        raise HTTPException(status_code=400, detail="Provide either an uploaded file or an upload_id from the preview step.")
 
-    temp_input_path = save_upload_to_temp(upload)
+    temp_input_path = ""
     temp_output_path = tempfile.mktemp(suffix=".docx")
     report_run: ReportRun | None = None
     try:
-        parsed = preview_workbook(temp_input_path)
-        logger.info(
-            "[Report] Preview complete. Structure='%s'. Missing required fields=%s. Zones available=%s.",
-            parsed.structure_source_path,
-            parsed.missing_fields,
-            len(parsed.zones),
-        )
-        if parsed.missing_fields:
-            logger.error("[Report] Generation blocked. Preview is missing required mapped fields: %s.", parsed.missing_fields)
-            raise HTTPException(status_code=400, detail=f"Missing required mapped fields: {', '.join(parsed.missing_fields)}")
-
-        report_run = ReportRun(
-            profile_id=profile_id,
-            zone_name=normalize_text(zone_name),
-            normalized_zone_name=normalize_text(zone_name).lower(),
-            source_filename=upload.filename or "upload",
-            source_file_fingerprint=file_fingerprint(temp_input_path),
-            status="processing",
-            schema_version=settings.schema_version,
-            detected_period_label=parsed.detected_period_label,
-        )
+        session, temp_input_path, source_filename, source_fingerprint = _resolve_report_source(upload, upload_id)
+
+        artifact_key = _artifact_key(source_fingerprint, zone_name)
+        artifact = report_artifacts.get(artifact_key, temp_output_path)
+        if artifact:
+            _record_cached_run(db, profile_id, zone_name, source_filename, source_fingerprint, artifact)
+            return temp_output_path, artifact.report_filename
+
+        report_run = _new_report_run(profile_id, zone_name, source_filename, source_fingerprint, status="processing")
         db.add(report_run)
         db.commit()
         db.refresh(report_run)
         logger.info("[Report] Report history row created with ID=%s.", report_run.id)
 
-        if zone_name not in parsed.zones:
-            logger.warning("[Report] Selected zone '%s' is not present in the uploaded file. Available zones=%s.", zone_name, len(parsed.zones))
-            raise HTTPException(status_code=400, detail="Selected zone is not available in the uploaded file.")
-
-        context = _build_context(zone_name, parsed)
-        logger.info("[Report] Rendering Word template from '%s'.", settings.template_path)
-        doc = DocxTemplate(settings.template_path)
-        doc.render(context)
-        doc.save(temp_output_path)
-        logger.info("[Report] Word template rendered successfully to '%s'.", temp_output_path)
-
-        report_filename = f"{context['title'].replace(' ', '_')}_Report.docx"
-        report_run.report_filename = report_filename
-        report_run.status = "completed"
-        report_run.completed_at = datetime.now(UTC)
-        db.commit()
-        logger.info("[Report] Generation complete. Run ID=%s, output filename='%s'.", report_run.id, report_filename)
-        return temp_output_path, report_filename
+        rendered = _render_coalesced(
+            artifact_key,
+            zone_name,
+            lambda: _load_report_workbook(session, temp_input_path, source_fingerprint),
+            temp_output_path,
+        )
+        report_run.detected_period_label = rendered.detected_period_label
+        _complete_report_run(db, report_run, rendered.report_filename)
+        return temp_output_path, rendered.report_filename
     except HTTPException as exc:
         logger.warning("[Report] Generation failed with handled error for zone '%s': %s", zone_name, exc.detail)
-        if report_run:
-            report_run.status = "failed"
-            report_run.error_message = str(exc.detail)
-            report_run.completed_at = datetime.now(UTC)
-            db.commit()
+        _fail_report_run(db, report_run, str(exc.detail))
         raise
     except Exception as exc:
         logger.exception("[Report] Generation crashed unexpectedly for zone '%s'.", zone_name)
-        if report_run:
-            report_run.status = "failed"
-            report_run.error_message = str(exc)
-            report_run.completed_at = datetime.now(UTC)
-            db.commit()
+        _fail_report_run(db, report_run, str(exc))
         raise HTTPException(status_code=500, detail=f"Server error: {exc}") from exc
     finally:
-        logger.info("[Cleanup] Removing temporary files. Input='%s', Output='%s'.", temp_input_path, temp_output_path)
-        cleanup_files(temp_input_path)
-        logger.info("[Cleanup] Temporary input file removed.")
+        if temp_input_path:
+            logger.info("[Cleanup] Removing temporary files. Input='%s', Output='%s'.", temp_input_path, temp_output_path)
+            cleanup_files(temp_input_path)
+            logger.info("[Cleanup] Temporary input file removed.")
+
+
+def run_report_job(
+    db: Session,
+    report_run: ReportRun,
+    zone_name: str,
+    session: UploadSession,
+    output_path: str,
+    heartbeat: Callable[[], object] | None = None,
+) -> None:
+    logger.info("[Report] Job started. Run ID=%s, Zone='%s', Upload ID='%s'.", report_run.id, zone_name, session.upload_id)
+    report_run.status = "processing"
+    db.commit()
+    report_progress.record(report_run.id, "processing")
+
+    def on_stage(stage: str) -> None:
+        if heartbeat:
+            heartbeat()
+        report_progress.record(report_run.id, stage)
+
+    try:
+        if not os.path.exists(session.staged_path):
+            raise HTTPException(status_code=410, detail="The uploaded workbook for this report is no longer available.")
+        artifact_key = _artifact_key(session.fingerprint, zone_name)
+        artifact = report_artifacts.get(artifact_key, output_path)
+        if artifact:
+            on_stage("served_from_cache")
+            report_run.served_from_cache = True
+            report_run.detected_period_label = artifact.detected_period_label
+            _complete_report_run(db, report_run, artifact.report_filename)
+            on_stage("persisted")
+            report_progress.record(report_run.id, "completed", artifact.report_filename)
+            return
+
+        rendered = _render_coalesced(
+            artifact_key,
+            zone_name,
+            lambda: _load_report_workbook(session, "", session.fingerprint),
+            output_path,
+            on_stage,
+        )
+        report_run.detected_period_label = rendered.detected_period_label
+        _complete_report_run(db, report_run, rendered.report_filename)
+        on_stage("persisted")
+        report_progress.record(report_run.id, "completed", rendered.report_filename)
+    except HTTPException as exc:
+        # Handled errors are final; anything else propagates so the job queue can retry it.
+        logger.warning("[Report] Job %s failed with handled error for zone '%s': %s", report_run.id, zone_name, exc.detail)
+        _fail_report_run(db, report_run, str(exc.detail))
+        report_progress.record(report_run.id, "failed", str(exc.detail))
+
+
+def _requested_zones(zones: list[str]) -> tuple[list[str], bool]:
+    requested: list[str] = []
+    for zone in zones:
+        name = zone.strip()
+        if name.lower() == BATCH_ALL_ZONES:
+            return [], True
+        if name and name not in requested:
+            requested.append(name)
+    return requested, False
+
+
+def _unique_archive_name(report_filename: str, used_names: set[str]) -> str:
+    stem, suffix = os.path.splitext(report_filename)
+    candidate = report_filename
+    counter = 2
+    while candidate.lower() in used_names:
+        candidate = f"{stem}_{counter}{suffix}"
+        counter += 1
+    used_names.add(candidate.lower())
+    return candidate
+
+
+def _fail_batch_zone(db: Session, result: BatchZoneResult, report_run: ReportRun, message: str) -> None:
+    result.status = "failed"
+    result.error = message
+    _fail_report_run(db, report_run, message)
+
+
+class _ArchiveChunks:
+    # Write-only sink for zipfile. Without tell() or seek() zipfile writes each entry with a trailing data
+    # descriptor, so whatever an entry wrote can be drained and sent before the next zone renders.
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _add_batch_entry(archive: zipfile.ZipFile, result: BatchZoneResult, output_path: str, used_names: set[str]) -> None:
+    result.report_filename = _unique_archive_name(result.report_filename, used_names)
+    archive.write(output_path, result.report_filename, compress_type=zipfile.ZIP_STORED)
+    cleanup_files(output_path)
+
+
+def generate_batch_reports(
+    db: Session,
+    profile_id: int,
+    zones: list[str],
+    upload: UploadFile | None = None,
+    upload_id: str | None = None,
+) -> Iterator[bytes]:
+    logger.info(
+        "[Batch] Starting batch generation. Profile ID=%s, Zones=%s, Source file='%s', Upload ID='%s'.",
+        profile_id,
+        zones,
+        upload.filename if upload else None,
+        upload_id,
+    )
+    profile = get_profile(db, profile_id)
+    if not profile:
+        logger.warning("[Batch] Generation stopped because profile %s was not found.", profile_id)
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    if not upload_id and upload is None:
+        raise HTTPException(status_code=400, detail="Provide either an uploaded file or an upload_id from the preview step.")
+    requested, all_zones = _requested_zones(zones)
+    if not requested and not all_zones:
+        raise HTTPException(status_code=400, detail=f"Provide at least one zone name or '{BATCH_ALL_ZONES}'.")
+
+    temp_input_path = ""
+    work_dir = tempfile.mkdtemp(prefix="report-batch-")
+    try:
+        session, temp_input_path, source_filename, source_fingerprint = _resolve_report_source(upload, upload_id)
+        parsed: ParsedWorkbook | None = None
+        if all_zones:
+            parsed = _load_report_workbook(session, temp_input_path, source_fingerprint)
+            requested = list(parsed.zones)
+        logger.info("[Batch] Generating %s zone reports from '%s'.", len(requested), source_filename)
+
+        results: list[BatchZoneResult] = []
+        pending: list[tuple[BatchZoneResult, ArtifactKey, str]] = []
+        for index, zone_name in enumerate(requested):
+            output_path = os.path.join(work_dir, f"{index}.docx")
+            artifact_key = _artifact_key(source_fingerprint, zone_name)
+            artifact = report_artifacts.get(artifact_key, output_path)
+            if artifact:
+                report_run = _record_cached_run(db, profile_id, zone_name, source_filename, source_fingerprint, artifact)
+                results.append(BatchZoneResult(zone_name, "completed", report_run.id, artifact.report_filename, served_from_cache=True))
+                continue
+            report_run = _new_report_run(profile_id, zone_name, source_filename, source_fingerprint, status="processing")
+            db.add(report_run)
+            db.commit()
+            db.refresh(report_run)
+            result = BatchZoneResult(zone_name, "processing", report_run.id)
+            results.append(result)
+            pending.append((result, artifact_key, output_path))
+    except BaseException:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if temp_input_path:
+            cleanup_files(temp_input_path)
+        raise
+
+    bind = db.get_bind()
+
+    def stream_archive(parsed: ParsedWorkbook | None) -> Iterator[bytes]:
+        # Runs after the request's dependencies have closed `db`, so it records outcomes through its own session.
+        stream_db = Session(bind=bind, autoflush=False, expire_on_commit=False)
+        sink = _ArchiveChunks()
+        used_names: set[str] = set()
+        try:
+            with zipfile.ZipFile(sink, "w") as archive:
+                for index, result in enumerate(results):
+                    if result.status == "completed":
+                        _add_batch_entry(archive, result, os.path.join(work_dir, f"{index}.docx"), used_names)
+                        yield sink.drain()
+
+                if pending:
+                    try:
+                        # Parsed at most once, and only if some zone misses the artifact cache.
+                        if parsed is None:
+                            parsed = _load_report_workbook(session, temp_input_path, source_fingerprint)
+                    except HTTPException as exc:
+                        for result, _, _ in pending:
+                            _fail_batch_zone(stream_db, result, stream_db.get(ReportRun, result.run_id), str(exc.detail))
+                    else:
+                        outcomes = render_pool.iter_render(
+                            _render_zone_report,
+                            parsed,
+                            [(result.zone_name, output_path) for result, _, output_path in pending],
+                            work_dir,
+                        )
+                        for (result, artifact_key, output_path), outcome in zip(pending, outcomes):
+                            report_run = stream_db.get(ReportRun, result.run_id)
+                            report_run.detected_period_label = parsed.detected_period_label
+                            if outcome.error is not None:
+                                _fail_batch_zone(stream_db, result, report_run, outcome.error)
+                                continue
+                            _store_artifact(artifact_key, output_path, outcome.report_filename, parsed.detected_period_label)
+                            _complete_report_run(stream_db, report_run, outcome.report_filename)
+                            result.status = "completed"
+                            result.report_filename = outcome.report_filename
+                            _add_batch_entry(archive, result, output_path, used_names)
+                            yield sink.drain()
+
+                summary = {
+                    "source_filename": source_filename,
+                    "completed": sum(result.status == "completed" for result in results),
+                    "failed": sum(result.status == "failed" for result in results),
+                    "zones": [asdict(result) for result in results],
+                }
+                archive.writestr(BATCH_SUMMARY_FILENAME, json.dumps(summary, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+            yield sink.drain()
+            logger.info("[Batch] Batch complete. Completed=%s, Failed=%s.", summary["completed"], summary["failed"])
+        except BaseException:
+            # A dropped download or a crash mid-archive must not leave runs stuck in "processing".
+            for result, _, _ in pending:
+                if result.status == "processing":
+                    _fail_batch_zone(stream_db, result, stream_db.get(ReportRun, result.run_id), "The batch stopped before this zone finished.")
+            raise
+        finally:
+            stream_db.close()
+            shutil.rmtree(work_dir, ignore_errors=True)
+            if temp_input_path:
+                cleanup_files(temp_input_path)
+
+    return stream_archive(parsed)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Flight(Generic[T]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+        self.followers = 0
+
+
+class SingleFlight(Generic[T]):
+    # Concurrent calls with the same key share one execution; followers block until the leader finishes.
+    # A leader's failure reaches followers only if share_error maps it to a fresh exception for them (it describes
+    # the shared input, not the leader's own circumstances); otherwise a follower runs the call again as a leader.
+    def __init__(self, name: str, share_error: Callable[[BaseException], BaseException | None] | None = None) -> None:
+        self.name = name
+        self._share_error = share_error or (lambda exc: None)
+        self._flights: dict[Hashable, _Flight[T]] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    self.leaders += 1
+                    break
+                flight.followers += 1
+                self.coalesced += 1
+
+            logger.info("[SingleFlight] %s: joined in-flight call for %s.", self.name, key)
+            flight.done.wait()
+            if flight.error is None:
+                return flight.result, True
+            shared = self._share_error(flight.error)
+            if shared is not None:
+                raise shared from flight.error
+            logger.info("[SingleFlight] %s: leader for %s failed with %r. Retrying as leader.", self.name, key, flight.error)
+
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+            if flight.followers:
+                logger.info("[SingleFlight] %s: %s follower(s) shared the result for %s.", self.name, flight.followers, key)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._flights)}
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Bump when _signature_sequence changes so stale signatures on disk are rebuilt.
+INDEX_FORMAT_VERSION = 1
+
+
+@dataclass
+class StructureSignature:
+    path: str
+    size: int
+    mtime_ns: int
+    headers: list[str]
+    signature: list[str]
+
+    @cached_property
+    def token_counts(self) -> Counter[str]:
+        return Counter(self.signature)
+
+
+class StructureSignatureIndex:
+    # Header lists and signature sequences for reference structures, persisted as JSON next to the
+    # active structure. An entry is rebuilt only when its file's size or mtime changes.
+    def __init__(
+        self,
+        index_path_for: Callable[[], Path],
+        load_headers: Callable[[Path], list[str]],
+        build_signature: Callable[[list[str]], list[str]],
+    ) -> None:
+        self._index_path_for = index_path_for
+        self._load_headers = load_headers
+        self._build_signature = build_signature
+        self._lock = threading.Lock()
+        self._entries: dict[str, StructureSignature] = {}
+        self._loaded_from: tuple[Path, int | None] | None = None
+        self.rebuilt = 0
+
+    def _index_mtime_ns(self, index_path: Path) -> int | None:
+        try:
+            return index_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self, index_path: Path) -> None:
+        # Another worker may have rewritten the index since we last read it.
+        state = (index_path, self._index_mtime_ns(index_path))
+        if state == self._loaded_from:
+            return
+        entries: dict[str, StructureSignature] = {}
+        try:
+            payload = json.loads(index_path.read_text(encoding="utf-8"))
+            if payload.get("version") == INDEX_FORMAT_VERSION:
+                entries = {entry["path"]: StructureSignature(**entry) for entry in payload["structures"]}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("[Structure Index] Ignoring unreadable index '%s': %s", index_path, exc)
+        self._entries = entries
+        self._loaded_from = state
+
+    def _save(self, index_path: Path) -> None:
+        self._entries = {path: entry for path, entry in self._entries.items() if os.path.exists(path)}
+        payload = {"version": INDEX_FORMAT_VERSION, "structures": [asdict(entry) for entry in self._entries.values()]}
+        temp_path = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+        try:
+            temp_path.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(temp_path, index_path)
+        except OSError as exc:
+            logger.warning("[Structure Index] Could not persist index '%s': %s", index_path, exc)
+            return
+        self._loaded_from = (index_path, self._index_mtime_ns(index_path))
+
+    def signatures(self, paths: list[Path]) -> list[StructureSignature]:
+        index_path = self._index_path_for()
+        signatures: list[StructureSignature] = []
+        with self._lock:
+            self._load(index_path)
+            changed = False
+            for path in map(Path.resolve, paths):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                key = str(path)
+                entry = self._entries.get(key)
+                if entry is None or (entry.size, entry.mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                    headers = self._load_headers(path)
+                    entry = StructureSignature(key, stat.st_size, stat.st_mtime_ns, headers, self._build_signature(headers))
+                    self._entries[key] = entry
+                    self.rebuilt += 1
+                    changed = True
+                    logger.info("[Structure Index] Indexed '%s' with %s headers.", path, len(headers))
+                signatures.append(entry)
+            if changed:
+                self._save(index_path)
+        return signatures
+
+    def headers(self, path: Path) -> list[str]:
+        signatures = self.signatures([path])
+        if not signatures:
+            raise FileNotFoundError(path)
+        return list(signatures[0].headers)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+from docxtpl import DocxTemplate
+from jinja2 import Environment, Template
+
+logger = logging.getLogger(__name__)
+
+
+class _CompilingEnvironment(Environment):
+    # docxtpl compiles every XML part with from_string on each render; the sources only change with the file.
+    def __init__(self) -> None:
+        super().__init__()
+        self._compiled: dict[str, Template] = {}
+
+    def from_string(self, source: Any, globals: Any = None, template_class: Any = None) -> Template:
+        if globals is not None or template_class is not None or not isinstance(source, str):
+            return super().from_string(source, globals, template_class)
+        template = self._compiled.get(source)
+        if template is None:
+            template = self._compiled.setdefault(source, super().from_string(source))
+        return template
+
+
+@dataclass
+class CompiledTemplate:
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    content: bytes
+    environment: _CompilingEnvironment = field(default_factory=_CompilingEnvironment)
+    patched_xml: dict[str, str] = field(default_factory=dict)
+
+    def patch(self, src_xml: str, patcher: Callable[[str], str]) -> str:
+        patched = self.patched_xml.get(src_xml)
+        if patched is None:
+            patched = self.patched_xml.setdefault(src_xml, patcher(src_xml))
+        return patched
+
+
+class CachedDocxTemplate(DocxTemplate):
+    def __init__(self, compiled: CompiledTemplate) -> None:
+        super().__init__(BytesIO(compiled.content))
+        self.compiled = compiled
+
+    def patch_xml(self, src_xml: str) -> str:
+        return self.compiled.patch(src_xml, super().patch_xml)
+
+    def render(self, context: dict[str, Any], jinja_env: Environment | None = None, autoescape: bool = False) -> None:
+        if jinja_env is None and not autoescape:
+            jinja_env = self.compiled.environment
+        super().render(context, jinja_env, autoescape)
+
+
+class DocxTemplateCache:
+    def __init__(self) -> None:
+        self._compiled: dict[str, CompiledTemplate] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self, path: str | Path) -> CompiledTemplate:
+        path_str = str(path)
+        stat = Path(path_str).stat()
+        with self._lock:
+            cached = self._compiled.get(path_str)
+            if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+                return cached
+
+            content = Path(path_str).read_bytes()
+            sha256 = hashlib.sha256(content).hexdigest()
+            if cached and cached.sha256 == sha256:
+                cached.mtime_ns = stat.st_mtime_ns
+                cached.size = stat.st_size
+                logger.info("[Template] '%s' was touched but its content is unchanged. Keeping compiled parts.", path_str)
+                return cached
+
+            compiled = CompiledTemplate(
+                path=path_str,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                sha256=sha256,
+                content=content,
+            )
+            self._compiled[path_str] = compiled
+            self.loads += 1
+            logger.info("[Template] Loaded '%s' (sha256=%s).", path_str, sha256[:12])
+            return compiled
+
+    def open(self, path: str | Path) -> CachedDocxTemplate:
+        # Every render gets its own Document parsed from the cached bytes; compiled parts are shared read-only.
+        return CachedDocxTemplate(self.get(path))
+
+    def template_hash(self, path: str | Path) -> str:
+        return self.get(path).sha256
+
+    def clear(self) -> None:
+        with self._lock:
+            self._compiled.clear()
+
+
+docx_template_cache = DocxTemplateCache()
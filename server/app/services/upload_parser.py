@@ -3,15 +3,24 @@ from __future__ import annotations
 import hashlib
 import logging
 import re
-from dataclasses import dataclass
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime
 from difflib import SequenceMatcher
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+import openpyxl
 import pandas as pd
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
 
 from ..config import settings
-from .normalization import normalize_key, normalize_text, parse_numeric
+from .mapping_plans import mapping_plans
+from .normalization import normalize_key, normalize_text, parse_numeric_column
+from .structure_index import StructureSignature, StructureSignatureIndex
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +98,24 @@ LEGACY_PATTERNS: dict[str, list[str]] = {
     "% Reactivated DMT_ACT": [r"\bdmt act\b(?!.*\bno\b).*\breactivated\b", r"\bpercent\b.*\breactivated\b", r"\breactivated\b.*\bpercent\b", r"\b%\b.*\breactivated\b"],
 }
 
+CONTEXT_RULES: list[tuple[str, list[str]]] = [
+    ("pbt", [r"\bpbt\b"]),
+    ("dda", [r"\bdda\b"]),
+    ("sav", [r"\bsav\b", r"\bsavings\b"]),
+    ("fd", [r"\bfd\b", r"\bfixed deposit\b"]),
+    ("dp", [r"\bdp\b", r"\btotal deposits\b", r"\bdomiciliary deposits\b"]),
+    ("tra", [r"\btra\b", r"\bretail loans\b", r"\brisk assets\b", r"\bloan to dep\b"]),
+    ("ab", [r"\bab\b", r"\bagency banking\b"]),
+    ("ao", [r"\baccounts opened\b", r"\bc a opened\b", r"\bs a opened\b"]),
+    ("cds1", [r"\bcards august\b"]),
+    ("cds2", [r"\bcards september\b"]),
+    ("ce", [r"\bce\b", r"\bchannels enrollment\b"]),
+    ("aob", [r"\baob\b", r"\bagents onboarded\b"]),
+    ("nxp", [r"\bnxp\b"]),
+    ("dmt act", [r"\bdormant account\b", r"\bdmt\b.*\bact\b"]),
+    ("pos", [r"\bpos terminal\b", r"\bactive pos\b", r"\bpos\b"]),
+]
+
 DYNAMIC_FAMILY_SLOTS: dict[str, list[str]] = {
     "DDA": ["DDA May-25", "DDA Jun-25", "DDA Jul-25"],
     "SAV": ["SAV May-25", "SAV Jun-25", "SAV Jul-25"],
@@ -101,9 +128,102 @@ DYNAMIC_FAMILY_SLOTS: dict[str, list[str]] = {
 }
 
 AB_SLOTS = ["AB Jun-25", "AB Jul-25"]
+# _detect_header_row never looks further down than this, and the report body always starts after row 5.
+HEADER_PREVIEW_ROWS = 12
+BODY_START_ROW = 5
 REQUIRED_FIELDS = ["ZONES", "BRANCHES", "PBT 2025 YTD ACHVD", "DDA Jul-25", "SAV Jul-25", "FD Jul-25", "DP Jul-25"]
 
 
+@dataclass(frozen=True)
+class HeaderClass:
+    key: str
+    context: str | None
+    fields: frozenset[str]
+
+
+class HeaderClassifier:
+    # Every pattern becomes a lookahead anchored at the start of the key, so one match() call answers all of them.
+    # Context rules are alternatives tried in rule order (first hit wins); field patterns are optional lookaheads
+    # that each capture when their pattern occurs anywhere in the key.
+    def __init__(self, field_patterns: dict[str, list[str]], context_rules: list[tuple[str, list[str]]]) -> None:
+        self._field_names = list(field_patterns)
+        self._field_matcher = re.compile(
+            "".join(
+                f"(?=(?:.*?(?P<f{index}>{'|'.join(f'(?:{pattern})' for pattern in patterns)}))?)"
+                for index, patterns in enumerate(field_patterns.values())
+            ),
+            re.DOTALL,
+        )
+        self._contexts = [context for context, _ in context_rules]
+        self._context_matcher = re.compile(
+            "|".join(
+                f"(?=.*?(?:{'|'.join(f'(?:{pattern})' for pattern in patterns)}))(?P<c{index}>)"
+                for index, (_, patterns) in enumerate(context_rules)
+            ),
+            re.DOTALL,
+        )
+        self._memo: dict[str, HeaderClass] = {}
+        self._lock = threading.Lock()
+
+    def classify(self, header: object) -> HeaderClass:
+        # Memoised on the raw header text so repeat headers skip normalisation as well as matching.
+        memo_key = header if isinstance(header, str) else None
+        cached = self._memo.get(memo_key) if memo_key is not None else None
+        if cached is not None:
+            return cached
+
+        key = normalize_key(header)
+        context_match = self._context_matcher.match(key)
+        context = self._contexts[int(context_match.lastgroup[1:])] if context_match else None
+        field_groups = self._field_matcher.match(key).groups()
+        fields = frozenset(name for name, group in zip(self._field_names, field_groups) if group is not None)
+        classified = HeaderClass(key, context, fields)
+        if memo_key is not None:
+            with self._lock:
+                if len(self._memo) >= HEADER_MEMO_MAX_ENTRIES:
+                    self._memo.clear()
+                self._memo[memo_key] = classified
+        return classified
+
+
+HEADER_MEMO_MAX_ENTRIES = 50_000
+header_classifier = HeaderClassifier(LEGACY_PATTERNS, CONTEXT_RULES)
+
+
+@dataclass
+class ZoneIndex:
+    zone_rows: dict[str, np.ndarray] = field(default_factory=dict)
+    branch_rows: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def zone_positions(self, zone_key: str) -> np.ndarray:
+        return self.zone_rows.get(zone_key, np.empty(0, dtype=np.intp))
+
+    def branch_positions(self, zone_key: str) -> np.ndarray:
+        return self.branch_rows.get(zone_key, np.empty(0, dtype=np.intp))
+
+
+def build_zone_index(dataframe: pd.DataFrame) -> ZoneIndex:
+    # Keys are normalize_text(ZONES).lower(); a row counts as a branch when its BRANCHES cell is non-blank.
+    if "ZONES" not in dataframe.columns:
+        return ZoneIndex()
+    zone_keys = dataframe["ZONES"].fillna("").map(lambda value: normalize_text(value).lower()).to_numpy()
+    if "BRANCHES" in dataframe.columns:
+        has_branch = dataframe["BRANCHES"].fillna("").map(lambda value: normalize_text(value) != "").to_numpy(dtype=bool)
+    else:
+        has_branch = np.zeros(len(dataframe), dtype=bool)
+
+    zone_positions: dict[str, list[int]] = {}
+    branch_positions: dict[str, list[int]] = {}
+    for position, (zone_key, is_branch) in enumerate(zip(zone_keys, has_branch)):
+        zone_positions.setdefault(zone_key, []).append(position)
+        if is_branch:
+            branch_positions.setdefault(zone_key, []).append(position)
+    return ZoneIndex(
+        zone_rows={key: np.asarray(positions, dtype=np.intp) for key, positions in zone_positions.items()},
+        branch_rows={key: np.asarray(positions, dtype=np.intp) for key, positions in branch_positions.items()},
+    )
+
+
 @dataclass
 class ParsedWorkbook:
     dataframe: pd.DataFrame
@@ -113,13 +233,37 @@ class ParsedWorkbook:
     detected_period_label: str | None
     zones: list[str]
     structure_source_path: str | None = None
+    zone_index: ZoneIndex | None = None
+
+    def __post_init__(self) -> None:
+        if self.zone_index is None:
+            self.zone_index = build_zone_index(self.dataframe)
+
+
+@dataclass
+class WorkbookPreview:
+    mapped_fields: dict[str, str]
+    missing_fields: list[str]
+    detected_period_label: str | None
+    zones: list[str]
 
 
 def _read_raw_table(path: str | Path) -> pd.DataFrame:
+    # This is the only full read of an upload: header detection, period detection and the
+    # structure-mapped body are all sliced from the same untyped grid.
     path_str = str(path)
     if path_str.lower().endswith(".csv"):
         return pd.read_csv(path_str, header=None, dtype=str)
-    return pd.read_excel(path_str, header=None, dtype=str)
+    return pd.read_excel(path_str, header=None, dtype=object)
+
+
+def _infer_body_column(column: pd.Series) -> pd.Series:
+    # Body cells keep the numeric typing a headerless read of the body alone would infer,
+    # so scientific-notation CSV values are not handed to parse_numeric as text.
+    try:
+        return pd.to_numeric(column)
+    except (TypeError, ValueError):
+        return column
 
 
 def file_fingerprint(path: str) -> str:
@@ -130,6 +274,14 @@ def file_fingerprint(path: str) -> str:
     return digest.hexdigest()
 
 
+def structure_version() -> str:
+    fallback = Path(settings.fallback_structure_path).resolve()
+    if not fallback.exists():
+        return f"{settings.schema_version}:{fallback}:missing"
+    stat = fallback.stat()
+    return f"{settings.schema_version}:{fallback}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
 def _dedupe_headers(headers: list[str]) -> list[str]:
     seen: dict[str, int] = {}
     output: list[str] = []
@@ -244,13 +396,9 @@ def _contextualize_headers(headers: list[str]) -> list[str]:
     return contextualized
 
 
-def _fallback_dataframe(path: str | Path) -> tuple[pd.DataFrame, int, str]:
-    path_str = str(path)
-    logger.info("[Parser] Step 1/4: Reading uploaded report body from '%s' (skip first 5 rows).", path_str)
-    if path_str.lower().endswith(".csv"):
-        uploaded = pd.read_csv(path_str, skiprows=5, header=None)
-    else:
-        uploaded = pd.read_excel(path_str, skiprows=5, header=None)
+def _fallback_dataframe(raw: pd.DataFrame) -> tuple[pd.DataFrame, int, str]:
+    logger.info("[Parser] Step 1/4: Slicing uploaded report body from the raw grid (skip first 5 rows).")
+    uploaded = raw.iloc[BODY_START_ROW:].reset_index(drop=True).apply(_infer_body_column)
     logger.info(
         "[Parser] Loaded uploaded report body. Rows=%s, Columns=%s.",
         uploaded.shape[0],
@@ -273,7 +421,7 @@ def _fallback_dataframe(path: str | Path) -> tuple[pd.DataFrame, int, str]:
         len(structure_headers),
         dataframe.shape[0],
     )
-    return dataframe, 5, str(structure_path)
+    return dataframe, BODY_START_ROW, str(structure_path)
 
 
 def _extract_period(value: object) -> tuple[int, int] | None:
@@ -312,14 +460,11 @@ def _sorted_unique_periods(columns: list[str]) -> list[tuple[int, int]]:
 
 
 def _resolve_static_mappings(columns: list[str]) -> dict[str, str]:
-    normalized_columns = {column: normalize_key(column) for column in columns}
-    mapping: dict[str, str] = {}
-    for legacy_name, patterns in LEGACY_PATTERNS.items():
-        for column, key in normalized_columns.items():
-            if any(re.search(pattern, key) for pattern in patterns):
-                mapping[legacy_name] = column
-                break
-    return mapping
+    first_column: dict[str, str] = {}
+    for column in dict.fromkeys(columns):
+        for legacy_name in header_classifier.classify(column).fields:
+            first_column.setdefault(legacy_name, column)
+    return {legacy_name: first_column[legacy_name] for legacy_name in LEGACY_PATTERNS if legacy_name in first_column}
 
 
 def _reference_structure_paths() -> list[Path]:
@@ -338,7 +483,7 @@ def _select_structure_template(uploaded_column_count: int) -> tuple[Path, list[s
     if not fallback.exists():
         raise ValueError("No active structure template is available.")
 
-    headers = _load_template_headers(fallback)
+    headers = structure_signatures.headers(fallback)
     logger.info(
         "[Parser] Active structure candidate: '%s' with %s headers.",
         fallback,
@@ -361,6 +506,7 @@ def _select_structure_template(uploaded_column_count: int) -> tuple[Path, list[s
     return fallback, headers
 
 
+@lru_cache(maxsize=65536)
 def _signature_header(value: object) -> str:
     key = normalize_key(value)
     key = re.sub(r"^\d+(?:\.\d+)?\s+", "", key)
@@ -376,28 +522,7 @@ def _signature_header(value: object) -> str:
 
 
 def _next_context(header: str, current_context: str | None) -> str | None:
-    key = normalize_key(header)
-    context_rules = [
-        ("pbt", [r"\bpbt\b"]),
-        ("dda", [r"\bdda\b"]),
-        ("sav", [r"\bsav\b", r"\bsavings\b"]),
-        ("fd", [r"\bfd\b", r"\bfixed deposit\b"]),
-        ("dp", [r"\bdp\b", r"\btotal deposits\b", r"\bdomiciliary deposits\b"]),
-        ("tra", [r"\btra\b", r"\bretail loans\b", r"\brisk assets\b", r"\bloan to dep\b"]),
-        ("ab", [r"\bab\b", r"\bagency banking\b"]),
-        ("ao", [r"\baccounts opened\b", r"\bc a opened\b", r"\bs a opened\b"]),
-        ("cds1", [r"\bcards august\b"]),
-        ("cds2", [r"\bcards september\b"]),
-        ("ce", [r"\bce\b", r"\bchannels enrollment\b"]),
-        ("aob", [r"\baob\b", r"\bagents onboarded\b"]),
-        ("nxp", [r"\bnxp\b"]),
-        ("dmt act", [r"\bdormant account\b", r"\bdmt\b.*\bact\b"]),
-        ("pos", [r"\bpos terminal\b", r"\bactive pos\b", r"\bpos\b"]),
-    ]
-    for context, patterns in context_rules:
-        if any(re.search(pattern, key) for pattern in patterns):
-            return context
-    return current_context
+    return header_classifier.classify(header).context or current_context
 
 
 def _signature_sequence(headers: list[str]) -> list[str]:
@@ -434,6 +559,13 @@ def _load_template_headers(path: Path) -> list[str]:
     return [normalize_text(header) for header in pd.read_excel(path, nrows=0).columns.tolist()]
 
 
+def _structure_index_path() -> Path:
+    return Path(settings.fallback_structure_path).resolve().with_suffix(".signatures.json")
+
+
+structure_signatures = StructureSignatureIndex(_structure_index_path, _load_template_headers, _signature_sequence)
+
+
 def _duplicate_candidates(headers: list[str], canonical_name: str) -> list[str]:
     return [header for header in headers if header == canonical_name or header.startswith(f"{canonical_name}__")]
 
@@ -493,32 +625,57 @@ def _resolve_manual_alias_mapping(headers: list[str]) -> dict[str, str]:
     return mapping
 
 
+def _alignment_upper_bound(template_counts: Counter[str], upload_counts: Counter[str], total: int) -> float:
+    # SequenceMatcher.quick_ratio(): matching blocks can never pair more tokens than the two multisets share.
+    overlap = sum((template_counts & upload_counts).values())
+    return 2.0 * overlap / total if total else 1.0
+
+
 def _aligned_template_mapping(upload_headers: list[str]) -> dict[str, str]:
     upload_signature = _signature_sequence(upload_headers)
+    upload_counts = Counter(upload_signature)
+    structures = structure_signatures.signatures(_reference_structure_paths())
+
+    # Align the most promising structures first and stop once no remaining upper bound can beat the best
+    # score. Ties keep going to the earliest structure, as they did when every structure was aligned in order.
+    candidates = sorted(
+        (
+            (
+                _alignment_upper_bound(structure.token_counts, upload_counts, len(structure.signature) + len(upload_signature)),
+                position,
+                structure,
+            )
+            for position, structure in enumerate(structures)
+        ),
+        key=lambda candidate: (-candidate[0], candidate[1]),
+    )
+    matcher = SequenceMatcher(b=upload_signature)
     best_score = 0.0
-    best_mapping: dict[str, str] = {}
-
-    for template_path in _reference_structure_paths():
-        template_headers = _load_template_headers(template_path)
-        template_signature = _signature_sequence(template_headers)
-        matcher = SequenceMatcher(a=template_signature, b=upload_signature)
-        score = matcher.ratio()
-        if score <= best_score:
+    best_position = len(structures)
+    best_structure: StructureSignature | None = None
+    best_blocks: list = []
+    aligned = 0
+    for upper_bound, position, structure in candidates:
+        if upper_bound < best_score:
+            break
+        if upper_bound == best_score and position > best_position:
             continue
+        matcher.set_seq1(structure.signature)
+        score = matcher.ratio()
+        aligned += 1
+        if score > best_score or (score == best_score and score > 0 and position < best_position):
+            best_score, best_position, best_structure = score, position, structure
+            best_blocks = matcher.get_matching_blocks()
 
-        candidate_mapping: dict[str, str] = {}
-        for block in matcher.get_matching_blocks():
-            if block.size == 0:
-                continue
-            for offset in range(block.size):
-                template_header = template_headers[block.a + offset]
-                upload_header = upload_headers[block.b + offset]
-                candidate_mapping.setdefault(template_header, upload_header)
-
-        if candidate_mapping:
-            best_score = score
-            best_mapping = candidate_mapping
-
+    logger.info("[Parser] Aligned %s of %s reference structures (best score %.3f).", aligned, len(structures), best_score)
+    best_mapping: dict[str, str] = {}
+    if best_structure is None:
+        return best_mapping
+    for block in best_blocks:
+        for offset in range(block.size):
+            template_header = best_structure.headers[block.a + offset]
+            upload_header = upload_headers[block.b + offset]
+            best_mapping.setdefault(template_header, upload_header)
     return best_mapping
 
 
@@ -588,6 +745,59 @@ def _resolve_dynamic_period_mappings(columns: list[str]) -> dict[str, str]:
     return mapping
 
 
+@lru_cache(maxsize=65536)
+def _header_period(header: str) -> tuple[int, int] | None:
+    return _extract_period(header)
+
+
+def _reference_structures_state() -> str:
+    parts = [structure_version()]
+    for path in _reference_structure_paths():
+        stat = path.stat()
+        parts.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "\x1f".join(parts)
+
+
+# Bump when the header rules or any MAPPING_PLAN_RESOLVERS resolver changes so plans stored for older rules are not served.
+MAPPING_RULES_VERSION = 1
+
+
+def _layout_key(headers: list[str]) -> str:
+    # Layouts that differ only in their period labels share a key. Each period is reduced to its rank among
+    # the layout's periods, so dynamic slots keep binding to the same relative months.
+    periods = [_header_period(header) for header in headers]
+    ranks = {period: rank for rank, period in enumerate(sorted({period for period in periods if period}))}
+    digest = hashlib.sha256(f"{MAPPING_RULES_VERSION}\x1f{_reference_structures_state()}".encode("utf-8"))
+    for token, period in zip(_signature_sequence(headers), periods):
+        digest.update(f"\x1e{token}\x1f{ranks.get(period, '')}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class HeaderMappingPlan:
+    def __init__(self, headers: list[str]) -> None:
+        self.headers = list(headers)
+        self.layout_key = _layout_key(self.headers)
+        self._positions: dict[str, int] = {}
+        for position, header in enumerate(self.headers):
+            self._positions.setdefault(header, position)
+
+    def mapping(self, part: str) -> dict[str, str]:
+        positions = mapping_plans.get(self.layout_key, part)
+        if positions is not None:
+            return {name: self.headers[position] for name, position in positions.items()}
+        resolved = MAPPING_PLAN_RESOLVERS[part](self.headers)
+        mapping_plans.put(self.layout_key, part, {name: self._positions[column] for name, column in resolved.items()})
+        return resolved
+
+
+MAPPING_PLAN_RESOLVERS = {
+    "aligned": _aligned_template_mapping,
+    "static": _resolve_static_mappings,
+    "dynamic": _resolve_dynamic_period_mappings,
+    "alias": _resolve_manual_alias_mapping,
+}
+
+
 def _apply_canonical_mapping(dataframe: pd.DataFrame, mapping: dict[str, str]) -> pd.DataFrame:
     renamed = dataframe.rename(columns={raw_name: canonical for canonical, raw_name in mapping.items()}).copy()
     return renamed.loc[:, ~renamed.columns.duplicated()]
@@ -616,44 +826,55 @@ def _detected_period_label(columns: list[str]) -> str | None:
 
 
 def _normalize_dataframe_values(dataframe: pd.DataFrame) -> pd.DataFrame:
-    normalized = dataframe.copy()
-    for column in normalized.columns:
+    # Columns are addressed by position because normalized structure headers can repeat.
+    columns: list[pd.Series] = []
+    for position, column in enumerate(dataframe.columns):
+        values = dataframe.iloc[:, position]
         if column in {"ZONES", "BRANCHES", "ZONAL HEAD"}:
-            normalized[column] = normalized[column].map(normalize_text)
+            columns.append(values.map(normalize_text))
         else:
-            normalized[column] = normalized[column].map(parse_numeric)
+            columns.append(parse_numeric_column(values))
+    normalized = pd.concat(columns, axis=1) if columns else dataframe.copy()
+    normalized.columns = dataframe.columns
     return normalized
 
 
-def _parse_dynamic_workbook(path: str) -> tuple[pd.DataFrame, int, list[str], dict[str, str]]:
-    raw = _read_raw_table(path)
+def _parse_dynamic_workbook(raw: pd.DataFrame) -> tuple[pd.DataFrame, int, list[str], dict[str, str]]:
     header_row_index = _detect_header_row(raw)
     headers = _compose_headers(raw, header_row_index)
     dataframe = raw.iloc[header_row_index + 1 :].reset_index(drop=True).copy()
     dataframe.columns = headers
     dataframe = dataframe.dropna(how="all")
-    mapping = _aligned_template_mapping(list(dataframe.columns))
-    for canonical, raw_name in _resolve_static_mappings(list(dataframe.columns)).items():
+    plan = HeaderMappingPlan(list(dataframe.columns))
+    mapping = plan.mapping("aligned")
+    for canonical, raw_name in plan.mapping("static").items():
         mapping.setdefault(canonical, raw_name)
-    for canonical, raw_name in _resolve_dynamic_period_mappings(list(dataframe.columns)).items():
+    for canonical, raw_name in plan.mapping("dynamic").items():
         mapping.setdefault(canonical, raw_name)
     renamed = _apply_canonical_mapping(dataframe, mapping)
     return renamed, header_row_index, headers, mapping
 
 
-def _parse_structure_workbook(path: str) -> tuple[pd.DataFrame, int, list[str], dict[str, str], str]:
-    dataframe, header_row_index, structure_source_path = _fallback_dataframe(path)
+def _structure_field_mapping(headers: list[str]) -> tuple[dict[str, str], dict[str, str]]:
+    mapping = {column: column for column in headers}
+    applied_aliases: dict[str, str] = {}
+    for canonical_name, source_name in HeaderMappingPlan(headers).mapping("alias").items():
+        if source_name in mapping:
+            applied_aliases[canonical_name] = source_name
+            mapping[canonical_name] = source_name
+    return mapping, applied_aliases
+
+
+def _parse_structure_workbook(raw: pd.DataFrame) -> tuple[pd.DataFrame, int, list[str], dict[str, str], str]:
+    dataframe, header_row_index, structure_source_path = _fallback_dataframe(raw)
     headers = list(dataframe.columns)
-    mapping = {column: column for column in dataframe.columns}
-    manual_alias_mapping = _resolve_manual_alias_mapping(headers)
-    if manual_alias_mapping:
-        for canonical_name, source_name in manual_alias_mapping.items():
-            if source_name in dataframe.columns:
-                dataframe[canonical_name] = dataframe[source_name]
-                mapping[canonical_name] = source_name
+    mapping, applied_aliases = _structure_field_mapping(headers)
+    if applied_aliases:
+        for canonical_name, source_name in applied_aliases.items():
+            dataframe[canonical_name] = dataframe[source_name]
         logger.info(
             "[Parser] Manual structure alias corrections applied: %s.",
-            ", ".join(f"{canonical}->{source}" for canonical, source in manual_alias_mapping.items()),
+            ", ".join(f"{canonical}->{source}" for canonical, source in applied_aliases.items()),
         )
     return dataframe.copy(), header_row_index, headers, mapping, structure_source_path
 
@@ -663,7 +884,7 @@ def parse_uploaded_workbook(path: str) -> ParsedWorkbook:
     raw = _read_raw_table(path)
     raw_header_index = _detect_header_row(raw)
     raw_headers = _compose_headers(raw, raw_header_index)
-    structure_frame, structure_header_index, structure_headers, structure_mapping, structure_source_path = _parse_structure_workbook(path)
+    structure_frame, structure_header_index, structure_headers, structure_mapping, structure_source_path = _parse_structure_workbook(raw)
     chosen_frame = _normalize_dataframe_values(structure_frame)
     chosen_header_index = structure_header_index
     chosen_headers = structure_headers
@@ -687,3 +908,112 @@ def parse_uploaded_workbook(path: str) -> ParsedWorkbook:
         zones=zones,
         structure_source_path=structure_source_path,
     )
+
+
+def _convert_preview_cell(cell) -> object:
+    # Same conversions pandas applies when it reads the full sheet, so zones compare equal either way.
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        whole = int(cell.value)
+        return whole if whole == cell.value else float(cell.value)
+    return cell.value
+
+
+def _trimmed_preview_row(row) -> list[object]:
+    values = [_convert_preview_cell(cell) for cell in row]
+    while values and values[-1] == "":
+        values.pop()
+    return values
+
+
+def _row_width(row) -> int:
+    for position in range(len(row) - 1, -1, -1):
+        if row[position].value is not None:
+            return position + 1
+    return 0
+
+
+def preview_uploaded_headers(path: str) -> WorkbookPreview | None:
+    # Zones, period label and field mapping from one streaming pass that converts only the header rows and
+    # the ZONES column. Returns None whenever the result could differ from a full read, and the caller then
+    # parses the whole workbook.
+    if not str(path).lower().endswith(".xlsx"):
+        return None
+    try:
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    except Exception as exc:
+        logger.info("[Parser] Header-only preview unavailable for '%s': %s", path, exc)
+        return None
+
+    try:
+        sheet = workbook.worksheets[0]
+        declared_columns = sheet.max_column
+        if declared_columns is None:
+            logger.info("[Parser] Header-only preview skipped for '%s': sheet has no declared dimension.", path)
+            return None
+        # The structure is chosen by width, so the declared dimension picks it up front and the real width of
+        # every streamed row is checked against it before anything is returned.
+        try:
+            _, structure_headers = _select_structure_template(declared_columns)
+        except ValueError as exc:
+            # The full parse reports the mismatch against the sheet's real width.
+            logger.info("[Parser] Header-only preview skipped for '%s': %s", path, exc)
+            return None
+        headers = [normalize_text(header) for header in structure_headers]
+        mapping, _ = _structure_field_mapping(headers)
+        zone_source = mapping.get("ZONES")
+        if zone_source is not None and headers.count(zone_source) > 1:
+            return None
+        zone_position = headers.index(zone_source) if zone_source is not None else None
+
+        sheet.reset_dimensions()
+        header_rows: list[list[object]] = []
+        zone_cells: list[list[object]] = []
+        width = 0
+        last_data_row = -1
+        for row_index, row in enumerate(sheet.iter_rows()):
+            if row_index < HEADER_PREVIEW_ROWS:
+                header_rows.append(_trimmed_preview_row(row))
+                row_width = len(header_rows[-1])
+            else:
+                row_width = _row_width(row)
+            if row_width:
+                width = max(width, row_width)
+                last_data_row = row_index
+            if row_index >= BODY_START_ROW and zone_position is not None:
+                zone_cells.append([_convert_preview_cell(row[zone_position]) if zone_position < len(row) else ""])
+    finally:
+        workbook.close()
+
+    if width != declared_columns:
+        logger.info(
+            "[Parser] Header-only preview skipped for '%s': declared width %s, actual width %s.",
+            path,
+            declared_columns,
+            width,
+        )
+        return None
+
+    # A full read drops trailing empty rows, which only reaches into the header window on very short sheets.
+    header_rows = header_rows[: last_data_row + 1]
+    header_frame = TextParser(
+        [row + [""] * (width - len(row)) for row in header_rows], header=None, dtype=object, skip_blank_lines=False
+    ).read()
+    raw_headers = _compose_headers(header_frame, _detect_header_row(header_frame))
+    # Blank lines are kept as read_excel keeps them; trailing empty rows are not.
+    zone_cells = zone_cells[: max(last_data_row + 1 - BODY_START_ROW, 0)]
+    zones: list[str] = []
+    if zone_cells:
+        zone_column = _infer_body_column(TextParser(zone_cells, header=None, dtype=object, skip_blank_lines=False).read()[0])
+        zones = _extract_zones(pd.DataFrame({"ZONES": zone_column.map(normalize_text)}))
+
+    logger.info("[Parser] Header-only preview for '%s': %s zones from %s columns.", path, len(zones), width)
+    return WorkbookPreview(
+        mapped_fields=mapping,
+        missing_fields=[field for field in REQUIRED_FIELDS if field not in mapping],
+        detected_period_label=_detected_period_label(raw_headers),
+        zones=zones,
+    )
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UploadSession:
+    upload_id: str
+    fingerprint: str
+    source_filename: str
+    staged_path: str
+    expires_at: datetime
+
+
+class UploadSessionStore:
+    def __init__(self, staging_dir: str, ttl_seconds: int, content_retention_seconds: int = 0) -> None:
+        self.staging_dir = Path(staging_dir)
+        self.ttl = timedelta(seconds=ttl_seconds)
+        # Staged content outlives its sessions for this long so repeat uploads can be claimed by fingerprint.
+        self.content_retention_seconds = content_retention_seconds
+        self._sessions: dict[str, UploadSession] = {}
+        self._lock = threading.Lock()
+
+    def _staged_path_for(self, fingerprint: str, source_filename: str) -> Path:
+        suffix = os.path.splitext(source_filename)[1].lower()
+        return self.staging_dir / f"{fingerprint}{suffix}"
+
+    def stage(self, temp_path: str, source_filename: str, fingerprint: str) -> UploadSession:
+        self.purge_expired()
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        staged_path = self._staged_path_for(fingerprint, source_filename)
+        with self._lock:
+            if staged_path.exists():
+                os.unlink(temp_path)
+                os.utime(staged_path)
+            else:
+                shutil.move(temp_path, staged_path)
+            session = self._open_session(fingerprint, source_filename, staged_path)
+        logger.info(
+            "[Uploads] Staged '%s' as upload %s (fingerprint %s) until %s.",
+            source_filename,
+            session.upload_id,
+            fingerprint[:12],
+            session.expires_at.isoformat(),
+        )
+        return session
+
+    def claim(self, fingerprint: str, source_filename: str) -> UploadSession | None:
+        self.purge_expired()
+        staged_path = self._staged_path_for(fingerprint, source_filename)
+        with self._lock:
+            if not staged_path.exists():
+                return None
+            os.utime(staged_path)
+            session = self._open_session(fingerprint, source_filename, staged_path)
+        logger.info(
+            "[Uploads] Claimed staged content %s for '%s' as upload %s without a transfer.",
+            fingerprint[:12],
+            source_filename,
+            session.upload_id,
+        )
+        return session
+
+    def _open_session(self, fingerprint: str, source_filename: str, staged_path: Path) -> UploadSession:
+        session = UploadSession(
+            upload_id=uuid.uuid4().hex,
+            fingerprint=fingerprint,
+            source_filename=source_filename,
+            staged_path=str(staged_path),
+            expires_at=datetime.now(UTC) + self.ttl,
+        )
+        self._sessions[session.upload_id] = session
+        return session
+
+    def get(self, upload_id: str) -> UploadSession | None:
+        self.purge_expired()
+        with self._lock:
+            session = self._sessions.get(upload_id)
+            if session is None or not os.path.exists(session.staged_path):
+                return None
+            session.expires_at = datetime.now(UTC) + self.ttl
+            return session
+
+    def purge_expired(self) -> None:
+        now = datetime.now(UTC)
+        with self._lock:
+            expired = [session for session in self._sessions.values() if session.expires_at <= now]
+            for session in expired:
+                self._sessions.pop(session.upload_id)
+            live_paths = {session.staged_path for session in self._sessions.values()}
+            stale_paths = {session.staged_path for session in expired} - live_paths
+            if self.content_retention_seconds > 0:
+                stale_paths = self._retired_content(live_paths)
+            # Unlinked under the lock so a concurrent stage() or claim() never opens a session on a file being removed.
+            for stale_path in stale_paths:
+                if os.path.exists(stale_path):
+                    os.unlink(stale_path)
+                    logger.info("[Uploads] Removed expired staged upload '%s'.", stale_path)
+
+    def _retired_content(self, live_paths: set[str]) -> set[str]:
+        if not self.staging_dir.exists():
+            return set()
+        cutoff = time.time() - self.content_retention_seconds
+        return {
+            str(path)
+            for path in self.staging_dir.iterdir()
+            if path.is_file() and str(path) not in live_paths and path.stat().st_mtime <= cutoff
+        }
+
+
+upload_sessions = UploadSessionStore(
+    settings.upload_staging_dir,
+    settings.upload_session_ttl_seconds,
+    settings.upload_content_retention_seconds,
+)
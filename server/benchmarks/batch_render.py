@@ -0,0 +1,50 @@
+"""Measure batch report throughput across render worker counts.
+
+Run from the server directory with a real monthly workbook:
+
+    python -m benchmarks.batch_render "../AUGUST ZONAL DISTRIBUTION FOR BRANCHES.xlsx" --workers 1 2 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from app.config import settings
+from app.services.render_pool import ReportRenderPool
+from app.services.reporting import _render_zone_report, preview_workbook
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("workbook")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--zones", type=int, default=0, help="Limit the batch to the first N zones.")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    parsed = preview_workbook(args.workbook)
+    zones = parsed.zones[: args.zones] if args.zones else parsed.zones
+    print(f"{len(zones)} zones, {os.cpu_count()} cpus")
+    print(f"{'workers':>7} {'seconds':>8} {'zones/s':>8} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        pool = ReportRenderPool(workers, settings.template_path)
+        with tempfile.TemporaryDirectory() as work_dir:
+            jobs = [(zone, os.path.join(work_dir, f"{index}.docx")) for index, zone in enumerate(zones)]
+            # Warm the pool so process start-up is not counted against throughput.
+            pool.render(_render_zone_report, parsed, jobs[:workers * 2], work_dir)
+            started = time.perf_counter()
+            outcomes = pool.render(_render_zone_report, parsed, jobs, work_dir)
+            elapsed = time.perf_counter() - started
+        pool.shutdown()
+        failed = sum(outcome.error is not None for outcome in outcomes)
+        baseline = baseline or elapsed
+        print(f"{workers:>7} {elapsed:>8.2f} {len(zones) / elapsed:>8.1f} {baseline / elapsed:>7.1f}x" + (f"  ({failed} failed)" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare the sort-based branch ranking with the one-pass ranking engine.
+
+Run from the server directory:
+
+    python -m benchmarks.branch_metrics
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.branch_analytics import BranchTable, rank_columns
+from app.services.normalization import parse_numeric
+from app.services.reporting import BRANCH_RANKING_COLUMNS, _branch_metrics
+from app.services.upload_parser import build_zone_index
+
+BRANCH_COUNTS = [10, 50, 200, 1000, 5000]
+REPEATS = 20
+SHARE_LOOKUPS_PER_COLUMN = 2
+
+
+def _zone_frame(branch_count: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        {column: rng.normal(1_000.0, 400.0, branch_count).round(2) for column in BRANCH_RANKING_COLUMNS}
+    )
+    for column in ["PBT Mthly Var", "DDA MOM Variance", "SAV MOM Variance", "FD MOM Variance", "DP YTD Variance"]:
+        frame[column] = rng.normal(0.0, 50.0, branch_count).round(2)
+    frame.insert(0, "BRANCHES", [f"Branch {index}" for index in range(branch_count)])
+    frame.insert(0, "ZONES", "Bench")
+    return frame
+
+
+def _sorted_ranking(zone_data: pd.DataFrame) -> None:
+    # The previous implementation: one full sort per metric column and a fresh column total per share lookup.
+    for column in BRANCH_RANKING_COLUMNS:
+        ordered = zone_data.sort_values(by=column, ascending=False)
+        high, low = ordered.iloc[0], ordered.iloc[-1]
+        for row in [high, low][:SHARE_LOOKUPS_PER_COLUMN]:
+            parse_numeric(zone_data[column].sum())
+            parse_numeric(row[column])
+
+
+def _engine_ranking(zone_data: pd.DataFrame) -> None:
+    table = BranchTable(zone_data)
+    rankings = rank_columns(table, BRANCH_RANKING_COLUMNS)
+    for column, ranking in rankings.items():
+        table.decimal(ranking.high, column)
+        table.decimal(ranking.low, column)
+
+
+def _best_of(callable_, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        callable_(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    logging.disable(logging.INFO)
+    print(f"{'branches':>8} {'sorted ms':>10} {'engine ms':>10} {'speedup':>8} {'metrics ms':>11}")
+    for branch_count in BRANCH_COUNTS:
+        zone_data = _zone_frame(branch_count)
+        sorted_seconds = _best_of(_sorted_ranking, zone_data)
+        engine_seconds = _best_of(_engine_ranking, zone_data)
+        metrics_seconds = _best_of(_branch_metrics, "Bench Total", zone_data, build_zone_index(zone_data))
+        print(
+            f"{branch_count:>8} {sorted_seconds * 1000:>10.2f} {engine_seconds * 1000:>10.2f} "
+            f"{sorted_seconds / engine_seconds:>7.1f}x {metrics_seconds * 1000:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
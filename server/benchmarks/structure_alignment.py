@@ -0,0 +1,107 @@
+"""Compare exhaustive structure alignment with bound-pruned alignment over many stored structures.
+
+Run from the server directory with a real monthly workbook:
+
+    python -m benchmarks.structure_alignment "../AUGUST ZONAL DISTRIBUTION FOR BRANCHES.xlsx" --structures 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from difflib import SequenceMatcher
+
+from app.services import upload_parser
+from app.services.structure_index import StructureSignature
+
+
+class _StaticIndex:
+    def __init__(self, structures: list[StructureSignature]) -> None:
+        self.structures = structures
+
+    def signatures(self, paths) -> list[StructureSignature]:
+        return self.structures
+
+
+def _variant(headers: list[str], rng: random.Random, index: int) -> list[str]:
+    # Stored structures are older revisions of the live layout (columns dropped, blocks moved, headers renamed)
+    # plus layouts built for other reports that share only a slice of the columns.
+    if index % 5 == 4:
+        start = rng.randrange(len(headers))
+        return headers[start : start + rng.randint(20, 80)]
+    drift = rng.uniform(0.0, 0.3)
+    variant = [header for header in headers if rng.random() > drift]
+    for _ in range(rng.randint(0, 4)):
+        start = rng.randrange(len(variant))
+        block = variant[start : start + rng.randint(5, 30)]
+        del variant[start : start + len(block)]
+        insert_at = rng.randrange(len(variant) + 1)
+        variant[insert_at:insert_at] = block
+    return [f"{header} v{index}" if rng.random() < drift / 4 else header for header in variant]
+
+
+def _exhaustive_mapping(upload_headers: list[str], structures: list[StructureSignature]) -> dict[str, str]:
+    upload_signature = upload_parser._signature_sequence(upload_headers)
+    best_score = 0.0
+    best_mapping: dict[str, str] = {}
+    for structure in structures:
+        matcher = SequenceMatcher(a=structure.signature, b=upload_signature)
+        score = matcher.ratio()
+        if score <= best_score:
+            continue
+        candidate_mapping: dict[str, str] = {}
+        for block in matcher.get_matching_blocks():
+            for offset in range(block.size):
+                candidate_mapping.setdefault(structure.headers[block.a + offset], upload_headers[block.b + offset])
+        if candidate_mapping:
+            best_score = score
+            best_mapping = candidate_mapping
+    return best_mapping
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("workbook")
+    parser.add_argument("--structures", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    raw = upload_parser._read_raw_table(args.workbook)
+    upload_headers = upload_parser._compose_headers(raw, upload_parser._detect_header_row(raw))
+    rng = random.Random(args.seed)
+    structures = []
+    for index in range(args.structures):
+        headers = _variant(upload_headers, rng, index)
+        structures.append(StructureSignature(f"synthetic-{index}", 0, 0, headers, upload_parser._signature_sequence(headers)))
+    # The live structure usually sits among its backups.
+    live = StructureSignature("live", 0, 0, list(upload_headers), upload_parser._signature_sequence(upload_headers))
+    structures.insert(rng.randrange(len(structures) + 1), live)
+    upload_parser.structure_signatures = _StaticIndex(structures)
+    upload_parser._reference_structure_paths = lambda: []
+
+    timings: dict[str, float] = {}
+    results = {}
+    for name, align in [
+        ("exhaustive", lambda: _exhaustive_mapping(upload_headers, structures)),
+        ("pruned", lambda: upload_parser._aligned_template_mapping(upload_headers)),
+    ]:
+        runs = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            results[name] = align()
+            runs.append(time.perf_counter() - started)
+        timings[name] = min(runs)
+
+    print(f"{len(upload_headers)} upload columns, {len(structures)} structures")
+    print(f"{'matcher':>10} {'seconds':>8} {'speedup':>8}")
+    for name, elapsed in timings.items():
+        print(f"{name:>10} {elapsed:>8.3f} {timings['exhaustive'] / elapsed:>7.1f}x")
+    print("mappings identical" if results["exhaustive"] == results["pruned"] else "MAPPINGS DIFFER")
+
+
+if __name__ == "__main__":
+    main()
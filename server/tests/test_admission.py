@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.admission import AdmissionLane, light_lane
+
+
+def test_admission_lane_queues_then_rejects_with_retry_after() -> None:
+    lane = AdmissionLane("heavy", concurrency=1, queue_size=1, wait_seconds=5, retry_after_seconds=7)
+
+    async def scenario() -> HTTPException:
+        await lane.acquire()
+        queued = asyncio.create_task(lane.acquire())
+        while lane.stats()["waiting"] == 0:
+            await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as rejected:
+            await lane.acquire()
+        assert not queued.done()
+
+        lane.release()
+        await asyncio.wait_for(queued, 5)
+        lane.release()
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+
+    assert rejected.status_code == 429
+    assert rejected.headers == {"Retry-After": "7"}
+    assert lane.stats() == {"concurrency": 1, "queue_size": 1, "active": 0, "waiting": 0, "admitted": 2, "rejected": 1}
+
+
+def test_admission_lane_gives_up_after_wait_budget() -> None:
+    lane = AdmissionLane("light", concurrency=1, queue_size=4, wait_seconds=0.05, retry_after_seconds=2)
+
+    async def scenario() -> None:
+        await lane.acquire()
+        await lane.acquire()
+
+    started = time.monotonic()
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(scenario())
+
+    assert rejected.value.status_code == 429
+    assert time.monotonic() - started < 2
+    assert lane.stats()["waiting"] == 0
+
+
+def test_cancelled_waiter_leaves_the_queue_and_passes_on_a_handed_over_slot() -> None:
+    lane = AdmissionLane("heavy", concurrency=1, queue_size=2, wait_seconds=5, retry_after_seconds=2)
+
+    async def scenario() -> None:
+        await lane.acquire()
+        abandoned = asyncio.create_task(lane.acquire())
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        await asyncio.gather(abandoned, return_exceptions=True)
+        assert lane.stats()["waiting"] == 0
+
+        handed_over = asyncio.create_task(lane.acquire())
+        successor = asyncio.create_task(lane.acquire())
+        await asyncio.sleep(0)
+        lane.release()
+        handed_over.cancel()
+        await asyncio.gather(handed_over, return_exceptions=True)
+        await asyncio.wait_for(successor, 5)
+        lane.release()
+
+    asyncio.run(scenario())
+
+    assert lane.stats()["active"] == 0
+    assert lane.stats()["waiting"] == 0
+
+
+def test_preview_routes_return_429_when_light_lane_is_saturated(monkeypatch) -> None:
+    monkeypatch.setattr(light_lane, "concurrency", 1)
+    monkeypatch.setattr(light_lane, "queue_size", 0)
+    monkeypatch.setattr(light_lane, "active", 1)
+    response = TestClient(app).post("/uploads/zones", files={"file": ("june.xlsx", b"xlsx")})
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == str(light_lane.retry_after_seconds)
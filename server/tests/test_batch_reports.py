@@ -0,0 +1,104 @@
+import io
+import json
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import Base
+from app.main import app
+from app.models import ReportRun
+from app.routers import reports
+from app.schemas import ProfileCreate
+from app.services import reporting
+from app.services.admission import heavy_lane
+from app.services.profiles import create_profile
+from app.services.report_artifacts import ArtifactKey, ReportArtifactStore
+from app.services.upload_sessions import UploadSessionStore
+
+
+def _key(zone_name: str) -> ArtifactKey:
+    return ArtifactKey(fingerprint="fp-1", zone_name=zone_name, template_hash="tpl-1", schema_version="v1")
+
+
+def test_batch_generation_parses_once_and_isolates_zone_failures(tmp_path: Path, monkeypatch) -> None:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db: Session = sessionmaker(bind=engine, expire_on_commit=False)()
+    profile = create_profile(db, ProfileCreate(name="Ada", email=None))
+
+    upload_path = tmp_path / "upload.xlsx"
+    upload_path.write_bytes(b"xlsx")
+    sessions = UploadSessionStore(str(tmp_path / "staging"), ttl_seconds=60)
+    session = sessions.stage(str(upload_path), "june.xlsx", "fp-1")
+    store = ReportArtifactStore(str(tmp_path / "artifacts"), max_bytes=4096)
+    cached_path = tmp_path / "cached.docx"
+    cached_path.write_bytes(b"cached")
+    store.put(_key("Apapa Total"), str(cached_path), "APAPA_Report.docx", "May-25 to Jul-25")
+
+    parses = []
+    parsed = SimpleNamespace(zones=["Apapa Total", "Ikeja Total", "Yaba Total"], detected_period_label="May-25 to Jul-25")
+
+    def load_workbook(*args):
+        parses.append(args)
+        return parsed
+
+    streamed: list[bytes] = []
+    streamed_before_render = {}
+
+    def render(zone_name, parsed_workbook, output_path):
+        streamed_before_render[zone_name] = b"".join(streamed)
+        if zone_name == "Yaba Total":
+            raise HTTPException(status_code=400, detail="Zone row is missing required report values: PBT")
+        Path(output_path).write_bytes(zone_name.encode("utf-8"))
+        return f"{zone_name.split()[0].upper()}_Report.docx"
+
+    monkeypatch.setattr(reporting, "upload_sessions", sessions)
+    monkeypatch.setattr(reporting, "report_artifacts", store)
+    monkeypatch.setattr(reporting, "_artifact_key", lambda fingerprint, zone_name: _key(zone_name))
+    monkeypatch.setattr(reporting, "_load_report_workbook", load_workbook)
+    monkeypatch.setattr(reporting, "_render_zone_report", render)
+
+    for chunk in reporting.generate_batch_reports(db, profile.id, ["all"], upload_id=session.upload_id):
+        streamed.append(chunk)
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(streamed))) as archive:
+        assert sorted(archive.namelist()) == ["APAPA_Report.docx", "IKEJA_Report.docx", reporting.BATCH_SUMMARY_FILENAME]
+        assert archive.read("APAPA_Report.docx") == b"cached"
+        assert archive.read("IKEJA_Report.docx") == b"Ikeja Total"
+        summary = json.loads(archive.read(reporting.BATCH_SUMMARY_FILENAME))
+
+    runs = {run.zone_name: run for run in db.query(ReportRun).all()}
+    assert len(parses) == 1
+    assert b"cached" in streamed_before_render["Ikeja Total"]
+    assert b"Ikeja Total" in streamed_before_render["Yaba Total"]
+    assert [zone["status"] for zone in summary["zones"]] == ["completed", "completed", "failed"]
+    assert summary["completed"] == 2 and summary["failed"] == 1
+    assert runs["Apapa Total"].served_from_cache is True
+    assert runs["Ikeja Total"].status == "completed"
+    assert runs["Yaba Total"].status == "failed"
+    assert runs["Yaba Total"].error_message == "Zone row is missing required report values: PBT"
+
+
+def test_batch_route_holds_the_heavy_lane_until_the_archive_is_streamed(monkeypatch) -> None:
+    active_while_streaming = []
+
+    def generate_batch_reports(db, profile_id, zones, upload, upload_id):
+        def chunks():
+            active_while_streaming.append(heavy_lane.stats()["active"])
+            yield b"zip"
+
+        return chunks()
+
+    monkeypatch.setattr(reports, "generate_batch_reports", generate_batch_reports)
+    response = TestClient(app).post("/generate-report/batch", data={"zones": ["all"], "profile_id": "1", "upload_id": "upload-1"})
+
+    assert response.status_code == 200
+    assert response.content == b"zip"
+    assert response.headers["content-disposition"] == 'attachment; filename="Zone_Reports.zip"'
+    assert active_while_streaming == [1]
+    assert heavy_lane.stats()["active"] == 0
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base, get_db
+from app.main import app
+from app.routers import reports
+
+
+def test_large_previews_do_not_stall_cheap_requests(tmp_path: Path, monkeypatch) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'profiles.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    def override_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    started = threading.Semaphore(0)
+    release = threading.Event()
+
+    def slow_preview(file):
+        # Stands in for parsing a large workbook: synchronous and holds its thread until the test lets it finish.
+        started.release()
+        release.wait(10)
+        parsed = SimpleNamespace(
+            zones=["Apapa Total"],
+            detected_period_label=None,
+            missing_fields=[],
+            mapped_fields={},
+            header_row_index=1,
+        )
+        return SimpleNamespace(upload_id="upload-1", expires_at=None), parsed
+
+    monkeypatch.setattr(reports, "preview_and_stage_upload", slow_preview)
+    app.dependency_overrides[get_db] = override_db
+
+    async def scenario() -> tuple[list[int], int, bool]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            previews = [
+                asyncio.create_task(
+                    client.post("/generate-report/preview", files={"file": ("june.xlsx", b"xlsx")})
+                )
+                for _ in range(3)
+            ]
+            for _ in previews:
+                assert await asyncio.to_thread(started.acquire, True, 10)
+            try:
+                # The timeout only guards against a hang; the assertion is that this finishes while all three previews are parked.
+                cheap = await asyncio.wait_for(client.get("/profiles"), 10)
+                previews_still_running = not any(preview.done() for preview in previews)
+            finally:
+                release.set()
+            statuses = [response.status_code for response in await asyncio.gather(*previews)]
+            return statuses, cheap.status_code, previews_still_running
+
+    try:
+        statuses, cheap_status, previews_still_running = asyncio.run(scenario())
+    finally:
+        release.set()
+        app.dependency_overrides.clear()
+
+    assert statuses == [200, 200, 200]
+    assert cheap_status == 200
+    assert previews_still_running
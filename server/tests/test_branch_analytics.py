@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from app.services.branch_analytics import (
+    BranchTable,
+    branch_extreme,
+    branches_above_threshold,
+    branches_below_threshold,
+    budget_achievement,
+    count_negative,
+    low_issuance_branches,
+    negative_entries,
+    positive_growth_summary,
+    rank_column,
+    summed_extreme,
+)
+
+
+def _table() -> BranchTable:
+    return BranchTable(
+        pd.DataFrame(
+            [
+                {"BRANCHES": "Apapa", "VAR": -2.0, "LDR": 160.0, "ACH": 50.0, "BGT": 100.0, "PREV": 10.0, "CUR": 20.0},
+                {"BRANCHES": "Creek Road", "VAR": -5.0, "LDR": 0.13, "ACH": 1.0, "BGT": 2.0, "PREV": 5.0, "CUR": 10.0},
+                {"BRANCHES": "", "VAR": -9.0, "LDR": 9.0, "ACH": 9.0, "BGT": 1.0, "PREV": 1.0, "CUR": 90.0},
+                {"BRANCHES": "Trinity 1", "VAR": -5.0, "LDR": 0.19, "ACH": 3.0, "BGT": 0.0, "PREV": np.nan, "CUR": 1.0},
+                {"BRANCHES": "Mobil Road", "VAR": 4.0, "LDR": 160.0, "ACH": 1.0, "BGT": 4.0, "PREV": 3.0, "CUR": 2.0},
+            ]
+        )
+    )
+
+
+def test_negative_entries_order_by_magnitude_and_keep_row_order_on_ties() -> None:
+    assert negative_entries(_table(), "VAR") == [
+        ("Creek Road", Decimal("5.0")),
+        ("Trinity 1", Decimal("5.0")),
+        ("Apapa", Decimal("2.0")),
+    ]
+    assert count_negative(_table(), "VAR") == 4
+
+
+def test_extremes_pick_first_branch_on_ties() -> None:
+    table = _table()
+
+    assert branch_extreme(table, "LDR", highest=True) == ("Apapa", Decimal("160.0"))
+    assert branch_extreme(table, "LDR", highest=False) == ("Creek Road", Decimal("0.13"))
+    assert summed_extreme(table, ["ACH", "BGT"], highest=False) == ("Creek Road", Decimal("3"))
+    assert budget_achievement(table, "ACH", "BGT") == ("Apapa", Decimal("50"))
+
+
+def test_threshold_filters_scale_fractional_ratios() -> None:
+    table = _table()
+
+    assert branches_above_threshold(table, "LDR", Decimal("150")) == [
+        ("Apapa", Decimal("160.0")),
+        ("Mobil Road", Decimal("160.0")),
+    ]
+    assert branches_below_threshold(table, "LDR", Decimal("20")) == [
+        ("Creek Road", Decimal("13.00")),
+        ("Trinity 1", Decimal("19.00")),
+    ]
+    assert low_issuance_branches(table, "PREV", Decimal("6")) == ["Creek Road", "Trinity 1", "Mobil Road"]
+
+
+def test_positive_growth_summary_reports_standout_branch() -> None:
+    assert positive_growth_summary(_table(), "PREV", "CUR") == (["Apapa", "Creek Road"], "Apapa", "100")
+
+
+def test_rank_column_matches_ends_of_descending_sort() -> None:
+    rows = pd.DataFrame(
+        {
+            "BRANCHES": ["A", "B", "C", "D", "E", "F"],
+            "X": [2.0, 3.5, np.nan, 3.5, -1.0, np.nan],
+            "Y": [1.0, -1.0, 4.0, -1.0, 4.0, 0.0],
+        },
+        index=[40, 41, 42, 43, 44, 45],
+    )
+    table = BranchTable(rows)
+
+    for column in ["X", "Y"]:
+        ordered = rows.sort_values(by=column, ascending=False, kind="stable")
+        ranking = rank_column(table, column)
+        assert rows.index[ranking.high] == ordered.index[0]
+        assert rows.index[ranking.low] == ordered.index[-1]
+    assert rank_column(table, "X").total == Decimal("8")
@@ -1,6 +1,15 @@
 from decimal import Decimal
 
-from app.services.normalization import format_billions, format_dp_millions, format_millions, parse_numeric
+import pandas as pd
+
+from app.services.normalization import (
+    format_billions,
+    format_dp_millions,
+    format_millions,
+    parse_numeric,
+    parse_numeric_column,
+    to_decimal,
+)
 
 
 def test_parse_numeric_handles_negative_and_parentheses() -> None:
@@ -14,6 +23,63 @@ def test_parse_numeric_handles_negative_and_parentheses() -> None:
     assert parse_numeric("n/a") is None
 
 
+def test_parse_numeric_column_matches_parse_numeric_per_cell() -> None:
+    values = [
+        "-10",
+        "(10)",
+        "(35)",
+        "1,200",
+        "(1,200.50)",
+        "(35%)",
+        "",
+        "n/a",
+        None,
+        float("nan"),
+        12,
+        2.5,
+        Decimal("1.5"),
+        " 12\n",
+        "1.2.3",
+        "12%",
+        "0.5%",
+        "(-3)",
+    ]
+
+    parsed = parse_numeric_column(pd.Series(values, dtype=object))
+
+    assert parsed.isna().tolist() == [parse_numeric(value) is None for value in values]
+    for stored, value in zip(parsed.tolist(), values):
+        expected = parse_numeric(value)
+        if expected is not None:
+            assert stored == float(expected)
+
+
+def test_parse_numeric_column_stores_nearest_double_of_parse_numeric() -> None:
+    values = ["(1,200.50)", "(35%)", "1.23%", "12", "n/a", None, 7, 0.1, "-0.886876003", "100%"]
+    # Beyond 15 significant digits only the nearest double is kept; to_decimal cannot give the text back.
+    long_values = ["932316.0782515665", "-0.30000000000000004", "1.00000000000000001%"]
+
+    parsed = parse_numeric_column(pd.Series(values, dtype=object))
+
+    assert str(parsed.dtype) == "float64"
+    assert parsed.isna().tolist() == [parse_numeric(value) is None for value in values]
+    for stored, value in zip(parsed.tolist(), values):
+        expected = parse_numeric(value)
+        if expected is not None:
+            assert stored == float(expected)
+            assert to_decimal(stored) == expected
+    assert parse_numeric_column(pd.Series(long_values, dtype=object)).tolist() == [
+        float(parse_numeric(value)) for value in long_values
+    ]
+
+
+def test_to_decimal_recovers_cell_text_from_float_storage() -> None:
+    assert str(to_decimal(1200.5)) == "1200.5"
+    assert str(to_decimal(100.0)) == "100"
+    assert str(to_decimal(8.6e-07)) == "8.6E-7"
+    assert to_decimal(float("nan")) is None
+
+
 def test_format_dp_millions_uses_minus_sign_for_negative_values() -> None:
     assert format_dp_millions("-47") == "-47M"
     assert format_dp_millions("(47)") == "-47M"
@@ -0,0 +1,105 @@
+import io
+from pathlib import Path
+
+import pandas as pd
+from fastapi import UploadFile
+
+from app.config import settings
+from app.services import reporting
+from app.services.parse_cache import ParsedWorkbookCache, estimate_parsed_size, parsed_workbook_cache
+from app.services.upload_parser import ParsedWorkbook
+from app.services.upload_sessions import UploadSessionStore
+
+
+def _parsed(rows: int) -> ParsedWorkbook:
+    return ParsedWorkbook(
+        dataframe=pd.DataFrame({"ZONES": ["Abuja Total"] * rows, "BRANCHES": ["Abuja Main"] * rows}),
+        header_row_index=5,
+        mapped_fields={},
+        missing_fields=[],
+        detected_period_label=None,
+        zones=["Abuja Total"],
+    )
+
+
+def test_parsed_workbook_cache_counts_hits_and_misses() -> None:
+    cache = ParsedWorkbookCache(max_bytes=10 * 1024 * 1024)
+    parsed = _parsed(3)
+
+    assert cache.get("abc", "v1") is None
+    cache.put("abc", "v1", parsed)
+
+    assert cache.get("abc", "v1") is parsed
+    assert cache.get("abc", "v2") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_parsed_workbook_cache_evicts_least_recently_used_entry() -> None:
+    entry_size = estimate_parsed_size(_parsed(50))
+    cache = ParsedWorkbookCache(max_bytes=entry_size * 2)
+    cache.put("first", "v1", _parsed(50))
+    cache.put("second", "v1", _parsed(50))
+    cache.get("first", "v1")
+    cache.put("third", "v1", _parsed(50))
+
+    assert cache.get("second", "v1") is None
+    assert cache.get("first", "v1") is not None
+    assert cache.get("third", "v1") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] <= cache.max_bytes
+
+
+def test_preview_workbook_reuses_parse_for_same_file_and_structure(tmp_path: Path, monkeypatch) -> None:
+    structure_path = tmp_path / "mpaStructure.xlsx"
+    pd.DataFrame(columns=["ZONES", "BRANCHES"]).to_excel(structure_path, index=False)
+    upload_path = tmp_path / "upload.xlsx"
+    upload_path.write_bytes(b"same-month-file")
+
+    parse_calls: list[str] = []
+
+    def fake_parse(path: str) -> ParsedWorkbook:
+        parse_calls.append(path)
+        return _parsed(2)
+
+    monkeypatch.setattr(reporting, "parse_uploaded_workbook", fake_parse)
+    original_fallback = settings.fallback_structure_path
+    settings.fallback_structure_path = str(structure_path)
+    parsed_workbook_cache.clear()
+    try:
+        first = reporting.preview_workbook(str(upload_path))
+        second = reporting.preview_workbook(str(upload_path))
+        pd.DataFrame(columns=["ZONES", "BRANCHES", "PBT 2025 YTD ACHVD"]).to_excel(structure_path, index=False)
+        reporting.preview_workbook(str(upload_path))
+    finally:
+        settings.fallback_structure_path = original_fallback
+        parsed_workbook_cache.clear()
+
+    assert first is second
+    assert len(parse_calls) == 2
+
+
+def test_staged_upload_is_reparsed_after_the_structure_changes(tmp_path: Path, monkeypatch) -> None:
+    structure_path = tmp_path / "mpaStructure.xlsx"
+    pd.DataFrame(columns=["ZONES", "BRANCHES"]).to_excel(structure_path, index=False)
+    parse_calls: list[str] = []
+
+    def fake_parse(path: str) -> ParsedWorkbook:
+        parse_calls.append(path)
+        return _parsed(len(parse_calls))
+
+    monkeypatch.setattr(reporting, "parse_uploaded_workbook", fake_parse)
+    monkeypatch.setattr(reporting, "upload_sessions", UploadSessionStore(str(tmp_path / "staging"), ttl_seconds=60))
+    monkeypatch.setattr(settings, "fallback_structure_path", str(structure_path))
+    parsed_workbook_cache.clear()
+    try:
+        session, previewed = reporting.preview_and_stage_upload(UploadFile(io.BytesIO(b"month"), filename="june.xlsx"))
+        assert reporting._load_report_workbook(session, "", session.fingerprint) is previewed
+
+        pd.DataFrame(columns=["ZONES", "BRANCHES", "PBT 2025 YTD ACHVD"]).to_excel(structure_path, index=False)
+        regenerated = reporting._load_report_workbook(session, "", session.fingerprint)
+    finally:
+        parsed_workbook_cache.clear()
+
+    assert regenerated is not previewed
+    assert parse_calls == [parse_calls[0], session.staged_path]
@@ -0,0 +1,43 @@
+import pickle
+from pathlib import Path
+
+import pandas as pd
+from fastapi import HTTPException
+
+from app.services import render_pool
+from app.services.upload_parser import ParsedWorkbook
+
+
+def _render(zone_name: str, parsed: ParsedWorkbook, output_path: str) -> str:
+    if zone_name not in parsed.zones:
+        raise HTTPException(status_code=400, detail="Selected zone is not available in the uploaded file.")
+    Path(output_path).write_text(f"{zone_name}:{len(parsed.dataframe)}", encoding="utf-8")
+    return f"{zone_name}_Report.docx"
+
+
+def test_render_task_loads_batch_snapshot_once_and_reports_failures(tmp_path: Path, monkeypatch) -> None:
+    parsed = ParsedWorkbook(
+        dataframe=pd.DataFrame({"ZONES": ["Apapa", "Apapa Total"], "BRANCHES": ["Creek Road", ""]}),
+        header_row_index=0,
+        mapped_fields={},
+        missing_fields=[],
+        detected_period_label=None,
+        zones=["Apapa", "Apapa Total"],
+    )
+    snapshot_path = tmp_path / "workbook.pickle"
+    snapshot_path.write_bytes(pickle.dumps(parsed))
+    loads = []
+    real_load = pickle.load
+    monkeypatch.setattr(render_pool, "_worker_snapshot", {})
+    monkeypatch.setattr(render_pool.pickle, "load", lambda handle: loads.append(handle) or real_load(handle))
+
+    first = render_pool._render_task(_render, str(snapshot_path), "Apapa", str(tmp_path / "0.docx"))
+    second = render_pool._render_task(_render, str(snapshot_path), "Apapa Total", str(tmp_path / "1.docx"))
+    missing = render_pool._render_task(_render, str(snapshot_path), "Ikeja", str(tmp_path / "2.docx"))
+
+    assert len(loads) == 1
+    assert first.report_filename == "Apapa_Report.docx"
+    assert (tmp_path / "1.docx").read_text(encoding="utf-8") == "Apapa Total:2"
+    assert second.error is None
+    assert missing.status_code == 400
+    assert missing.error == "Selected zone is not available in the uploaded file."
@@ -0,0 +1,82 @@
+import os
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import Base
+from app.models import ReportRun
+from app.schemas import ProfileCreate
+from app.services import reporting
+from app.services.profiles import create_profile
+from app.services.report_artifacts import ArtifactKey, ReportArtifactStore
+from app.services.upload_sessions import UploadSessionStore
+
+
+def _key(zone_name: str) -> ArtifactKey:
+    return ArtifactKey(fingerprint="fp-1", zone_name=zone_name, template_hash="tpl-1", schema_version="v1")
+
+
+def _report(tmp_path: Path, name: str, size: int) -> str:
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_artifact_store_round_trips_report_and_metadata(tmp_path: Path) -> None:
+    store = ReportArtifactStore(str(tmp_path / "artifacts"), max_bytes=1024)
+    destination = str(tmp_path / "download.docx")
+
+    assert store.get(_key("Apapa Total"), destination) is None
+    store.put(_key("Apapa Total"), _report(tmp_path, "apapa.docx", 10), "APAPA_Report.docx", "May-25 to Jul-25")
+    artifact = store.get(_key("Apapa Total"), destination)
+
+    assert artifact is not None
+    assert artifact.report_filename == "APAPA_Report.docx"
+    assert artifact.detected_period_label == "May-25 to Jul-25"
+    assert Path(destination).read_bytes() == b"x" * 10
+    assert store.get(ArtifactKey("fp-1", "Apapa Total", "tpl-2", "v1"), destination) is None
+    assert store.stats()["hits"] == 1
+    assert store.stats()["misses"] == 2
+
+
+def test_artifact_store_evicts_least_recently_used_reports(tmp_path: Path) -> None:
+    store = ReportArtifactStore(str(tmp_path / "artifacts"), max_bytes=250)
+    for index, zone in enumerate(["Apapa Total", "Ikeja Total"]):
+        store.put(_key(zone), _report(tmp_path, f"{index}.docx", 100), f"{index}.docx", None)
+        artifact_path = tmp_path / "artifacts" / f"{_key(zone).digest()}.docx"
+        os.utime(artifact_path, ns=(index * 1_000_000_000, index * 1_000_000_000))
+    store.get(_key("Apapa Total"), str(tmp_path / "download.docx"))
+
+    store.put(_key("Yaba Total"), _report(tmp_path, "2.docx", 100), "2.docx", None)
+
+    assert store.get(_key("Ikeja Total"), str(tmp_path / "ikeja.docx")) is None
+    assert store.get(_key("Apapa Total"), str(tmp_path / "apapa.docx")) is not None
+    assert store.get(_key("Yaba Total"), str(tmp_path / "yaba.docx")) is not None
+    assert store.stats()["evictions"] == 1
+
+
+def test_generate_report_serves_cached_artifact_without_parsing(tmp_path: Path, monkeypatch) -> None:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db: Session = sessionmaker(bind=engine, expire_on_commit=False)()
+    profile = create_profile(db, ProfileCreate(name="Ada", email=None))
+
+    sessions = UploadSessionStore(str(tmp_path / "staging"), ttl_seconds=60)
+    session = sessions.stage(_report(tmp_path, "upload.xlsx", 5), "june.xlsx", "fp-1")
+    store = ReportArtifactStore(str(tmp_path / "artifacts"), max_bytes=1024)
+    monkeypatch.setattr(reporting, "upload_sessions", sessions)
+    monkeypatch.setattr(reporting, "report_artifacts", store)
+    monkeypatch.setattr(reporting, "_artifact_key", lambda fingerprint, zone_name: _key(zone_name))
+    monkeypatch.setattr(reporting, "preview_workbook", lambda *args: (_ for _ in ()).throw(AssertionError("parsed")))
+    store.put(_key("Apapa Total"), _report(tmp_path, "apapa.docx", 10), "APAPA_Report.docx", "May-25 to Jul-25")
+
+    output_path, report_filename = reporting.generate_report(db, profile.id, "Apapa Total", upload_id=session.upload_id)
+
+    run = db.query(ReportRun).one()
+    assert report_filename == "APAPA_Report.docx"
+    assert Path(output_path).read_bytes() == b"x" * 10
+    assert run.served_from_cache is True
+    assert run.status == "completed"
+    assert run.detected_period_label == "May-25 to Jul-25"
+    os.unlink(output_path)
@@ -0,0 +1,197 @@
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import Base
+from app.models import ReportJob, ReportRun
+from app.schemas import ProfileCreate
+from app.services import report_jobs, reporting
+from app.services.report_progress import ReportProgressHub
+from app.services.profiles import create_profile
+from app.services.report_artifacts import ReportArtifactStore
+from app.services.upload_sessions import UploadSessionStore
+
+
+@pytest.fixture
+def job_env(tmp_path: Path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    db = session_factory()
+    profile = create_profile(db, ProfileCreate(name="Ada", email=None))
+
+    upload_path = tmp_path / "upload.xlsx"
+    upload_path.write_bytes(b"xlsx")
+    sessions = UploadSessionStore(str(tmp_path / "staging"), ttl_seconds=60)
+    upload = sessions.stage(str(upload_path), "june.xlsx", "fp-1")
+    queue = report_jobs.ReportJobQueue(
+        session_factory,
+        workers=0,
+        output_dir=str(tmp_path / "runs"),
+        retention_seconds=3600,
+        lease_seconds=60,
+        max_attempts=2,
+        retry_backoff_seconds=30,
+        poll_seconds=0.1,
+    )
+    parsed = SimpleNamespace(zones=["Apapa Total"], detected_period_label="May-25 to Jul-25")
+    render_failures: list[Exception] = []
+
+    def render(zone_name, parsed_workbook, output_path, on_stage=None):
+        if render_failures:
+            raise render_failures.pop()
+        if zone_name not in parsed_workbook.zones:
+            raise HTTPException(status_code=400, detail="Selected zone is not available in the uploaded file.")
+        Path(output_path).write_bytes(b"report")
+        return "APAPA_Report.docx"
+
+    monkeypatch.setattr(report_jobs, "report_jobs", queue)
+    monkeypatch.setattr(reporting, "upload_sessions", sessions)
+    monkeypatch.setattr(reporting, "report_artifacts", ReportArtifactStore(str(tmp_path / "artifacts"), max_bytes=0))
+    monkeypatch.setattr(reporting, "_load_report_workbook", lambda *args: parsed)
+    monkeypatch.setattr(reporting, "_render_zone_report", render)
+    return SimpleNamespace(db=db, profile=profile, upload=upload, queue=queue, render_failures=render_failures)
+
+
+def _refresh(db: Session, run: ReportRun) -> tuple[ReportRun, ReportJob]:
+    run = db.get(ReportRun, run.id, populate_existing=True)
+    job = db.query(ReportJob).filter(ReportJob.report_run_id == run.id).populate_existing().one()
+    return run, job
+
+
+def test_queued_reports_complete_and_expose_downloads(job_env) -> None:
+    db, queue = job_env.db, job_env.queue
+    queued = report_jobs.enqueue_report(db, job_env.profile.id, "Apapa Total", upload_id=job_env.upload.upload_id)
+    missing = report_jobs.enqueue_report(db, job_env.profile.id, "Ikeja Total", upload_id=job_env.upload.upload_id)
+    assert queued.status == "pending"
+
+    assert queue.process_next("worker-a") is True
+    assert queue.process_next("worker-a") is True
+    assert queue.process_next("worker-a") is False
+
+    completed, completed_job = _refresh(db, queued)
+    failed, failed_job = _refresh(db, missing)
+    assert completed.status == "completed"
+    assert completed.detected_period_label == "May-25 to Jul-25"
+    assert completed_job.status == "completed"
+    assert not Path(completed_job.input_path).exists()
+    assert failed.status == "failed"
+    assert failed_job.attempts == 1
+    assert failed_job.last_error == "Selected zone is not available in the uploaded file."
+
+    output_path, report_filename = report_jobs.report_run_download(db, queued.id)
+    assert report_filename == "APAPA_Report.docx"
+    assert Path(output_path).read_bytes() == b"report"
+    with pytest.raises(HTTPException) as not_ready:
+        report_jobs.report_run_download(db, missing.id)
+    assert not_ready.value.status_code == 409
+
+
+def test_expired_leases_are_reclaimed_and_crashes_retry_until_exhausted(job_env) -> None:
+    db, queue = job_env.db, job_env.queue
+    crashed = report_jobs.enqueue_report(db, job_env.profile.id, "Apapa Total", upload_id=job_env.upload.upload_id)
+
+    # A worker claims the job and dies: its lease expires and another worker picks the job up.
+    claim_db = queue.session_factory()
+    abandoned = queue._claim(claim_db, "worker-dead")
+    abandoned.lease_expires_at = datetime.now(UTC) - timedelta(seconds=1)
+    claim_db.commit()
+    claim_db.close()
+    assert queue.process_next("worker-b") is True
+    run, job = _refresh(db, crashed)
+    assert (run.status, job.status, job.attempts, job.lease_owner) == ("completed", "completed", 2, None)
+
+    retried = report_jobs.enqueue_report(db, job_env.profile.id, "Apapa Total", upload_id=job_env.upload.upload_id)
+    job_env.render_failures.extend([RuntimeError("disk full"), RuntimeError("disk full")])
+    assert queue.process_next("worker-b") is True
+    run, job = _refresh(db, retried)
+    assert (run.status, job.status, job.last_error) == ("pending", "queued", "disk full")
+    assert queue.process_next("worker-b") is False
+
+    job.available_at = datetime.now(UTC) - timedelta(seconds=1)
+    db.commit()
+    assert queue.process_next("worker-b") is True
+    run, job = _refresh(db, retried)
+    assert (run.status, job.status, job.attempts) == ("failed", "failed", 2)
+    assert run.error_message == "disk full"
+
+
+def test_job_steps_renew_the_lease_and_stop_a_worker_that_lost_it(job_env, monkeypatch) -> None:
+    db, queue = job_env.db, job_env.queue
+    renewed = report_jobs.enqueue_report(db, job_env.profile.id, "Apapa Total", upload_id=job_env.upload.upload_id)
+    taken_over = report_jobs.enqueue_report(db, job_env.profile.id, "Apapa Total", upload_id=job_env.upload.upload_id)
+    parsed = SimpleNamespace(zones=["Apapa Total"], detected_period_label="May-25 to Jul-25")
+    leases = []
+    current_run = [renewed.id]
+
+    def job_lease(run_id: int, **values):
+        other = queue.session_factory()
+        jobs = other.query(ReportJob).filter(ReportJob.report_run_id == run_id)
+        if values:
+            jobs.update(values)
+            other.commit()
+        lease = jobs.one().lease_expires_at
+        other.close()
+        return lease
+
+    def slow_parse(session, *args):
+        run_id = current_run[0]
+        # The parse has outlived its lease; for the second job another worker has already reclaimed it.
+        past = datetime.now(UTC) - timedelta(seconds=1)
+        job_lease(run_id, lease_expires_at=past, **({"lease_owner": "worker-b"} if run_id == taken_over.id else {}))
+        return parsed
+
+    def render(zone_name, parsed_workbook, output_path, on_stage=None):
+        leases.append(job_lease(int(Path(output_path).stem)))
+        Path(output_path).write_bytes(b"report")
+        return "APAPA_Report.docx"
+
+    monkeypatch.setattr(reporting, "_load_report_workbook", slow_parse)
+    monkeypatch.setattr(reporting, "_render_zone_report", render)
+
+    assert queue.process_next("worker-a") is True
+    run, job = _refresh(db, renewed)
+    assert (run.status, job.status) == ("completed", "completed")
+    assert leases[0].replace(tzinfo=UTC) > datetime.now(UTC) + timedelta(seconds=30)
+
+    current_run[0] = taken_over.id
+    assert queue.process_next("worker-a") is True
+    run, job = _refresh(db, taken_over)
+    assert (run.status, job.status, job.lease_owner) == ("processing", "leased", "worker-b")
+    assert len(leases) == 1
+
+
+def test_live_worker_progress_starts_with_upload_saved(job_env, monkeypatch) -> None:
+    db, queue = job_env.db, job_env.queue
+    hub = ReportProgressHub(retention_seconds=60)
+    monkeypatch.setattr(report_jobs, "report_progress", hub)
+    monkeypatch.setattr(reporting, "report_progress", hub)
+    enqueue = queue.enqueue
+
+    def enqueue_and_let_worker_finish(*args):
+        # Give the live worker every chance to run the job before enqueue_report returns.
+        job = enqueue(*args)
+        deadline = time.monotonic() + 5
+        while job.report_run.status != "completed" and time.monotonic() < deadline:
+            time.sleep(0.02)
+            db.refresh(job.report_run)
+        return job
+
+    monkeypatch.setattr(queue, "enqueue", enqueue_and_let_worker_finish)
+    queue.workers = 1
+    queue.start()
+    try:
+        queued = report_jobs.enqueue_report(db, job_env.profile.id, "Apapa Total", upload_id=job_env.upload.upload_id)
+    finally:
+        queue.shutdown(timeout=5)
+
+    events = hub.events_since(queued.id)
+    assert [event.stage for event in events][:2] == ["upload_saved", "processing"]
+    assert events[-1].stage == "completed"
+    assert [event.sequence for event in events] == list(range(1, len(events) + 1))
@@ -0,0 +1,44 @@
+import asyncio
+import json
+
+from app.services import report_jobs
+from app.services.report_progress import ReportProgressHub
+
+
+def _collect(run_id: int, after: int = 0) -> list[dict[str, object]]:
+    async def collect() -> list[str]:
+        return [message async for message in report_jobs.stream_report_progress(run_id, after)]
+
+    messages = asyncio.run(collect())
+    return [json.loads(message.split("data: ", 1)[1]) for message in messages if message.startswith("id: ")]
+
+
+def test_progress_stream_replays_stage_timings_and_stops_at_terminal_stage(monkeypatch) -> None:
+    hub = ReportProgressHub(retention_seconds=60)
+    monkeypatch.setattr(report_jobs, "report_progress", hub)
+    hub.begin(7)
+    for stage in ["upload_saved", "processing", "parsed", "context_built", "rendered", "persisted", "completed"]:
+        hub.record(7, stage)
+
+    events = _collect(7)
+    resumed = _collect(7, after=4)
+
+    assert [event["stage"] for event in events] == [
+        "upload_saved", "processing", "parsed", "context_built", "rendered", "persisted", "completed"
+    ]
+    assert [event["sequence"] for event in events] == list(range(1, 8))
+    assert all(event["stage_ms"] >= 0 for event in events)
+    assert events[-1]["elapsed_ms"] >= events[0]["elapsed_ms"]
+    assert [event["stage"] for event in resumed] == ["rendered", "persisted", "completed"]
+
+
+def test_progress_stream_falls_back_to_database_status_for_runs_finished_elsewhere(monkeypatch) -> None:
+    monkeypatch.setattr(report_jobs, "report_progress", ReportProgressHub(retention_seconds=60))
+    monkeypatch.setattr(report_jobs, "PROGRESS_STATUS_CHECK_SECONDS", 0.0)
+    monkeypatch.setattr(
+        report_jobs,
+        "_final_run_state",
+        lambda run_id: {"run_id": run_id, "stage": "failed", "elapsed_ms": 1200.0, "detail": "Profile not found."},
+    )
+
+    assert _collect(9) == [{"run_id": 9, "stage": "failed", "elapsed_ms": 1200.0, "detail": "Profile not found."}]
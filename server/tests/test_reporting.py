@@ -19,8 +19,9 @@ from app.services.reporting import (
     _variance_rich_text,
     _variance_label,
     _validate_report_columns,
+    _zone_rows,
 )
-from app.services.upload_parser import ParsedWorkbook
+from app.services.upload_parser import ParsedWorkbook, build_zone_index
 
 
 def test_format_ratio_percentage_handles_fractional_ratio() -> None:
@@ -114,6 +115,27 @@ def test_branch_subset_and_narrative_context_exclude_similar_zone_names() -> Non
     assert context["zonal_head_name"] == "ROBERT ORAGBON"
 
 
+def test_zone_index_lookups_match_scanned_rows() -> None:
+    dataframe = pd.DataFrame(
+        [
+            {"BRANCHES": "Apapa", "ZONES": "Apapa", "DDA Jul-25": 1.0},
+            {"BRANCHES": "nan", "ZONES": "Apapa", "DDA Jul-25": 2.0},
+            {"BRANCHES": "", "ZONES": "Apapa  Total", "DDA Jul-25": 3.0},
+            {"BRANCHES": "Wharf Road", "ZONES": "apapa 2", "DDA Jul-25": 4.0},
+            {"BRANCHES": None, "ZONES": None, "DDA Jul-25": 5.0},
+        ],
+        index=[10, 11, 12, 13, 14],
+    )
+    zone_index = build_zone_index(dataframe)
+
+    assert _zone_rows(dataframe, "apapa total", zone_index).index.tolist() == [12]
+    assert _branch_subset(dataframe, "Apapa Total", zone_index)["BRANCHES"].tolist() == ["Apapa", "nan"]
+    assert _branch_subset(dataframe, "Apapa 2 Total", zone_index).index.tolist() == [13]
+    assert _branch_subset(dataframe, "Ikeja Total", zone_index).empty
+    with pytest.raises(HTTPException, match="No data found"):
+        _zone_rows(dataframe, "Ikeja Total", zone_index)
+
+
 def test_trend_rich_text_uses_green_red_and_default_black() -> None:
     assert 'w:val="008000"' in str(_trend_rich_text("10M", Decimal("1"), Decimal("2")))
     assert 'w:val="FF0000"' in str(_trend_rich_text("10M", Decimal("2"), Decimal("1")))
@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import ReportRun
+from app.schemas import ProfileCreate
+from app.services import reporting
+from app.services.profiles import create_profile
+from app.services.report_artifacts import ArtifactKey, ReportArtifactStore
+from app.services.single_flight import SingleFlight
+from app.services.upload_sessions import UploadSessionStore
+
+
+def test_single_flight_shares_one_execution_and_propagates_errors() -> None:
+    flights: SingleFlight[str] = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def slow() -> str:
+        calls.append(1)
+        release.wait(5)
+        return "rendered"
+
+    leader = threading.Thread(target=lambda: results.append(flights.do("key", slow)))
+    leader.start()
+    while flights.stats()["in_flight"] == 0:
+        time.sleep(0.01)
+    follower = threading.Thread(target=lambda: results.append(flights.do("key", slow)))
+    follower.start()
+    while flights.coalesced == 0:
+        time.sleep(0.01)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [("rendered", False), ("rendered", True)]
+    assert flights.stats() == {"leaders": 1, "coalesced": 1, "in_flight": 0}
+
+    with pytest.raises(ValueError, match="bad workbook"):
+        flights.do("broken", lambda: (_ for _ in ()).throw(ValueError("bad workbook")))
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_followers_get_a_fresh_shared_error_or_retry_as_leader() -> None:
+    flights: SingleFlight[str] = SingleFlight("report-render", share_error=reporting._share_render_failure)
+
+    def coalesce(leader_error: BaseException) -> tuple[list, list]:
+        release = threading.Event()
+        leader_outcome, follower_outcome = [], []
+
+        def lead() -> str:
+            release.wait(5)
+            raise leader_error
+
+        def run(fn, outcome: list) -> None:
+            try:
+                outcome.append(flights.do("key", fn))
+            except BaseException as exc:
+                outcome.append(exc)
+
+        coalesced = flights.coalesced
+        leader = threading.Thread(target=run, args=(lead, leader_outcome))
+        leader.start()
+        while flights.stats()["in_flight"] == 0:
+            time.sleep(0.01)
+        follower = threading.Thread(target=run, args=(lambda: "rendered", follower_outcome))
+        follower.start()
+        while flights.coalesced == coalesced:
+            time.sleep(0.01)
+        release.set()
+        leader.join()
+        follower.join()
+        return leader_outcome, follower_outcome
+
+    not_found = HTTPException(status_code=404, detail="Zone 'Apapa Total' was not found.")
+    leader_outcome, follower_outcome = coalesce(not_found)
+    assert leader_outcome == [not_found]
+    shared = follower_outcome[0]
+    assert isinstance(shared, HTTPException) and shared is not not_found
+    assert (shared.status_code, shared.detail) == (404, "Zone 'Apapa Total' was not found.")
+    assert shared.__cause__ is not_found
+
+    lease_lost = RuntimeError("lease lost")
+    leader_outcome, follower_outcome = coalesce(lease_lost)
+    assert leader_outcome == [lease_lost]
+    assert follower_outcome == [("rendered", False)]
+    assert flights.stats() == {"leaders": 3, "coalesced": 2, "in_flight": 0}
+
+
+def test_concurrent_identical_generations_render_once(tmp_path: Path, monkeypatch) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'runs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    profile = create_profile(session_factory(), ProfileCreate(name="Ada", email=None))
+
+    upload_path = tmp_path / "upload.xlsx"
+    upload_path.write_bytes(b"xlsx")
+    sessions = UploadSessionStore(str(tmp_path / "staging"), ttl_seconds=60)
+    upload = sessions.stage(str(upload_path), "june.xlsx", "fp-1")
+    parsed = SimpleNamespace(zones=["Apapa Total"], detected_period_label="May-25 to Jul-25")
+    flights: SingleFlight = SingleFlight("report-render")
+    release = threading.Event()
+    renders = []
+
+    def render(zone_name, parsed_workbook, output_path, on_stage=None):
+        renders.append(zone_name)
+        release.wait(5)
+        Path(output_path).write_bytes(b"report")
+        return "APAPA_Report.docx"
+
+    monkeypatch.setattr(reporting, "upload_sessions", sessions)
+    monkeypatch.setattr(reporting, "report_artifacts", ReportArtifactStore(str(tmp_path / "artifacts"), max_bytes=0))
+    monkeypatch.setattr(reporting, "report_render_flights", flights)
+    monkeypatch.setattr(reporting, "_artifact_key", lambda fingerprint, zone_name: ArtifactKey(fingerprint, zone_name, "tpl-1", "v1"))
+    monkeypatch.setattr(reporting, "_load_report_workbook", lambda *args: parsed)
+    monkeypatch.setattr(reporting, "_render_zone_report", render)
+
+    outputs = []
+
+    def generate(zone_name: str) -> None:
+        db = session_factory()
+        outputs.append(reporting.generate_report(db, profile.id, zone_name, upload_id=upload.upload_id))
+        db.close()
+
+    threads = [threading.Thread(target=generate, args=(zone,)) for zone in ["Apapa Total", "Apapa Total"]]
+    threads[0].start()
+    while flights.stats()["in_flight"] == 0:
+        time.sleep(0.01)
+    threads[1].start()
+    while flights.coalesced == 0:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    runs = session_factory().query(ReportRun).all()
+    assert renders == ["Apapa Total"]
+    assert sorted(run.status for run in runs) == ["completed", "completed"]
+    assert {report_filename for _, report_filename in outputs} == {"APAPA_Report.docx"}
+    for output_path, _ in outputs:
+        assert Path(output_path).read_bytes() == b"report"
+        os.unlink(output_path)
+
+
+def test_generations_for_differently_cased_zones_do_not_share_a_render(tmp_path: Path, monkeypatch) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'runs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    profile = create_profile(session_factory(), ProfileCreate(name="Ada", email=None))
+
+    upload_path = tmp_path / "upload.xlsx"
+    upload_path.write_bytes(b"xlsx")
+    sessions = UploadSessionStore(str(tmp_path / "staging"), ttl_seconds=60)
+    upload = sessions.stage(str(upload_path), "june.xlsx", "fp-1")
+    parsed = SimpleNamespace(zones=["Apapa Total"], detected_period_label="May-25 to Jul-25")
+    flights: SingleFlight = SingleFlight("report-render")
+    release = threading.Event()
+    renders = []
+
+    def render(zone_name, parsed_workbook, output_path, on_stage=None):
+        renders.append(zone_name)
+        if zone_name not in parsed_workbook.zones:
+            raise HTTPException(status_code=400, detail="Selected zone is not available in the uploaded file.")
+        release.wait(5)
+        Path(output_path).write_bytes(b"report")
+        return f"{zone_name.replace(' ', '_')}_Report.docx"
+
+    monkeypatch.setattr(reporting, "upload_sessions", sessions)
+    monkeypatch.setattr(reporting, "report_artifacts", ReportArtifactStore(str(tmp_path / "artifacts"), max_bytes=0))
+    monkeypatch.setattr(reporting, "report_render_flights", flights)
+    monkeypatch.setattr(reporting, "_artifact_key", lambda fingerprint, zone_name: ArtifactKey(fingerprint, zone_name, "tpl-1", "v1"))
+    monkeypatch.setattr(reporting, "_load_report_workbook", lambda *args: parsed)
+    monkeypatch.setattr(reporting, "_render_zone_report", render)
+
+    outcomes = {}
+
+    def generate(zone_name: str) -> None:
+        db = session_factory()
+        try:
+            outcomes[zone_name] = reporting.generate_report(db, profile.id, zone_name, upload_id=upload.upload_id)
+        except HTTPException as exc:
+            outcomes[zone_name] = exc.status_code
+        finally:
+            db.close()
+
+    leader = threading.Thread(target=generate, args=("Apapa Total",))
+    leader.start()
+    while flights.stats()["in_flight"] == 0:
+        time.sleep(0.01)
+    # The invalid casing is validated on its own while the valid render is still in flight.
+    generate("APAPA TOTAL")
+    release.set()
+    leader.join()
+
+    assert renders == ["Apapa Total", "APAPA TOTAL"]
+    assert flights.coalesced == 0
+    assert outcomes["APAPA TOTAL"] == 400
+    output_path, report_filename = outcomes["Apapa Total"]
+    assert report_filename == "Apapa_Total_Report.docx"
+    os.unlink(output_path)
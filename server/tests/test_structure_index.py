@@ -0,0 +1,48 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from app.services.structure_index import StructureSignatureIndex
+from app.services.upload_parser import _load_template_headers, _signature_sequence
+
+
+def _write_structure(path: Path, headers: list[str]) -> None:
+    pd.DataFrame(columns=headers).to_excel(path, index=False)
+
+
+def test_signature_index_persists_and_rebuilds_only_changed_structures(tmp_path: Path) -> None:
+    active = tmp_path / "mpaStructure.xlsx"
+    backup = tmp_path / "mpaStructure.backup.1.xlsx"
+    _write_structure(active, ["ZONES", "BRANCHES", "DDA Jul-25"])
+    _write_structure(backup, ["ZONES", "BRANCHES", "SAV Jul-25"])
+    index_path = tmp_path / "mpaStructure.signatures.json"
+    loads: list[Path] = []
+
+    def load_headers(path: Path) -> list[str]:
+        loads.append(path)
+        return _load_template_headers(path)
+
+    def new_index() -> StructureSignatureIndex:
+        return StructureSignatureIndex(lambda: index_path, load_headers, _signature_sequence)
+
+    first = new_index().signatures([active, backup])
+    assert [entry.headers for entry in first] == [["ZONES", "BRANCHES", "DDA Jul-25"], ["ZONES", "BRANCHES", "SAV Jul-25"]]
+    assert first[0].signature == _signature_sequence(first[0].headers)
+    assert len(loads) == 2 and index_path.exists()
+
+    # A fresh process reads the persisted index without opening either workbook.
+    restarted = new_index()
+    assert [entry.signature for entry in restarted.signatures([active, backup])] == [entry.signature for entry in first]
+    assert len(loads) == 2
+
+    _write_structure(backup, ["ZONES", "BRANCHES", "FD Jul-25"])
+    os.utime(backup, ns=(backup.stat().st_atime_ns, backup.stat().st_mtime_ns + 1_000_000))
+    assert restarted.headers(backup) == ["ZONES", "BRANCHES", "FD Jul-25"]
+    assert restarted.headers(active) == ["ZONES", "BRANCHES", "DDA Jul-25"]
+    assert loads[2:] == [backup.resolve()]
+
+    backup.unlink()
+    _write_structure(active, ["ZONES", "BRANCHES", "DP Jul-25", "TRA Jul-25"])
+    assert restarted.headers(active) == ["ZONES", "BRANCHES", "DP Jul-25", "TRA Jul-25"]
+    assert str(backup.resolve()) not in index_path.read_text(encoding="utf-8")
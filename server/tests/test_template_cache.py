@@ -0,0 +1,56 @@
+import os
+from io import BytesIO
+from pathlib import Path
+
+from docx import Document
+
+from app.services.template_cache import DocxTemplateCache
+
+
+def _write_template(path: Path, text: str) -> None:
+    document = Document()
+    document.add_paragraph(text)
+    document.save(path)
+
+
+def _rendered_text(template) -> str:
+    output = BytesIO()
+    template.save(output)
+    output.seek(0)
+    return "\n".join(paragraph.text for paragraph in Document(output).paragraphs)
+
+
+def test_template_cache_renders_isolated_copies_from_one_load(tmp_path: Path) -> None:
+    template_path = tmp_path / "template.docx"
+    _write_template(template_path, "Zone: {{ zone }}")
+    cache = DocxTemplateCache()
+
+    first = cache.open(template_path)
+    first.render({"zone": "Apapa Total"})
+    second = cache.open(template_path)
+    second.render({"zone": "Ikeja Total"})
+
+    assert _rendered_text(first) == "Zone: Apapa Total"
+    assert _rendered_text(second) == "Zone: Ikeja Total"
+    assert cache.loads == 1
+
+
+def test_template_cache_reloads_only_when_content_changes(tmp_path: Path) -> None:
+    template_path = tmp_path / "template.docx"
+    _write_template(template_path, "Zone: {{ zone }}")
+    cache = DocxTemplateCache()
+    original_hash = cache.template_hash(template_path)
+
+    stat = template_path.stat()
+    os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert cache.template_hash(template_path) == original_hash
+    assert cache.loads == 1
+
+    _write_template(template_path, "Region: {{ zone }}")
+    os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+    rendered = cache.open(template_path)
+    rendered.render({"zone": "Apapa Total"})
+
+    assert cache.template_hash(template_path) != original_hash
+    assert cache.loads == 2
+    assert _rendered_text(rendered) == "Region: Apapa Total"
@@ -1,10 +1,26 @@
+import random
+import re
+from decimal import Decimal
+from difflib import SequenceMatcher
 from pathlib import Path
 
 import pandas as pd
 import pytest
+from openpyxl import Workbook
+from openpyxl.styles import Font
 
 from app.config import settings
-from app.services.upload_parser import _resolve_manual_alias_mapping, parse_uploaded_workbook
+from app.services import upload_parser
+from app.services.normalization import normalize_key, parse_numeric
+from app.services.mapping_plans import MappingPlanStore
+from app.services.structure_index import StructureSignature
+from app.services.upload_parser import (
+    CONTEXT_RULES,
+    LEGACY_PATTERNS,
+    HeaderClassifier,
+    _resolve_manual_alias_mapping,
+    parse_uploaded_workbook,
+)
 
 
 def test_upload_parser_prefers_structure_file_header_swap(tmp_path: Path) -> None:
@@ -227,3 +243,191 @@ def test_resolve_manual_alias_mapping_maps_card_blocks_to_cds_slots() -> None:
     assert mapping["CDS2 No. of Cards Issued"] == "AO 224 CARDS DECEMBER No. of Cards Issued"
     assert mapping["CDS2 ACTIVE"] == "AO 234 ACTIVE__2"
     assert mapping["CDS2 INACTIVE"] == "AO 235 INACTIVE__2"
+
+
+def test_upload_parser_reads_uploaded_workbook_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    structure = pd.DataFrame(columns=["ZONES", "BRANCHES", "PBT 2025 YTD  ACHVD", "DDA Jul-25"])
+    structure_path = tmp_path / "mpaStructure.xlsx"
+    structure.to_excel(structure_path, index=False)
+
+    upload_rows = [["meta", "", "", ""] for _ in range(5)] + [["Abuja Total", "Abuja Main", "100", "8.6e-07"]]
+    upload_path = tmp_path / "upload.csv"
+    pd.DataFrame(upload_rows).to_csv(upload_path, header=False, index=False)
+
+    read_calls: list[str] = []
+    original_read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        read_calls.append(str(args[0]))
+        return original_read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+    original_fallback = settings.fallback_structure_path
+    settings.fallback_structure_path = str(structure_path)
+    try:
+        parsed = parse_uploaded_workbook(str(upload_path))
+    finally:
+        settings.fallback_structure_path = original_fallback
+
+    assert read_calls == [str(upload_path)]
+    assert parse_numeric(parsed.dataframe["DDA Jul-25"].iloc[0]) == Decimal("8.6E-7")
+
+
+def test_header_classifier_matches_per_pattern_search_in_one_pass() -> None:
+    classifier = HeaderClassifier(LEGACY_PATTERNS, CONTEXT_RULES)
+    headers = [
+        "ZONES",
+        "PBT 2025 YTD ACHVD",
+        "PBT Full Yr Budget",
+        "DMT_ACT No. Reactivated",
+        "DMT_ACT % Reactivated",
+        "Savings Full Year BGT",
+        "Active POS Terminals",
+        "Cards September Active",
+        "Total Deposits YTD Variance",
+        "Var AB",
+        "Unnamed: 12",
+        "",
+    ]
+
+    for header in headers:
+        key = normalize_key(header)
+        expected_fields = {name for name, patterns in LEGACY_PATTERNS.items() if any(re.search(p, key) for p in patterns)}
+        expected_context = next(
+            (context for context, patterns in CONTEXT_RULES if any(re.search(p, key) for p in patterns)),
+            None,
+        )
+        classified = classifier.classify(header)
+        assert classified.fields == expected_fields
+        assert classified.context == expected_context
+        assert classifier.classify(header) is classified
+
+    assert classifier.classify("DMT_ACT % Reactivated").fields == {"% Reactivated DMT_ACT"}
+    assert classifier.classify("Active POS Terminals").context == "pos"
+
+
+def test_pruned_structure_alignment_matches_exhaustive_alignment(monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = random.Random(11)
+    families = ["DDA", "SAV", "FD", "DP", "TRA", "AB", "POS", "NXP"]
+    upload_headers = ["ZONES", "BRANCHES"] + [
+        f"{family} {measure}" for family in families for measure in ["May-25", "Jun-25", "Jul-25", "YTD Variance", "MOM Variance"]
+    ]
+    stored: list[list[str]] = []
+    for _ in range(40):
+        headers = [header for header in upload_headers if rng.random() > rng.uniform(0.0, 0.5)]
+        if rng.random() < 0.2:
+            rng.shuffle(headers)
+        stored.append(headers)
+    stored.insert(25, list(stored[7]))  # equal scores must still resolve to the earliest structure
+    structures = [
+        StructureSignature(f"structure-{index}", 0, 0, headers, upload_parser._signature_sequence(headers))
+        for index, headers in enumerate(stored)
+    ]
+
+    class StaticIndex:
+        def signatures(self, paths):
+            return structures
+
+    monkeypatch.setattr(upload_parser, "structure_signatures", StaticIndex())
+    monkeypatch.setattr(upload_parser, "_reference_structure_paths", lambda: [])
+
+    upload_signature = upload_parser._signature_sequence(upload_headers)
+    best_score, expected = 0.0, {}
+    for structure in structures:
+        matcher = SequenceMatcher(a=structure.signature, b=upload_signature)
+        score = matcher.ratio()
+        if score > best_score:
+            best_score, expected = score, {}
+            for block in matcher.get_matching_blocks():
+                for offset in range(block.size):
+                    expected.setdefault(structure.headers[block.a + offset], upload_headers[block.b + offset])
+
+    assert expected
+    assert upload_parser._aligned_template_mapping(upload_headers) == expected
+
+
+def test_mapping_plan_is_reused_for_next_months_layout_and_rebinds_period_labels(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    structure_path = tmp_path / "mpaStructure.xlsx"
+    pd.DataFrame(columns=["ZONES", "BRANCHES", "DDA May-25", "DDA Jun-25", "DDA Jul-25", "DDA YTD Variance"]).to_excel(
+        structure_path, index=False
+    )
+    monkeypatch.setattr(settings, "fallback_structure_path", str(structure_path))
+    store = MappingPlanStore(lambda: tmp_path / "plans.json", max_entries=8)
+    monkeypatch.setattr(upload_parser, "mapping_plans", store)
+
+    def layout(months: list[str]) -> list[str]:
+        return ["ZONES", "BRANCHES", "PBT 2025 YTD ACHVD"] + [f"DDA {month}" for month in months] + ["DDA YTD Variance"]
+
+    july = layout(["May-25", "Jun-25", "Jul-25"])
+    august = layout(["Jun-25", "Jul-25", "Aug-25"])
+    reordered = layout(["Aug-25", "Jul-25", "Jun-25"])
+
+    for part, resolve in upload_parser.MAPPING_PLAN_RESOLVERS.items():
+        assert upload_parser.HeaderMappingPlan(july).mapping(part) == resolve(july)
+    assert store.stats()["misses"] == 4
+
+    august_plan = upload_parser.HeaderMappingPlan(august)
+    assert august_plan.layout_key == upload_parser.HeaderMappingPlan(july).layout_key
+    for part, resolve in upload_parser.MAPPING_PLAN_RESOLVERS.items():
+        assert august_plan.mapping(part) == resolve(august)
+    assert store.stats()["hits"] == 4
+    assert august_plan.mapping("dynamic")["DDA Jul-25"] == "DDA Aug-25"
+
+    # Same signature but a different period order is a different layout.
+    assert upload_parser.HeaderMappingPlan(reordered).layout_key != august_plan.layout_key
+
+    restarted = MappingPlanStore(lambda: tmp_path / "plans.json", max_entries=8)
+    assert restarted.get(august_plan.layout_key, "static") == store.get(august_plan.layout_key, "static")
+
+    # Plans written by a different revision of the mapping rules are never served.
+    monkeypatch.setattr(upload_parser, "MAPPING_RULES_VERSION", upload_parser.MAPPING_RULES_VERSION + 1)
+    assert upload_parser.HeaderMappingPlan(august).layout_key != august_plan.layout_key
+
+
+def test_header_only_preview_matches_full_parse_and_falls_back_when_width_is_uncertain(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    structure_path = tmp_path / "mpaStructure.xlsx"
+    pd.DataFrame(columns=["ZONES", "BRANCHES", "PBT 2025 YTD  ACHVD", "DDA Jun-25", "DDA Jul-25", "SAV Jul-25"]).to_excel(
+        structure_path, index=False
+    )
+    monkeypatch.setattr(settings, "fallback_structure_path", str(structure_path))
+    monkeypatch.setattr(upload_parser, "mapping_plans", MappingPlanStore(lambda: tmp_path / "plans.json", max_entries=8))
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["AUGUST ZONAL DISTRIBUTION"])
+    sheet.append([])
+    sheet.append(["ZONES", "BRANCHES", "PBT 2025 YTD ACHVD", "DDA Jun-25", "DDA Jul-25", "SAV Jul-25"])
+    sheet.append(["meta"])
+    sheet.append([])
+    sheet.append(["Apapa Total", "Apapa Main", 100, 10, 20, 30])
+    sheet.append(["  lekki   total ", "Lekki Main", 200, 15, 25, 35])
+    sheet.append(["ZONES", None, None, None, None, None])
+    sheet.append([None, "Unzoned", 1, 2, 3, 4])
+    sheet.append([42, "Numbered", 1.5, 2, 3, 4])
+    sheet.append([])
+    sheet.cell(row=12, column=1).font = Font(italic=True)
+    upload_path = tmp_path / "upload.xlsx"
+    workbook.save(upload_path)
+
+    preview = upload_parser.preview_uploaded_headers(str(upload_path))
+    parsed = parse_uploaded_workbook(str(upload_path))
+    assert preview is not None
+    assert preview.zones == parsed.zones
+    assert {"42", "Apapa Total", "lekki total"} <= set(preview.zones)
+    assert preview.detected_period_label == parsed.detected_period_label
+    assert preview.mapped_fields == parsed.mapped_fields
+    assert preview.missing_fields == parsed.missing_fields
+
+    # A styled but empty trailing cell widens the declared dimension but not what pandas reads.
+    sheet.cell(row=7, column=8).font = Font(bold=True)
+    workbook.save(upload_path)
+    assert upload_parser.preview_uploaded_headers(str(upload_path)) is None
+    assert parse_uploaded_workbook(str(upload_path)).zones == parsed.zones
+
+    csv_path = tmp_path / "upload.csv"
+    csv_path.write_text("a,b\n", encoding="utf-8")
+    assert upload_parser.preview_uploaded_headers(str(csv_path)) is None
@@ -0,0 +1,133 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import Base
+from app.main import app
+from app.schemas import ProfileCreate
+from app.services import reporting, upload_sessions
+from app.services.profiles import create_profile
+from app.services.reporting import generate_report, ingest_upload
+from app.services.upload_sessions import UploadSessionStore
+
+
+def _temp_upload(tmp_path: Path, name: str, content: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_stage_shares_one_staged_copy_per_fingerprint(tmp_path: Path) -> None:
+    store = UploadSessionStore(str(tmp_path / "staging"), ttl_seconds=60)
+
+    first = store.stage(_temp_upload(tmp_path, "a.xlsx", b"month"), "june.xlsx", "fp-1")
+    second = store.stage(_temp_upload(tmp_path, "b.xlsx", b"month"), "june.xlsx", "fp-1")
+
+    assert first.upload_id != second.upload_id
+    assert first.staged_path == second.staged_path
+    assert Path(first.staged_path).exists()
+    assert not (tmp_path / "b.xlsx").exists()
+    assert store.get(first.upload_id) is first
+
+
+def test_expired_sessions_are_purged_with_their_staged_file(tmp_path: Path) -> None:
+    store = UploadSessionStore(str(tmp_path / "staging"), ttl_seconds=60)
+    session = store.stage(_temp_upload(tmp_path, "a.xlsx", b"month"), "june.xlsx", "fp-1")
+    session.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+
+    assert store.get(session.upload_id) is None
+    assert not Path(session.staged_path).exists()
+
+
+def test_purge_never_deletes_content_a_concurrent_stage_just_reused(tmp_path: Path, monkeypatch) -> None:
+    store = UploadSessionStore(str(tmp_path / "staging"), ttl_seconds=60)
+    session = store.stage(_temp_upload(tmp_path, "a.xlsx", b"month"), "june.xlsx", "fp-1")
+    session.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+    staged = []
+    stager = threading.Thread(
+        target=lambda: staged.append(store.stage(_temp_upload(tmp_path, "b.xlsx", b"month"), "june.xlsx", "fp-1"))
+    )
+    unlink = os.unlink
+
+    def unlink_while_staging(path) -> None:
+        # The same content is staged again between the purge choosing the stale file and removing it.
+        monkeypatch.setattr(upload_sessions.os, "unlink", unlink)
+        stager.start()
+        stager.join(0.2)
+        unlink(path)
+
+    monkeypatch.setattr(upload_sessions.os, "unlink", unlink_while_staging)
+    store.purge_expired()
+    stager.join(5)
+
+    assert Path(staged[0].staged_path).read_bytes() == b"month"
+
+
+def test_retained_content_is_claimed_by_fingerprint_without_a_transfer(tmp_path: Path, monkeypatch) -> None:
+    store = UploadSessionStore(str(tmp_path / "staging"), ttl_seconds=60, content_retention_seconds=3600)
+    fingerprint = hashlib.sha256(b"month").hexdigest()
+    first = store.stage(_temp_upload(tmp_path, "a.xlsx", b"month"), "june.xlsx", fingerprint)
+    first.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+
+    assert store.get(first.upload_id) is None
+    assert Path(first.staged_path).exists()
+    assert store.claim(fingerprint, "june.csv") is None
+    claimed = store.claim(fingerprint, "july.xlsx")
+    assert claimed.staged_path == first.staged_path
+    assert claimed.source_filename == "july.xlsx"
+    assert store.get(claimed.upload_id) is claimed
+
+    monkeypatch.setattr(reporting, "upload_sessions", store)
+    client = TestClient(app)
+    missing = client.post("/uploads/negotiate", json={"fingerprint": "0" * 64, "filename": "june.xlsx"})
+    assert missing.json() == {"upload_required": True, "preview": None}
+    assert client.post("/uploads/negotiate", json={"fingerprint": "../june", "filename": "june.xlsx"}).status_code == 422
+
+    claimed.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+    retired_at = time.time() - 7200
+    os.utime(claimed.staged_path, (retired_at, retired_at))
+    store.purge_expired()
+    assert not Path(first.staged_path).exists()
+
+
+def test_generate_report_rejects_unknown_upload_id() -> None:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db: Session = sessionmaker(bind=engine, expire_on_commit=False)()
+    profile = create_profile(db, ProfileCreate(name="Ada", email=None))
+
+    with pytest.raises(HTTPException) as exc_info:
+        generate_report(db, profile.id, "Abuja Total", upload_id="missing")
+
+    assert exc_info.value.status_code == 404
+
+
+def test_ingest_upload_hashes_while_copying_and_enforces_the_size_limit(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(reporting, "UPLOAD_CHUNK_BYTES", 4)
+    monkeypatch.setattr(reporting.settings, "max_upload_bytes", 10)
+    monkeypatch.setattr(reporting.tempfile, "tempdir", str(tmp_path))
+
+    ingested = ingest_upload(UploadFile(io.BytesIO(b"workbook"), filename="june.xlsx"))
+    assert ingested.fingerprint == hashlib.sha256(b"workbook").hexdigest()
+    assert ingested.size_bytes == 8
+    assert Path(ingested.path).read_bytes() == b"workbook"
+    Path(ingested.path).unlink()
+
+    for upload in [
+        UploadFile(io.BytesIO(b"oversized workbook"), filename="june.xlsx"),
+        UploadFile(io.BytesIO(b"tiny"), filename="june.xlsx", size=1024),
+    ]:
+        with pytest.raises(HTTPException) as exc_info:
+            ingest_upload(upload)
+        assert exc_info.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []